@@ -2,6 +2,7 @@ import abc
 import glob
 import logging
 import os
+import random
 
 from pacai.util import reflection
 
@@ -25,6 +26,9 @@ class BaseAgent(abc.ABC):
         self.index = index
         self.kwargs = kwargs
 
+        # This agent's own random stream, see `BaseAgent.setRandom`.
+        self._random = None
+
     @abc.abstractmethod
     def getAction(self, state):
         """
@@ -34,6 +38,18 @@ class BaseAgent(abc.ABC):
 
         pass
 
+    def getRandom(self):
+        """
+        Get the source of randomness that this agent should use:
+        its own stream if it was given one, otherwise the global `random` module.
+        Either way, it has the usual methods (random(), choice(), etc).
+        """
+
+        if (self._random is None):
+            return random
+
+        return self._random
+
     def registerInitialState(self, state):
         """
         Inspect the starting state.
@@ -56,6 +72,14 @@ class BaseAgent(abc.ABC):
 
         pass
 
+    def setRandom(self, rng):
+        """
+        Give this agent its own `random.Random` stream
+        (see `pacai.util.seeding`), or None to go back to the global `random` module.
+        """
+
+        self._random = rng
+
     @staticmethod
     def loadAgent(name, index, args = {}):
         """
@@ -25,6 +25,9 @@ class CaptureAgent(BaseAgent):
         # Maze distance calculator
         self.distancer = None
 
+        # Articulation points and dead-end pockets of the maze (shared by all agents on a layout)
+        self.topology = None
+
         # A history of observations
         self.observationHistory = []
 
@@ -34,11 +37,13 @@ class CaptureAgent(BaseAgent):
     def registerInitialState(self, gameState):
         """
         This method handles the initial setup of the agent and populates useful fields,
-        such as the team the agent is on and the `pacai.core.distanceCalculator.Distancer`.
+        such as the team the agent is on, the `pacai.core.distanceCalculator.Distancer`,
+        and the `pacai.core.mazeTopology.MazeTopology`.
         """
 
         self.red = gameState.isOnRedTeam(self.index)
         self.distancer = distanceCalculator.Distancer(gameState.getInitialLayout())
+        self.topology = gameState.getInitialLayout().getMazeTopology()
 
         self.distancer.getMazeDistances()
 
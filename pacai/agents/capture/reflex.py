@@ -1,5 +1,4 @@
 import logging
-import random
 import time
 
 from pacai.agents.capture.capture import CaptureAgent
@@ -27,7 +26,7 @@ class ReflexCaptureAgent(CaptureAgent):
         maxValue = max(values)
         bestActions = [a for a, v in zip(actions, values) if v == maxValue]
 
-        return random.choice(bestActions)
+        return self.getRandom().choice(bestActions)
 
     def getSuccessor(self, gameState, action):
         """
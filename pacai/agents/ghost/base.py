@@ -20,7 +20,8 @@ class GhostAgent(BaseAgent):
         if (len(dist) == 0):
             return Directions.STOP
         else:
-            return probability.sample(dist)
+            # Ghosts keep sampling the same few distributions, so their alias tables are cached.
+            return probability.getAliasTable(dist).sample(self.getRandom())
 
     @abc.abstractmethod
     def getDistribution(self, state):
@@ -1,20 +1,79 @@
 from pacai.agents.ghost.base import GhostAgent
 from pacai.core.actions import Actions
 from pacai.core import distance
+from pacai.core.distanceCalculator import DEFAULT_DISTANCE
+from pacai.core.distanceCalculator import getGrids2D
 from pacai.util import probability
 
+# The ways a ghost can measure how far it is from Pacman.
+DISTANCES = ['manhattan', 'maze']
+
+# The most distributions a ghost remembers before it starts its table over.
+MAX_TABLE_SIZE = 2 ** 16
+
 class DirectionalGhost(GhostAgent):
     """
     A ghost that prefers to rush Pacman, or flee when scared.
+
+    How far Pacman is can be measured as the manhattan distance, or the maze distance.
+    The ghost's distribution only depends on its own position and direction,
+    Pacman's position, and whether the ghost is scared.
+    So the ghost keeps a table of the distributions it has already worked out for its layout,
+    and most moves are just a lookup.
     """
 
-    def __init__(self, index, prob_attack = 0.8, prob_scaredFlee = 0.8, **kwargs):
+    def __init__(self, index, prob_attack = 0.8, prob_scaredFlee = 0.8, distance = 'manhattan',
+            **kwargs):
         super().__init__(index, **kwargs)
 
-        self.prob_attack = prob_attack
-        self.prob_scaredFlee = prob_scaredFlee
+        # Agent args may come in as strings.
+        self.prob_attack = float(prob_attack)
+        self.prob_scaredFlee = float(prob_scaredFlee)
+
+        if (distance not in DISTANCES):
+            raise ValueError('Unknown distance: "%s". Expected one of: %s.' % (distance, DISTANCES))
+
+        self.distance = distance
+
+        # The layout the tables are for.
+        self._layout = None
+
+        # {(position, direction, pacman position, scared): distribution, ...}
+        self._distributions = {}
+
+        # {pacman position: {position: maze distance, ...}, ...}
+        self._mazeDistances = {}
 
     def getDistribution(self, state):
+        """
+        Get the distribution over this ghost's actions.
+        The distribution may be shared with later calls, so callers should not modify it.
+        """
+
+        if (state.isOver()):
+            return {}
+
+        layout = state.getInitialLayout()
+        if (layout is not self._layout):
+            self._layout = layout
+            self._distributions = {}
+            self._mazeDistances = {}
+
+        ghostState = state.getGhostState(self.index)
+        key = (ghostState.getPosition(), ghostState.getDirection(), state.getPacmanPosition(),
+                ghostState.isScared())
+
+        dist = self._distributions.get(key)
+        if (dist is None):
+            if (len(self._distributions) >= MAX_TABLE_SIZE):
+                self._distributions.clear()
+
+            dist = self._computeDistribution(state)
+            self._distributions[key] = dist
+
+        return dist
+
+    def _computeDistribution(self, state):
         # Read variables from state.
         ghostState = state.getGhostState(self.index)
         legalActions = state.getLegalActions(self.index)
@@ -30,7 +89,7 @@ class DirectionalGhost(GhostAgent):
         pacmanPosition = state.getPacmanPosition()
 
         # Select best actions given the state.
-        distancesToPacman = [distance.manhattan(pos, pacmanPosition) for pos in newPositions]
+        distancesToPacman = [self._getDistance(pos, pacmanPosition) for pos in newPositions]
         if (isScared):
             bestScore = max(distancesToPacman)
             bestProb = self.prob_scaredFlee
@@ -54,3 +113,17 @@ class DirectionalGhost(GhostAgent):
 
         probability.normalize(dist)
         return dist
+
+    def _getDistance(self, position, pacmanPosition):
+        if (self.distance == 'manhattan'):
+            return distance.manhattan(position, pacmanPosition)
+
+        distances = self._mazeDistances.get(pacmanPosition)
+        if (distances is None):
+            distances = self._layout.getMazeGraph().distancesFrom(pacmanPosition)
+            self._mazeDistances[pacmanPosition] = distances
+
+        # A scared ghost can be between cells, so it is as far as the closest cell it is next to
+        # (plus the distance to that cell).
+        return min(distances.get(cell, DEFAULT_DISTANCE) + cellDistance
+                for cell, cellDistance in getGrids2D(position))
@@ -1,5 +1,3 @@
-import random
-
 from pacai.agents.base import BaseAgent
 from pacai.core.directions import Directions
 from pacai.util import reflection
@@ -26,4 +24,4 @@ class GreedyAgent(BaseAgent):
         bestScore = max(scored)[0]
         bestActions = [pair[1] for pair in scored if pair[0] == bestScore]
 
-        return random.choice(bestActions)
+        return self.getRandom().choice(bestActions)
@@ -0,0 +1,70 @@
+"""
+Saving and loading what learning agents have learned.
+
+A checkpoint only holds an agent's learned parameters
+(see `pacai.agents.learning.reinforcement.ReinforcementAgent.getParameters`),
+not the whole agent, so it can be loaded into a freshly constructed agent
+(e.g. one with different exploration settings, for fast evaluation runs).
+Checkpoints are gzip-compressed pickles.
+"""
+
+import gzip
+import os
+import pickle
+
+from pacai.agents.learning.reinforcement import ReinforcementAgent
+
+FORMAT_VERSION = 1
+
+def checkAgent(agent):
+    """
+    Raise a ValueError if an agent cannot be saved to (or loaded from) a checkpoint,
+    so that a long training run is not wasted on an agent that cannot be saved.
+    """
+
+    if (not isinstance(agent, ReinforcementAgent)):
+        raise ValueError('Only learning agents can be loaded or saved, not %s.'
+                % (type(agent).__name__))
+
+    try:
+        agent.getParameters()
+    except NotImplementedError as ex:
+        raise ValueError(str(ex))
+
+def loadAgent(agent, path):
+    """
+    Load the parameters saved in a checkpoint into an agent.
+    The checkpoint must have been saved from an agent of the same class.
+    """
+
+    with gzip.open(path, 'rb') as file:
+        checkpoint = pickle.load(file)
+
+    if (not isinstance(checkpoint, dict) or checkpoint.get('version') != FORMAT_VERSION):
+        raise ValueError('File is not an agent checkpoint (or is from an unknown version): %s.'
+                % (path))
+
+    if (checkpoint['agent'] != type(agent).__name__):
+        raise ValueError('Cannot load a checkpoint of a %s into a %s: %s.'
+                % (checkpoint['agent'], type(agent).__name__, path))
+
+    agent.setParameters(checkpoint['parameters'])
+
+def saveAgent(agent, path):
+    """
+    Save an agent's parameters to a checkpoint.
+    The checkpoint is written to a temp file first,
+    so an interrupted save never leaves behind a partial checkpoint.
+    """
+
+    checkpoint = {
+        'version': FORMAT_VERSION,
+        'agent': type(agent).__name__,
+        'parameters': agent.getParameters(),
+    }
+
+    tempPath = path + '.tmp'
+    with gzip.open(tempPath, 'wb') as file:
+        pickle.dump(checkpoint, file, protocol = pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tempPath, path)
@@ -0,0 +1,86 @@
+from pacai.agents.learning.value import ValueEstimationAgent
+from pacai.core.compiledMdp import CompiledMDP
+
+class CompiledMDPAgent(ValueEstimationAgent):
+    """
+    An agent that solves its MDP up front in matrix form
+    (see `pacai.core.compiledMdp.CompiledMDP`).
+
+    Children compute the values, and this class turns them into
+    Q-values and a policy, so all the agent's methods are just lookups.
+    Ties in the policy go to the action that the MDP lists first.
+    States that are not in the MDP (e.g. walls that a display asks about)
+    are evaluated on the fly from the MDP,
+    just like `pacai.student.valueIterationAgent.ValueIterationAgent` does.
+    """
+
+    def __init__(self, index, mdp, discountRate = 0.9, **kwargs):
+        super().__init__(index, **kwargs)
+
+        self.mdp = mdp
+        self.discountRate = discountRate
+        self.compiled = CompiledMDP(mdp)
+
+        self._values = None
+        self._qValues = None
+        self._policy = None
+
+    def getAction(self, state):
+        """
+        Returns the policy at the state (no exploration).
+        """
+
+        return self.getPolicy(state)
+
+    def getPolicy(self, state):
+        stateIndex = self.compiled.stateIndexes.get(state)
+        if (stateIndex is None):
+            actions = self.mdp.getPossibleActions(state)
+            if (len(actions) == 0):
+                return None
+
+            return max(actions, key = lambda action: self.getQValue(state, action))
+
+        pairIndex = self._policy[stateIndex]
+        if (pairIndex < 0):
+            return None
+
+        return self.compiled.pairActions[pairIndex]
+
+    def getQValue(self, state, action):
+        if (state not in self.compiled.stateIndexes):
+            qValue = 0.0
+            for nextState, prob in self.mdp.getTransitionStatesAndProbs(state, action):
+                reward = self.mdp.getReward(state, action, nextState)
+                qValue += prob * (reward + self.discountRate * self.getValue(nextState))
+
+            return qValue
+
+        pairIndex = self.compiled.getPairIndex(state, action)
+        if (pairIndex is None):
+            return 0.0
+
+        return float(self._qValues[pairIndex])
+
+    def getValue(self, state):
+        stateIndex = self.compiled.stateIndexes.get(state)
+        if (stateIndex is None):
+            return 0.0
+
+        return float(self._values[stateIndex])
+
+    def setValues(self, values, policy = None):
+        """
+        Set the solved state values (as an array indexed like the compiled states),
+        and derive the Q-values from them.
+        If a policy (the pair to take in each state) is not given,
+        then it is also derived from the values.
+        """
+
+        self._values = values
+        self._qValues = self.compiled.getQValues(values, self.discountRate)
+
+        if (policy is None):
+            policy = self.compiled.getPolicy(self._qValues)
+
+        self._policy = policy
@@ -0,0 +1,122 @@
+"""
+Linear Q-functions over dense feature vectors.
+"""
+
+class DenseLinearQFunction(object):
+    """
+    A linear Q-function, `Q(state, action) = w * featureVector`,
+    over the fixed set of features of an extractor (see
+    `pacai.core.featureExtractors.FeatureExtractor.getFeatureNames`).
+
+    The weights are stored in a NumPy array,
+    and all the legal actions of a state are evaluated with a single matrix-vector product.
+    The feature matrices of the last few states are kept,
+    since the same state is usually evaluated a few times in a row
+    (e.g. when picking an action and then when updating on the transition from it).
+    """
+
+    def __init__(self, extractor, numRecentStates = 2):
+        # NumPy is only needed for dense features, so only import it when they are used.
+        import numpy
+
+        names = extractor.getFeatureNames()
+        if (names is None):
+            raise ValueError('Extractor (%s) does not have a fixed set of features,'
+                    % (type(extractor).__name__)
+                    + ' so it cannot be used with dense features.')
+
+        self._extractor = extractor
+        self._names = list(names)
+        self._weights = numpy.zeros(len(self._names))
+
+        # [(state, actions, feature matrix), ...], from least to most recently used.
+        self._recent = []
+        self._numRecentStates = numRecentStates
+
+    def evaluate(self, features):
+        """
+        Get the Q-values for a feature vector (or matrix, one row per action).
+        """
+
+        return features.dot(self._weights)
+
+    def getFeatureMatrix(self, state, actions):
+        """
+        Get the feature matrix (one row per action) for the state,
+        reusing the matrix of a recently seen state when possible.
+        """
+
+        for i in range(len(self._recent)):
+            recentState, recentActions, matrix = self._recent[i]
+            if (recentState is state and recentActions == actions):
+                self._recent.append(self._recent.pop(i))
+                return matrix
+
+        matrix = self._extractor.getFeatureMatrix(state, actions)
+
+        self._recent.append((state, list(actions), matrix))
+        if (len(self._recent) > self._numRecentStates):
+            self._recent.pop(0)
+
+        return matrix
+
+    def getFeatureNames(self):
+        return self._names
+
+    def getQValue(self, state, action, actions):
+        """
+        Get the Q-value of a single action (which should be in the list of legal actions).
+        """
+
+        matrix = self.getFeatureMatrix(state, actions)
+        return float(self.evaluate(matrix[actions.index(action)]))
+
+    def getQValues(self, state, actions):
+        """
+        Get the Q-values of all the given actions as a NumPy array.
+        """
+
+        return self.evaluate(self.getFeatureMatrix(state, actions))
+
+    def getWeights(self):
+        """
+        Get the weights as a dict of {feature name: weight}.
+        """
+
+        return {name: float(weight) for name, weight in zip(self._names, self._weights)}
+
+    def setWeights(self, weights):
+        """
+        Set the weights from a dict of {feature name: weight}.
+        Features that are missing get a weight of zero.
+        """
+
+        unknown = set(weights.keys()) - set(self._names)
+        if (len(unknown) > 0):
+            raise ValueError('Unknown features: %s.' % (sorted(unknown)))
+
+        for i in range(len(self._names)):
+            self._weights[i] = weights.get(self._names[i], 0.0)
+
+    def update(self, state, action, actions, step):
+        """
+        Move the weights by step (e.g. the learning rate times the TD error)
+        in the direction of the features of the given action.
+        """
+
+        matrix = self.getFeatureMatrix(state, actions)
+        self.updateFeatures(matrix[actions.index(action)], step)
+
+    def updateFeatures(self, features, step):
+        """
+        Move the weights by step in the direction of a feature vector.
+        """
+
+        self._weights += step * features
+
+    def __getstate__(self):
+        # Do not copy around the cached states.
+        state = self.__dict__.copy()
+        state['_recent'] = []
+
+        return state
@@ -0,0 +1,25 @@
+from pacai.agents.learning.compiled import CompiledMDPAgent
+from pacai.core.compiledMdp import valueIteration
+
+class MatrixValueIterationAgent(CompiledMDPAgent):
+    """
+    A value iteration agent that solves its MDP in matrix form.
+
+    The MDP is compiled once into a `pacai.core.compiledMdp.CompiledMDP`,
+    and every sweep of value iteration is then a vectorized Bellman backup.
+
+    This computes the same values as `pacai.student.valueIterationAgent.ValueIterationAgent`
+    (up to floating point rounding).
+    If a tolerance is given, then iteration stops early
+    once no state's value changed by more than the tolerance (numSweeps is how many were done).
+    """
+
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, tolerance = None, **kwargs):
+        super().__init__(index, mdp, discountRate, **kwargs)
+
+        self.iters = iters
+        self.tolerance = tolerance
+
+        values, qValues, self.numSweeps = valueIteration(self.compiled,
+                discountRate, iters, tolerance)
+        self.setValues(values)
@@ -0,0 +1,40 @@
+from pacai.agents.learning.compiled import CompiledMDPAgent
+from pacai.core.compiledMdp import policyIteration
+
+# MDPs with more states than this are evaluated iteratively (by default).
+MAX_EXACT_STATES = 1000
+
+# The number of evaluation sweeps (between improvements) for iterative evaluation.
+DEFAULT_EVALUATION_SWEEPS = 20
+
+class PolicyIterationAgent(CompiledMDPAgent):
+    """
+    A policy iteration agent.
+
+    Starting from an arbitrary policy, alternate between evaluating the policy
+    and improving it by acting greedily on its values, until the policy stops changing
+    (usually after just a handful of iterations) or iters improvements have been done.
+    numIterations is how many were done.
+
+    Small MDPs (up to MAX_EXACT_STATES states) evaluate each policy exactly with a linear solve.
+    Larger MDPs (or when evaluationSweeps is given) use modified policy iteration:
+    each policy gets evaluationSweeps sweeps of iterative evaluation,
+    starting from the values of the previous policy.
+    See `pacai.core.compiledMdp.policyIteration`.
+    """
+
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, evaluationSweeps = None,
+            tolerance = None, **kwargs):
+        super().__init__(index, mdp, discountRate, **kwargs)
+
+        if (evaluationSweeps is None and self.compiled.numStates > MAX_EXACT_STATES):
+            evaluationSweeps = DEFAULT_EVALUATION_SWEEPS
+
+        self.iters = iters
+        self.evaluationSweeps = evaluationSweeps
+        self.tolerance = tolerance
+
+        values, policy, self.numIterations = policyIteration(self.compiled, discountRate,
+                iters, evaluationSweeps, tolerance)
+        # Keep the solved policy, rather than breaking ties among equally good actions afresh.
+        self.setValues(values, policy)
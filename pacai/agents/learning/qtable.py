@@ -0,0 +1,186 @@
+"""
+A compact table of Q-values.
+"""
+
+import array
+import heapq
+
+EVICTION_LRU = 'lru'
+EVICTION_LFU = 'lfu'
+EVICTION_POLICIES = [EVICTION_LRU, EVICTION_LFU]
+
+# When a full table needs room, evict this fraction of its entries at once
+# (so the cost of picking the entries to evict is spread over many inserts).
+EVICTION_FRACTION = 0.1
+
+def defaultFingerprint(state):
+    """
+    Use the state's own fingerprint if it has one
+    (e.g. `pacai.core.gamestate.AbstractGameState.getFingerprint`),
+    otherwise use the state itself (e.g. the positions used by gridworld).
+    """
+
+    if (hasattr(state, 'getFingerprint')):
+        return state.getFingerprint()
+
+    return state
+
+class QTable(object):
+    """
+    A table of Q-values, keyed by (state fingerprint, action).
+
+    Keying by a fingerprint instead of the state means that the table does not keep states alive
+    (for pacman, each state holds its own food grid, agent states, etc),
+    and that looking up a value does not need the (expensive) hash of a full state.
+    A fingerprint function can also be supplied to learn over a coarser abstraction of the states.
+
+    The values (and the usage stats used for eviction) are stored in flat arrays,
+    indexed by a slot that each (fingerprint, action) key is given.
+    If a capacity is given, the table will never hold more than that many values:
+    when it is full, the least recently used (lru) or least frequently used (lfu) values
+    are evicted (and read as the default value until they are set again).
+    """
+
+    def __init__(self, capacity = None, eviction = EVICTION_LRU, fingerprint = None):
+        if (capacity is not None and capacity < 1):
+            raise ValueError('A Q-table must have a positive capacity, got %d.' % (capacity))
+
+        if (eviction not in EVICTION_POLICIES):
+            raise ValueError('Unknown eviction policy: "%s". Expected one of: %s.'
+                    % (eviction, EVICTION_POLICIES))
+
+        if (fingerprint is None):
+            fingerprint = defaultFingerprint
+
+        self._capacity = capacity
+        self._eviction = eviction
+        self._fingerprint = fingerprint
+
+        # {(fingerprint, action): slot, ...}
+        self._slots = {}
+
+        # Indexed by slot.
+        self._keys = []
+        self._values = array.array('d')
+        self._useCounts = array.array('L')
+        self._lastUses = array.array('Q')
+
+        # Slots that were freed by eviction (and can be reused).
+        self._freeSlots = []
+
+        self._clock = 0
+        self._numEvictions = 0
+
+    def __contains__(self, stateAction):
+        state, action = stateAction
+        return (self._fingerprint(state), action) in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def clear(self):
+        self._slots.clear()
+        self._keys = []
+        self._values = array.array('d')
+        self._useCounts = array.array('L')
+        self._lastUses = array.array('Q')
+        self._freeSlots = []
+
+    def get(self, state, action, default = 0.0):
+        """
+        Get the Q-value of taking the action in the state,
+        or the default if it is not in the table.
+        """
+
+        return self.getByKey((self._fingerprint(state), action), default)
+
+    def getByKey(self, key, default = 0.0):
+        """
+        Get the value of a (fingerprint, action) key directly
+        (e.g. when the state itself is no longer around).
+        """
+
+        slot = self._slots.get(key)
+        if (slot is None):
+            return default
+
+        # Usage is only needed to pick what to evict, which an unbounded table never does.
+        if (self._capacity is not None):
+            self._touch(slot)
+
+        return self._values[slot]
+
+    def getCapacity(self):
+        return self._capacity
+
+    def getEviction(self):
+        return self._eviction
+
+    def getFingerprint(self, state):
+        return self._fingerprint(state)
+
+    def getNumEvictions(self):
+        return self._numEvictions
+
+    def items(self):
+        """
+        Iterate over ((fingerprint, action), value) for every value in the table.
+        """
+
+        for key, slot in self._slots.items():
+            yield key, self._values[slot]
+
+    def set(self, state, action, value):
+        self.setByKey((self._fingerprint(state), action), value)
+
+    def setByKey(self, key, value):
+        """
+        Set the value of a (fingerprint, action) key directly (e.g. when restoring a table).
+        """
+
+        slot = self._slots.get(key)
+        if (slot is None):
+            slot = self._addKey(key)
+
+        self._values[slot] = value
+        if (self._capacity is not None):
+            self._touch(slot)
+
+    def _addKey(self, key):
+        if (self._capacity is not None and len(self._slots) >= self._capacity):
+            self._evict(max(1, int(self._capacity * EVICTION_FRACTION)))
+
+        if (len(self._freeSlots) > 0):
+            slot = self._freeSlots.pop()
+            self._keys[slot] = key
+            self._values[slot] = 0.0
+            self._useCounts[slot] = 0
+            self._lastUses[slot] = 0
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._values.append(0.0)
+            self._useCounts.append(0)
+            self._lastUses.append(0)
+
+        self._slots[key] = slot
+        return slot
+
+    def _evict(self, count):
+        if (self._eviction == EVICTION_LFU):
+            rank = lambda slot: (self._useCounts[slot], self._lastUses[slot])
+        else:
+            rank = lambda slot: self._lastUses[slot]
+
+        evicted = heapq.nsmallest(count, self._slots.values(), key = rank)
+        for slot in evicted:
+            del self._slots[self._keys[slot]]
+            self._keys[slot] = None
+            self._freeSlots.append(slot)
+
+        self._numEvictions += len(evicted)
+
+    def _touch(self, slot):
+        self._clock += 1
+        self._lastUses[slot] = self._clock
+        self._useCounts[slot] += 1
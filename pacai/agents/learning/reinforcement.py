@@ -27,7 +27,7 @@ class ReinforcementAgent(ValueEstimationAgent):
         super().__init__(index, **kwargs)
 
         if (actionFn is None):
-            actionFn = lambda state: state.getLegalActions()
+            actionFn = _getLegalActions
 
         self.actionFn = actionFn
         self.episodesSoFar = 0
@@ -38,6 +38,9 @@ class ReinforcementAgent(ValueEstimationAgent):
         self.alpha = float(alpha)
         self.discountRate = float(gamma)
 
+        # When not None, transitions are recorded here instead of being learned from.
+        self.recordedTransitions = None
+
     @abc.abstractmethod
     def update(self, state, action, nextState, reward):
         """
@@ -46,6 +49,32 @@ class ReinforcementAgent(ValueEstimationAgent):
 
         pass
 
+    def countEpisode(self, episodeRewards):
+        """
+        Count a finished episode (that earned the given rewards) towards training.
+        Once enough episodes have been counted, exploration and learning are turned off.
+        """
+
+        if (self.episodesSoFar < self.numTraining):
+            self.accumTrainRewards += episodeRewards
+        else:
+            self.accumTestRewards += episodeRewards
+
+        self.episodesSoFar += 1
+        if (self.episodesSoFar >= self.numTraining):
+            # Take off the training wheels.
+            self.epsilon = 0.0  # No exploration.
+            self.alpha = 0.0  # No learning.
+
+    def getActions(self, states):
+        """
+        Get an action for each of several states at once,
+        e.g. for environments that are being run in lockstep
+        (see `pacai.core.batchEnvironment`).
+        """
+
+        return [self.getAction(state) for state in states]
+
     def getAlpha(self):
         return self.alpha
 
@@ -58,6 +87,17 @@ class ReinforcementAgent(ValueEstimationAgent):
     def getGamma(self):
         return self.discountRate
 
+    def getParameters(self):
+        """
+        Get everything that this agent has learned as plain data (e.g. dicts, lists, and numbers),
+        so it can be saved and later restored with `ReinforcementAgent.setParameters`
+        (see `pacai.agents.learning.checkpoint`).
+        Agents that can be checkpointed override both of these methods.
+        """
+
+        raise NotImplementedError('%s agents cannot be saved to checkpoints.'
+                % (type(self).__name__))
+
     def getLegalActions(self, state):
         """
         Get the actions available for a given state.
@@ -74,8 +114,55 @@ class ReinforcementAgent(ValueEstimationAgent):
         """
 
         self.episodeRewards += deltaReward
+
+        if (self.recordedTransitions is not None):
+            self.recordedTransitions.append((state, action, nextState, deltaReward))
+            return
+
         self.update(state, action, nextState, deltaReward)
 
+    def observeTransitions(self, transitions):
+        """
+        Observe a batch of (state, action, nextState, reward) transitions at once.
+
+        The transitions may come from several different episodes,
+        so (unlike `ReinforcementAgent.observeTransition`) their rewards are not added to
+        the current episode.
+        Whoever is running the episodes should count them with `ReinforcementAgent.countEpisode`.
+        Since a recording is replayed as a single episode (see `ReinforcementAgent.replayEpisode`),
+        batches cannot be recorded.
+        """
+
+        if (self.recordedTransitions is not None):
+            raise ValueError('Batches of transitions (from several episodes) cannot be recorded.')
+
+        for state, action, nextState, reward in transitions:
+            self.update(state, action, nextState, reward)
+
+    def replayEpisode(self, transitions):
+        """
+        Learn from a whole episode that was played (and recorded) somewhere else,
+        e.g. by a copy of this agent in another process (see `ReinforcementAgent.startRecording`).
+        The episode counts towards training just like one that this agent played itself:
+        its last transition is observed through `ReinforcementAgent.final`,
+        so the same end of episode bookkeeping (and any subclass hooks) run.
+        Like a played episode, the last transition's states should be game states (with scores).
+        """
+
+        self.startEpisode()
+
+        if (len(transitions) == 0):
+            self.stopEpisode()
+            return
+
+        for state, action, nextState, reward in transitions[:-1]:
+            self.observeTransition(state, action, nextState, reward)
+
+        state, action, nextState, reward = transitions[-1]
+        self.lastState = state
+        self.lastAction = action
+        self.final(nextState)
+
     def startEpisode(self):
         """
         Called by environment when a new episode is starting.
@@ -85,21 +172,31 @@ class ReinforcementAgent(ValueEstimationAgent):
         self.lastAction = None
         self.episodeRewards = 0.0
 
+    def startRecording(self):
+        """
+        Start recording transitions instead of learning from them.
+        This lets a copy of this agent play episodes (acting with its current policy)
+        and hand the transitions back to be learned from (see `ReinforcementAgent.replayEpisode`).
+        """
+
+        self.recordedTransitions = []
+
     def stopEpisode(self):
         """
         Called by environment when an episode is done.
         """
 
-        if (self.episodesSoFar < self.numTraining):
-            self.accumTrainRewards += self.episodeRewards
-        else:
-            self.accumTestRewards += self.episodeRewards
+        self.countEpisode(self.episodeRewards)
 
-        self.episodesSoFar += 1
-        if (self.episodesSoFar >= self.numTraining):
-            # Take off the training wheels.
-            self.epsilon = 0.0  # No exploration.
-            self.alpha = 0.0  # No learning.
+    def stopRecording(self):
+        """
+        Stop recording transitions and return the ones recorded so far.
+        """
+
+        transitions = self.recordedTransitions
+        self.recordedTransitions = None
+
+        return transitions
 
     def isInTraining(self):
         return (self.episodesSoFar < self.numTraining)
@@ -107,6 +204,14 @@ class ReinforcementAgent(ValueEstimationAgent):
     def isInTesting(self):
         return not self.isInTraining()
 
+    def setParameters(self, parameters):
+        """
+        Restore what was learned from the output of `ReinforcementAgent.getParameters`.
+        """
+
+        raise NotImplementedError('%s agents cannot be loaded from checkpoints.'
+                % (type(self).__name__))
+
     def setEpsilon(self, epsilon):
         self.epsilon = epsilon
 
@@ -181,3 +286,7 @@ class ReinforcementAgent(ValueEstimationAgent):
         if (self.episodesSoFar == self.numTraining):
             msg = 'Training Done (turning off epsilon and alpha)'
             logging.debug('%s\n%s' % (msg, '-' * len(msg)))
+
+def _getLegalActions(state):
+    # A module-level function (unlike a lambda) can be pickled along with the agent.
+    return state.getLegalActions()
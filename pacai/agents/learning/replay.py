@@ -0,0 +1,165 @@
+"""
+Experience replay for reinforcement learning agents.
+"""
+
+import array
+import random
+
+# Keeps every transition's sampling weight positive (so none are starved forever).
+MIN_PRIORITY = 1e-3
+
+class ReplayBuffer(object):
+    """
+    A fixed size ring buffer of transitions: (state key, action, reward, next state key).
+    Once the buffer is full, each new transition overwrites the oldest one.
+
+    The state keys should be compact stand-ins for the states
+    (e.g. fingerprints, or feature vectors), so that the buffer does not keep whole states alive.
+    What the keys are is up to the agent that learns from them.
+    Since the keys (and actions) can be any objects (feature dicts and NumPy vectors included,
+    which cannot be interned), they are kept in plain lists.
+    Only the rewards and priorities are kept in flat arrays.
+
+    Transitions can be sampled uniformly, or (if prioritized) in proportion to a priority
+    (e.g. the size of the last TD error seen for the transition) raised to the power of alpha.
+    Prioritized sampling uses a sum tree, so both sampling and updating a priority are O(log n).
+    New transitions get the highest priority seen so far, so they are sure to be replayed soon.
+
+    Prioritized sampling replays some transitions more often than they actually happen,
+    which biases what is learned from them.
+    `ReplayBuffer.getImportanceWeights` gives the weights that correct for this
+    (fully when beta is 1).
+    """
+
+    def __init__(self, capacity, prioritized = False, alpha = 0.6):
+        if (capacity < 1):
+            raise ValueError('A replay buffer must have a positive capacity, got %d.' % (capacity))
+
+        self._capacity = capacity
+        self._prioritized = prioritized
+        self._alpha = alpha
+
+        # Indexed by the transition's slot.
+        self._states = [None] * capacity
+        self._actions = [None] * capacity
+        self._rewards = array.array('d', [0.0]) * capacity
+        self._nextStates = [None] * capacity
+
+        self._size = 0
+        self._nextSlot = 0
+
+        # A binary tree of summed (weighted) priorities,
+        # where the leaf for slot i is at index (capacity + i) and the root is at index 1.
+        self._tree = None
+        self._maxPriority = 1.0
+        if (prioritized):
+            self._tree = array.array('d', [0.0]) * (2 * capacity)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, state, action, reward, nextState):
+        """
+        Add a transition (overwriting the oldest one if the buffer is full).
+        Returns the slot that the transition was stored in.
+        """
+
+        slot = self._nextSlot
+
+        self._states[slot] = state
+        self._actions[slot] = action
+        self._rewards[slot] = reward
+        self._nextStates[slot] = nextState
+
+        self._nextSlot = (slot + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+        if (self._prioritized):
+            self._setWeight(slot, self._maxPriority ** self._alpha)
+
+        return slot
+
+    def get(self, slot):
+        """
+        Get the transition in a slot as a tuple of: (state key, action, reward, next state key).
+        """
+
+        return (self._states[slot], self._actions[slot], self._rewards[slot],
+                self._nextStates[slot])
+
+    def getCapacity(self):
+        return self._capacity
+
+    def getImportanceWeights(self, slots, beta):
+        """
+        Get the importance sampling weight of each sampled slot:
+        `(size * P(slot)) ** -beta`, scaled so that the largest weight in the sample is 1.
+        Learning steps scaled by these weights undo the bias of prioritized sampling,
+        fully when beta is 1 and not at all when beta is 0.
+        Uniform samples are unbiased, so all their weights are 1.
+        """
+
+        if (not self._prioritized or beta == 0.0 or len(slots) == 0):
+            return [1.0] * len(slots)
+
+        total = self._tree[1]
+        weights = [(self._size * self._tree[self._capacity + slot] / total) ** -beta
+                for slot in slots]
+
+        maxWeight = max(weights)
+        return [weight / maxWeight for weight in weights]
+
+    def isPrioritized(self):
+        return self._prioritized
+
+    def sample(self, count, rng = None):
+        """
+        Sample (with replacement) the slots of count transitions,
+        drawing from rng (e.g. a `random.Random`) or the global `random` module.
+        Returns an empty list if the buffer is empty.
+        """
+
+        if (self._size == 0):
+            return []
+
+        if (rng is None):
+            rng = random
+
+        if (not self._prioritized):
+            return [rng.randrange(self._size) for i in range(count)]
+
+        return [self._findSlot(rng.random() * self._tree[1]) for i in range(count)]
+
+    def updatePriority(self, slot, priority):
+        """
+        Set the priority of the transition in a slot (e.g. to the size of its latest TD error).
+        Has no effect if the buffer is not prioritized.
+        """
+
+        if (not self._prioritized):
+            return
+
+        priority = max(priority, MIN_PRIORITY)
+        self._maxPriority = max(self._maxPriority, priority)
+        self._setWeight(slot, priority ** self._alpha)
+
+    def _findSlot(self, target):
+        index = 1
+        while (index < self._capacity):
+            left = 2 * index
+            if (target < self._tree[left]):
+                index = left
+            else:
+                target -= self._tree[left]
+                index = left + 1
+
+        # Guard against rounding error walking off into an (empty) slot past the end.
+        return min(index - self._capacity, self._size - 1)
+
+    def _setWeight(self, slot, weight):
+        index = self._capacity + slot
+        change = weight - self._tree[index]
+
+        while (index >= 1):
+            self._tree[index] += change
+            index //= 2
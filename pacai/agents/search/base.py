@@ -19,12 +19,16 @@ class SearchAgent(BaseAgent):
 
     As a default, this agent runs `pacai.student.search.depthFirstSearch` on a
     `pacai.core.search.position.PositionSearchProblem` to find location (1, 1).
+
+    Search functions that take a memory limit (e.g. `pacai.core.search.search.smastar`)
+    will be given the memoryLimit argument (if it is set).
     """
 
     def __init__(self, index,
             fn: Union[str, Callable[[SearchProblem], any]] = depthFirstSearch,
             prob: Union[str, Callable[[AbstractGameState], SearchProblem]] = PositionSearchProblem,
             heuristic: Union[str, Callable] = nullHeuristic,
+            memoryLimit: Union[str, int, None] = None,
             **kwargs):
         super().__init__(index, **kwargs)
 
@@ -38,7 +42,7 @@ class SearchAgent(BaseAgent):
 
         if isinstance(fn, str):
             # Get the search function from the name and heuristic.
-            self.searchFunction = self._fetchSearchFunction(fn, heuristic)
+            self.searchFunction = self._fetchSearchFunction(fn, heuristic, memoryLimit)
         else:
             # Use provided search function and ignore heuristic.
             self.searchFunction = fn
@@ -91,20 +95,33 @@ class SearchAgent(BaseAgent):
 
         return action
 
-    def _fetchSearchFunction(self, functionName: str, heuristic: Union[str, Callable]):
+    def _fetchSearchFunction(self, functionName: str, heuristic: Union[str, Callable],
+            memoryLimit: Union[str, int, None] = None):
         """
         Get the specified search function by name.
         If that function also takes a heurisitc (i.e. has a parameter called "heuristic"),
         then return a lambda that binds the heuristic to the function.
+        Same for a memory limit (i.e. a parameter called "memoryLimit").
         """
 
         # Locate the function.
         function = reflection.qualifiedImport(functionName)
 
+        boundArgs = {}
+
+        # Check if the function has a memory limit.
+        if (memoryLimit is not None and 'memoryLimit' in function.__code__.co_varnames):
+            boundArgs['memoryLimit'] = int(memoryLimit)
+            logging.info('[SearchAgent] using a memory limit of %d.' % (boundArgs['memoryLimit']))
+
         # Check if the function has a heuristic.
         if 'heuristic' not in function.__code__.co_varnames:
             logging.info('[SearchAgent] using function %s.' % (functionName))
-            return function
+
+            if (len(boundArgs) == 0):
+                return function
+
+            return lambda x: function(x, **boundArgs)
 
         if isinstance(heuristic, str):
             # Fetch the heuristic.
@@ -113,4 +130,4 @@ class SearchAgent(BaseAgent):
                 (functionName, heuristic))
 
         # Bind the heuristic.
-        return lambda x: function(x, heuristic = heuristic)
+        return lambda x: function(x, heuristic = heuristic, **boundArgs)
@@ -2,15 +2,24 @@ from pacai.agents.search.base import SearchAgent
 from pacai.core.search import search
 from pacai.core.search.food import FoodSearchProblem
 from pacai.student import searchAgents
+from pacai.util import reflection
 
 class AStarFoodSearchAgent(SearchAgent):
     """
     A search agent for `pacai.core.search.food.FoodSearchProblem using A*
     and `pacai.student.searchAgents.foodHeuristic`.
+
+    A different heuristic (e.g. `pacai.core.search.heuristic.foodSpanningTree`)
+    or problem (e.g. `pacai.core.search.food.FoodBitmaskSearchProblem`)
+    can be passed by name as agent arguments.
     """
 
-    def __init__(self, index, **kwargs):
+    def __init__(self, index, heuristic = searchAgents.foodHeuristic,
+            prob = FoodSearchProblem, **kwargs):
+        if isinstance(heuristic, str):
+            heuristic = reflection.qualifiedImport(heuristic)
+
         super().__init__(index,
-                         fn = lambda prob: search.astar(prob, searchAgents.foodHeuristic),
-                         prob = FoodSearchProblem,
+                         fn = lambda prob: search.astar(prob, heuristic),
+                         prob = prob,
                          **kwargs)
@@ -27,6 +27,7 @@ from pacai.util import reflection
 from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
 from pacai.util.mazeGenerator import generateMaze
+from pacai.util.seeding import seedGame
 from pacai.util.util import nearestPoint
 
 COLLISION_TOLERANCE = 0.7  # How close ghosts must be to Pacman to kill
@@ -239,6 +240,7 @@ class CaptureGameState(AbstractGameState):
         self._timeleft -= 1
 
         self._hash = None
+        self._fingerprint = None
 
 class CaptureRules:
     """
@@ -246,9 +248,18 @@ class CaptureRules:
     and how the game starts and ends.
     """
 
-    def newGame(self, layout, agents, display, length, catchExceptions):
+    def newGame(self, layout, agents, display, length, catchExceptions, rng = None):
+        """
+        Start a new game.
+        The team that starts is picked with rng (e.g. the game's own `random.Random`),
+        or the global `random` module.
+        """
+
+        if (rng is None):
+            rng = random
+
         initState = CaptureGameState(layout, length)
-        starter = random.randint(0, 1)
+        starter = rng.randint(0, 1)
         logging.info('%s team starts' % ['Red', 'Blue'][starter])
         game = Game(agents, display, self, startingIndex = starter,
                 catchExceptions = catchExceptions)
@@ -587,6 +598,7 @@ def readCommand(argv):
         seed = random.randint(0, 2**32)
     random.seed(seed)
     logging.debug('Seed value: ' + str(seed))
+    args['seed'] = seed
 
     # Choose a pacman agent.
     redArgs = parseAgentArgs(options.redArgs)
@@ -680,7 +692,7 @@ def replayGame(layout, agents, actions, display, length, redTeamName, blueTeamNa
     display.finish()
 
 def runGames(layout, agents, display, length, numGames, record, numTraining,
-        redTeamName, blueTeamName, catchExceptions = False, **kwargs):
+        redTeamName, blueTeamName, catchExceptions = False, seed = None, **kwargs):
     rules = CaptureRules()
     games = []
 
@@ -698,7 +710,11 @@ def runGames(layout, agents, display, length, numGames, record, numTraining,
         else:
             gameDisplay = display
 
-        g = rules.newGame(layout, agents, gameDisplay, length, catchExceptions)
+        rng = None
+        if (seed is not None):
+            rng = seedGame(seed, i, agents)
+
+        g = rules.newGame(layout, agents, gameDisplay, length, catchExceptions, rng)
         g.run()
 
         if (not isTraining):
@@ -2,22 +2,112 @@
 Binary for the crawler simulation.
 """
 
+import argparse
+import logging
+import os
+import random
 import sys
+import textwrap
+import time
 
-from pacai.ui.crawler.gui import run
+from pacai.core.batchEnvironment import BatchEnvironment
+from pacai.core.crawler import CrawlingRobotEnvironment
+from pacai.student.qlearningAgents import QLearningAgent
 from pacai.util.logs import initLogging
 
-def _load_args(args):
-    executable = args.pop(0)
-    if (len(args) > 1 or ({'h', 'help'} & {arg.lower().strip().replace('-', '') for arg in args})):
-        print("USAGE: python3 %s [max steps]" % (executable), file = sys.stderr)
-        sys.exit(1)
+def runHeadless(steps, batchSize = 1):
+    """
+    Train a Q-learning crawler for a number of steps without any display,
+    using the same learning parameters that the GUI starts with.
+    batchSize robots are trained at once (each one does all the steps),
+    all feeding the same agent.
+    Returns the average velocity (distance per step) of the robots over their last few steps.
+    """
+
+    environments = [CrawlingRobotEnvironment() for i in range(batchSize)]
+
+    # Every robot has the same actions.
+    learner = QLearningAgent(0, actionFn = environments[0].getPossibleActions,
+            epsilon = 0.5, gamma = 0.8, alpha = 0.8)
+    learner.startEpisode()
+
+    startTime = time.time()
+    BatchEnvironment(environments).run(learner, numSteps = steps)
+    seconds = time.time() - startTime
+
+    velocities = []
+    for environment in environments:
+        positions = environment.crawlingRobot.positions
+        velocities.append((positions[-1] - positions[0]) / max(1, len(positions) - 1))
+
+    velocity = sum(velocities) / len(velocities)
+
+    logging.info('Ran %d steps with %d robot(s) in %.2f seconds (%d steps per second).'
+            % (steps, batchSize, seconds, steps * batchSize / max(seconds, 1e-9)))
+    logging.info('Average velocity over the last %d steps: %.2f.'
+            % (len(environments[0].crawlingRobot.positions) - 1, velocity))
+
+    return velocity
+
+def parseOptions(argv):
+    """
+    Processes the command used to run the crawler from the command line.
+    """
+
+    description = """
+    DESCRIPTION:
+        This program runs a robot that uses Q-learning to learn to crawl.
+
+    EXAMPLES:
+        (1) python -m pacai.bin.crawler
+            - Starts the crawler GUI.
+        (2) python -m pacai.bin.crawler 1000
+            - Starts the crawler GUI, and stops after 1000 steps.
+        (3) python -m pacai.bin.crawler --headless --steps 100000
+            - Trains a crawler for 100000 steps without a display.
+    """
+
+    parser = argparse.ArgumentParser(description = textwrap.dedent(description),
+        prog = os.path.basename(__file__), formatter_class = argparse.RawTextHelpFormatter)
+
+    parser.add_argument('maxSteps', metavar = 'max steps',
+            action = 'store', type = int, default = None, nargs = '?',
+            help = 'stop after this many steps (default %(default)s)')
+
+    parser.add_argument('--batch-size', dest = 'batchSize',
+            action = 'store', type = int, default = 1,
+            help = 'when headless, train this many robots at once (default %(default)s)')
+
+    parser.add_argument('--headless', dest = 'headless',
+            action = 'store_true', default = False,
+            help = 'train without the GUI (default %(default)s)')
+
+    parser.add_argument('--seed', dest = 'seed',
+            action = 'store', type = int, default = None,
+            help = 'the random seed (default %(default)s)')
+
+    parser.add_argument('--steps', dest = 'steps',
+            action = 'store', type = int, default = None,
+            help = 'stop after this many steps, same as max steps (default %(default)s)')
 
-    max_steps = None
-    if (len(args) > 0):
-        max_steps = int(args.pop(0))
+    options = parser.parse_args(argv[1:])
 
-    return max_steps
+    if (options.steps is None):
+        options.steps = options.maxSteps
+    elif (options.maxSteps is not None and options.maxSteps != options.steps):
+        raise ValueError('Got two different numbers of steps: %d and %d.'
+                % (options.maxSteps, options.steps))
+
+    if (options.headless and options.steps is None):
+        raise ValueError('A headless crawler needs a number of steps (--steps).')
+
+    if (options.batchSize < 1):
+        raise ValueError('The batch size must be positive, got %d.' % (options.batchSize))
+
+    if (options.batchSize > 1 and not options.headless):
+        raise ValueError('Only a headless crawler can train more than one robot.')
+
+    return options
 
 def main(argv):
     """
@@ -26,8 +116,18 @@ def main(argv):
     """
 
     initLogging()
-    max_steps = _load_args(argv)
-    sys.exit(run(max_steps = max_steps))
+    options = parseOptions(argv)
+
+    if (options.seed is not None):
+        random.seed(options.seed)
+
+    if (options.headless):
+        runHeadless(options.steps, options.batchSize)
+        return
+
+    # Defer importing the GUI (and tkinter) unless we actually need it.
+    from pacai.ui.crawler.gui import run
+    sys.exit(run(max_steps = options.steps))
 
 if __name__ == '__main__':
     main(sys.argv)
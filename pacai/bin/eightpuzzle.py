@@ -1,8 +1,89 @@
+import argparse
+import logging
+import os
 import random
+import sys
+import textwrap
 
+from pacai.core.search import heuristic
 from pacai.core.search import search
+from pacai.core.search.patterndb import buildPatternDatabase
+from pacai.core.search.patterndb import loadPatternDatabase
 from pacai.core.search.problem import SearchProblem
+from pacai.util import reflection
 from pacai.util.logs import initLogging
+from pacai.util.logs import updateLoggingLevel
+
+# The moves of the blank space, and how they change its (row, col).
+MOVES = [
+    ('up', -1, 0),
+    ('down', 1, 0),
+    ('left', 0, -1),
+    ('right', 0, 1),
+]
+
+# {size: PuzzleTables, ...}
+_tables = {}
+
+class PuzzleTables(object):
+    """
+    Precomputed information about square puzzles of a single size.
+
+    A puzzle is packed into a single int,
+    where each cell (left to right, top to bottom) gets a fixed number of bits
+    that hold the number in that cell.
+    The move table holds the legal moves for each position of the blank,
+    as dicts of {move: (new blank position, bit shift of the new blank position)}.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.numCells = size * size
+        self.bits = max(1, (self.numCells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        self.goal = 0
+        for number in range(self.numCells):
+            self.goal |= number << (number * self.bits)
+
+        self.moves = []
+        self.moveNames = []
+        for position in range(self.numCells):
+            row, col = divmod(position, size)
+
+            cellMoves = {}
+            for move, dRow, dCol in MOVES:
+                newRow = row + dRow
+                newCol = col + dCol
+                if (newRow < 0 or newRow >= size or newCol < 0 or newCol >= size):
+                    continue
+
+                newPosition = newRow * size + newCol
+                cellMoves[move] = (newPosition, newPosition * self.bits)
+
+            self.moves.append(cellMoves)
+            self.moveNames.append(tuple(cellMoves.keys()))
+
+    def pack(self, numbers):
+        packed = 0
+        for position in range(len(numbers)):
+            packed |= numbers[position] << (position * self.bits)
+
+        return packed
+
+    def unpack(self, packed):
+        return [(packed >> (position * self.bits)) & self.mask
+                for position in range(self.numCells)]
+
+def getPuzzleTables(size):
+    """
+    Get the (shared) tables for puzzles of the given size.
+    """
+
+    if (size not in _tables):
+        _tables[size] = PuzzleTables(size)
+
+    return _tables[size]
 
 class EightPuzzleState:
     """
@@ -11,6 +92,9 @@ class EightPuzzleState:
     This class defines the mechanics of the puzzle itself.
     The task of recasting this puzzle as a search problem is left to
     the EightPuzzleSearchProblem class.
+
+    The puzzle is packed into a single int (see `PuzzleTables`),
+    so moving, comparing, and hashing puzzles all take constant time.
     """
 
     def __init__(self, numbers):
@@ -31,18 +115,38 @@ class EightPuzzleState:
         | 6 | 7 | 8 |
         ------------
 
-        The state of the puzzle is stored in a 2-dimensional list (a list of lists) 'cells'.
+        The state of the puzzle can be viewed as a 2-dimensional list (a list of lists) 'cells'.
+
+        Larger square puzzles (e.g. the 15 puzzle) can be made by passing in more numbers,
+        the size of the puzzle is the square root of the number of numbers.
+        """
+
+        self.size = int(round(len(numbers) ** 0.5))
+        if (self.size * self.size != len(numbers)):
+            raise ValueError('A puzzle must have a square number of cells, found %d.'
+                    % (len(numbers)))
+
+        if (sorted(numbers) != list(range(len(numbers)))):
+            raise ValueError('A puzzle must have each number from 0 to %d exactly once.'
+                    % (len(numbers) - 1))
+
+        self._tables = getPuzzleTables(self.size)
+        self._packed = self._tables.pack(numbers)
+        self._blank = list(numbers).index(0)
+
+    @property
+    def blankLocation(self):
+        return divmod(self._blank, self.size)
+
+    @property
+    def cells(self):
+        """
+        A (new) 2-dimensional list of the numbers in this puzzle.
+        Changing this list does not change the puzzle.
         """
 
-        self.cells = []
-        numbers = numbers[:]  # Make a copy so as not to cause side-effects.
-        numbers.reverse()
-        for row in range(3):
-            self.cells.append([])
-            for col in range(3):
-                self.cells[row].append(numbers.pop())
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col
+        numbers = self.getNumbers()
+        return [numbers[(row * self.size):((row + 1) * self.size)] for row in range(self.size)]
 
     def isGoal(self):
         """
@@ -63,13 +167,7 @@ class EightPuzzleState:
         False
         """
 
-        current = 0
-        for row in range(3):
-            for col in range(3):
-                if current != self.cells[row][col]:
-                    return False
-                current += 1
-        return True
+        return self._packed == self._tables.goal
 
     def legalMoves(self):
         """
@@ -82,21 +180,7 @@ class EightPuzzleState:
         ['down', 'right']
         """
 
-        moves = []
-        row, col = self.blankLocation
-        if(row != 0):
-            moves.append('up')
-
-        if(row != 2):
-            moves.append('down')
-
-        if(col != 0):
-            moves.append('left')
-
-        if(col != 2):
-            moves.append('right')
-
-        return moves
+        return list(self._tables.moveNames[self._blank])
 
     def result(self, move):
         """
@@ -104,38 +188,52 @@ class EightPuzzleState:
         updated based on the provided move.
 
         The move should be a string drawn from a list returned by legalMoves.
-        Illegal moves will raise an exception, which may be an array bounds
-        exception.
+        Illegal moves will raise an exception.
 
         NOTE: This function *does not* change the current object.
         Instead, it returns a new object.
         """
 
-        row, col = self.blankLocation
-        if (move == 'up'):
-            newrow = row - 1
-            newcol = col
-        elif (move == 'down'):
-            newrow = row + 1
-            newcol = col
-        elif (move == 'left'):
-            newrow = row
-            newcol = col - 1
-        elif (move == 'right'):
-            newrow = row
-            newcol = col + 1
-        else:
+        cellMoves = self._tables.moves[self._blank]
+        if (move not in cellMoves):
             raise Exception('Illegal Move')
 
-        # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-        newPuzzle.cells = [values[:] for values in self.cells]
-        # And update it to reflect the move
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
-        newPuzzle.blankLocation = newrow, newcol
+        newBlank, newShift = cellMoves[move]
+
+        # The number that slides into the blank's old cell.
+        number = (self._packed >> newShift) & self._tables.mask
+        blankShift = self._blank * self._tables.bits
+        packed = self._packed - (number << newShift) + (number << blankShift)
 
-        return newPuzzle
+        return self._fromPacked(packed, newBlank)
+
+    def getNumbers(self):
+        """
+        Get the numbers in this puzzle in the same order that they are given to the constructor
+        (left to right, top to bottom).
+
+        >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).getNumbers()
+        [1, 0, 2, 3, 4, 5, 6, 7, 8]
+        """
+
+        return self._tables.unpack(self._packed)
+
+    def getPacked(self):
+        """
+        Get the int that this puzzle is packed into.
+        Two puzzles of the same size are equal if and only if their packed ints are equal.
+        """
+
+        return self._packed
+
+    def _fromPacked(self, packed, blank):
+        puzzle = type(self).__new__(type(self))
+        puzzle.size = self.size
+        puzzle._tables = self._tables
+        puzzle._packed = packed
+        puzzle._blank = blank
+
+        return puzzle
 
     # Utilities for comparison and display
     def __eq__(self, other):
@@ -147,14 +245,18 @@ class EightPuzzleState:
         True
         """
 
-        for row in range(3):
-            if self.cells[row] != other.cells[row]:
-                return False
-
-        return True
+        return self._packed == other._packed and self.size == other.size
 
     def __hash__(self):
-        return hash(str(self.cells))
+        return hash(self._packed)
+
+    def __lt__(self, other):
+        """
+        An arbitrary (but consistent) ordering,
+        so puzzles can break ties in priority queues.
+        """
+
+        return self._packed < other._packed
 
     def __getAsciiString(self):
         """
@@ -162,7 +264,8 @@ class EightPuzzleState:
         """
 
         lines = []
-        horizontalLine = ('-' * (13))
+        width = len(str(self.size * self.size - 1))
+        horizontalLine = ('-' * ((width + 3) * self.size + 1))
         lines.append(horizontalLine)
 
         for row in self.cells:
@@ -170,7 +273,7 @@ class EightPuzzleState:
             for col in row:
                 if col == 0:
                     col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+                rowLine = rowLine + ' ' + col.__str__().rjust(width) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
 
@@ -179,6 +282,18 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+class FifteenPuzzleState(EightPuzzleState):
+    """
+    The 4x4 version of the eight puzzle.
+    All the mechanics are the same, but there are 16 cells (numbered 0 to 15).
+    """
+
+    def __init__(self, numbers):
+        if (len(numbers) != 16):
+            raise ValueError('A fifteen puzzle must have 16 cells, found %d.' % (len(numbers)))
+
+        super().__init__(numbers)
+
 class EightPuzzleSearchProblem(SearchProblem):
     """
     Implementation of a SearchProblem for the Eight Puzzle domain
@@ -232,6 +347,12 @@ EIGHT_PUZZLE_DATA = [
     [0, 3, 1, 6, 8, 2, 7, 5, 4],
 ]
 
+# The patterns used when building a new pattern database, by puzzle size.
+DEFAULT_PATTERNS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)],
+}
+
 def loadEightPuzzle(puzzleNumber):
     """
     puzzleNumber: The number of the eight puzzle to load.
@@ -253,33 +374,209 @@ def loadEightPuzzle(puzzleNumber):
 
     return EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
 
-def createRandomEightPuzzle(moves = 100):
+def createRandomEightPuzzle(moves = 100, size = 3):
     """
     moves: number of random moves to apply
+    size: the width (and height) of the puzzle, 4 will make a fifteen puzzle
 
     Creates a random eight puzzle by applying
     a series of 'moves' random moves to a solved
     puzzle.
     """
-    puzzle = EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8])
+    if (size == 4):
+        puzzle = FifteenPuzzleState(list(range(size * size)))
+    else:
+        puzzle = EightPuzzleState(list(range(size * size)))
+
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
     return puzzle
 
-def main():
+def countReachableStates(puzzle):
+    """
+    Count every state that can be reached from the given puzzle (including itself)
+    with a breadth-first search.
+
+    Only half of all the orderings of a puzzle's numbers can be reached from any one ordering,
+    so this is 181,440 for the eight puzzle.
+    Since this touches every state, it makes a good benchmark of the puzzle mechanics.
+    """
+
+    seen = {puzzle}
+    fringe = [puzzle]
+
+    while (len(fringe) > 0):
+        nextFringe = []
+        for state in fringe:
+            for move in state.legalMoves():
+                successor = state.result(move)
+                if (successor not in seen):
+                    seen.add(successor)
+                    nextFringe.append(successor)
+
+        fringe = nextFringe
+
+    return len(seen)
+
+def parseOptions(argv):
+    """
+    Processes the command used to run the eight puzzle from the command line.
+    """
+
+    description = """
+    DESCRIPTION:
+        This program will create a random eight puzzle (or a larger puzzle) and solve it.
+
+    EXAMPLES:
+        (1) python -m pacai.bin.eightpuzzle
+            - Solves a random eight puzzle with breadth first search.
+        (2) python -m pacai.bin.eightpuzzle --size 4 --search smastar --memory-limit 5000
+                --pattern-db fifteen.pdb
+            - Solves a random fifteen puzzle with memory-bounded A*,
+              using (and building, if it does not exist) a pattern database.
+    """
+
+    parser = argparse.ArgumentParser(description = textwrap.dedent(description),
+        prog = os.path.basename(__file__), formatter_class = argparse.RawTextHelpFormatter)
+
+    parser.add_argument('-d', '--debug', dest = 'debug',
+            action = 'store_true', default = False,
+            help = 'set logging level to debug (default: %(default)s)')
+
+    parser.add_argument('-m', '--moves', dest = 'moves',
+            action = 'store', type = int, default = 25,
+            help = 'number of random moves used to create the puzzle (default: %(default)s)')
+
+    parser.add_argument('-q', '--quiet', dest = 'quiet',
+            action = 'store_true', default = False,
+            help = 'set logging level to warning (default: %(default)s)')
+
+    parser.add_argument('-s', '--seed', dest = 'seed',
+            action = 'store', type = int, default = None,
+            help = 'Enter seed value to randomize the puzzle')
+
+    parser.add_argument('--heuristic', dest = 'heuristic',
+            action = 'store', type = str, default = 'null',
+            help = 'the heuristic to use, either the name of a function in\n'
+                + 'pacai.core.search.heuristic or a fully qualified name (default: %(default)s)')
+
+    parser.add_argument('--memory-limit', dest = 'memoryLimit',
+            action = 'store', type = int, default = None,
+            help = 'the maximum number of search nodes to hold,\n'
+                + 'for searches that take a memory limit (default: %(default)s)')
+
+    parser.add_argument('--pattern-db', dest = 'patternDB',
+            action = 'store', type = str, default = None,
+            help = 'use the pattern database at this path as the heuristic, the database\n'
+                + 'will be built (and saved) if it does not exist (default: %(default)s)')
+
+    parser.add_argument('--search', dest = 'search',
+            action = 'store', type = str, default = 'bfs',
+            help = 'the search function to use, either the name of a function in\n'
+                + 'pacai.core.search.search or a fully qualified name (default: %(default)s)')
+
+    parser.add_argument('--size', dest = 'size',
+            action = 'store', type = int, default = 3,
+            help = 'the width (and height) of the puzzle (default: %(default)s)')
+
+    parser.add_argument('--skip-steps', dest = 'skipSteps',
+            action = 'store_true', default = False,
+            help = 'do not show (and wait on) each step of the solution (default: %(default)s)')
+
+    options, otherjunk = parser.parse_known_args(argv)
+
+    if len(otherjunk) != 0:
+        raise ValueError('Unrecognized options: \'%s\'.' % (str(otherjunk)))
+
+    # Set the logging level
+    if options.quiet and options.debug:
+        raise ValueError('Logging cannont be set to both debug and quiet.')
+
+    if options.quiet:
+        updateLoggingLevel(logging.WARNING)
+    elif options.debug:
+        updateLoggingLevel(logging.DEBUG)
+
+    if (options.size < 2):
+        raise ValueError('A puzzle must be at least 2x2, got a size of %d.' % (options.size))
+
+    # If seed value is not entered generate a random seed value.
+    seed = options.seed
+    if seed is None:
+        seed = random.randint(0, 2**32)
+    random.seed(seed)
+    logging.debug('Seed value: ' + str(seed))
+
+    return options
+
+def getPatternDatabase(path, size):
+    """
+    Load the pattern database at the given path,
+    or build one (using `DEFAULT_PATTERNS`) and save it there if it does not exist.
+    """
+
+    if (os.path.exists(path)):
+        database = loadPatternDatabase(path)
+        if (database.getSize() != size):
+            raise ValueError('Pattern database (%s) is for a puzzle of size %d, not %d.'
+                    % (path, database.getSize(), size))
+
+        return database
+
+    if (size not in DEFAULT_PATTERNS):
+        raise ValueError('There are no default patterns for a puzzle of size %d.' % (size))
+
+    logging.info('Building a pattern database for a puzzle of size %d.' % (size))
+    database = buildPatternDatabase(size, DEFAULT_PATTERNS[size])
+    database.save(path)
+
+    return database
+
+def _fetchFunction(name, module):
+    if (hasattr(module, name)):
+        return getattr(module, name)
+
+    return reflection.qualifiedImport(name)
+
+def main(argv):
     """
     Entry point for the eightpuzzle simulation.
+    The args are a blind pass of `sys.argv` with the executable stripped.
     """
 
     initLogging()
 
-    puzzle = createRandomEightPuzzle(25)
+    options = parseOptions(argv)
+
+    puzzle = createRandomEightPuzzle(options.moves, options.size)
     print('A random puzzle:\n' + str(puzzle))
 
+    searchFunction = _fetchFunction(options.search, search)
+    searchArgs = {}
+
+    if (options.patternDB is not None):
+        heuristicFunction = getPatternDatabase(options.patternDB, options.size)
+    else:
+        heuristicFunction = _fetchFunction(options.heuristic, heuristic)
+
+    if ('heuristic' in searchFunction.__code__.co_varnames):
+        searchArgs['heuristic'] = heuristicFunction
+
+    if (options.memoryLimit is not None):
+        if ('memoryLimit' not in searchFunction.__code__.co_varnames):
+            raise ValueError('The search function (%s) does not take a memory limit.'
+                    % (options.search))
+
+        searchArgs['memoryLimit'] = options.memoryLimit
+
     problem = EightPuzzleSearchProblem(puzzle)
-    path = search.bfs(problem)
-    print('BFS found a path of %d moves: %s' % (len(path), str(path)))
+    path = searchFunction(problem, **searchArgs)
+    print('%s found a path of %d moves: %s' % (options.search, len(path), str(path)))
+
+    if (options.skipSteps):
+        return
+
     curr = puzzle
     i = 1
     for a in path:
@@ -290,4 +587,4 @@ def main():
         i += 1
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
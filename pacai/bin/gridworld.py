@@ -5,7 +5,9 @@ import random
 import sys
 import textwrap
 
+from pacai.agents.learning import checkpoint
 from pacai.agents.learning.reinforcement import ReinforcementAgent
+from pacai.core.batchEnvironment import BatchEnvironment
 from pacai.core.environment import Environment
 from pacai.core.mdp import MarkovDecisionProcess
 from pacai.student.qlearningAgents import QLearningAgent
@@ -15,6 +17,18 @@ from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
 
 class Gridworld(MarkovDecisionProcess):
+    """
+    A grid MDP.
+
+    Solvers and displays ask about the same states and transitions over and over,
+    so the states, actions, rewards, and transitions are all cached the first time they are
+    computed.
+    The caches are cleared when the noise or living reward is changed,
+    so those should only be changed through `Gridworld.setNoise` and `Gridworld.setLivingReward`.
+    The grid itself should not be changed after the gridworld is made.
+    The cached lists are shared, so callers should not modify them.
+    """
+
     def __init__(self, grid):
         # layout
         if (isinstance(grid, list)):
@@ -26,6 +40,17 @@ class Gridworld(MarkovDecisionProcess):
         self.livingReward = 0.0
         self.noise = 0.2
 
+        self._states = None
+
+        # {state: actions, ...}
+        self._actions = {}
+
+        # {state: reward for leaving the state, ...}
+        self._rewards = {}
+
+        # {(state, action): [(nextState, prob), ...], ...}
+        self._transitions = {}
+
     def setLivingReward(self, reward):
         """
         The (negative) reward for exiting "normal" states.
@@ -36,6 +61,7 @@ class Gridworld(MarkovDecisionProcess):
         """
 
         self.livingReward = reward
+        self._rewards.clear()
 
     def setNoise(self, noise):
         """
@@ -43,6 +69,7 @@ class Gridworld(MarkovDecisionProcess):
         """
 
         self.noise = noise
+        self._transitions.clear()
 
     def getPossibleActions(self, state):
         """
@@ -53,20 +80,30 @@ class Gridworld(MarkovDecisionProcess):
         state under the special action "done".
         """
 
-        if state == self.grid.terminalState:
-            return ()
+        actions = self._actions.get(state)
+        if (actions is not None):
+            return actions
 
-        x, y = state
-        if isinstance(self.grid[x][y], int):
-            return ('exit', )
+        if state == self.grid.terminalState:
+            actions = ()
+        else:
+            x, y = state
+            if isinstance(self.grid[x][y], int) or isinstance(self.grid[x][y], float):
+                actions = ('exit', )
+            else:
+                actions = ('north', 'west', 'south', 'east')
 
-        return ('north', 'west', 'south', 'east')
+        self._actions[state] = actions
+        return actions
 
     def getStates(self):
         """
         Return list of all states.
         """
 
+        if (self._states is not None):
+            return self._states
+
         # The true terminal state.
         states = [self.grid.terminalState]
         for x in range(self.grid.width):
@@ -75,6 +112,7 @@ class Gridworld(MarkovDecisionProcess):
                     state = (x, y)
                     states.append(state)
 
+        self._states = states
         return states
 
     def getReward(self, state, action, nextState):
@@ -86,15 +124,20 @@ class Gridworld(MarkovDecisionProcess):
         less use this convention).
         """
 
-        if state == self.grid.terminalState:
-            return 0.0
+        reward = self._rewards.get(state)
+        if (reward is not None):
+            return reward
 
-        x, y = state
-        cell = self.grid[x][y]
-        if isinstance(cell, int) or isinstance(cell, float):
-            return cell
+        if state == self.grid.terminalState:
+            reward = 0.0
+        else:
+            x, y = state
+            reward = self.grid[x][y]
+            if not (isinstance(reward, int) or isinstance(reward, float)):
+                reward = self.livingReward
 
-        return self.livingReward
+        self._rewards[state] = reward
+        return reward
 
     def getStartState(self):
         for x in range(self.grid.width):
@@ -123,9 +166,18 @@ class Gridworld(MarkovDecisionProcess):
         with their transition probabilities.
         """
 
+        transitions = self._transitions.get((state, action))
+        if (transitions is not None):
+            return transitions
+
         if action not in self.getPossibleActions(state):
             raise Exception('Illegal action!')
 
+        transitions = self.__computeTransitions(state, action)
+        self._transitions[(state, action)] = transitions
+        return transitions
+
+    def __computeTransitions(self, state, action):
         if self.isTerminal(state):
             return []
 
@@ -349,12 +401,15 @@ def runEpisode(agent, environment, discount, decision, display, message, pause,
 
         # EXECUTE ACTION
         nextState, reward = environment.doAction(action)
-        logString = ''
-        logString += '\nStarted in state: ' + str(state)
-        logString += '\nTook action: ' + str(action)
-        logString += '\nEnded in state: ' + str(nextState)
-        logString += '\nGot reward: ' + str(reward) + '\n'
-        logging.debug(logString)
+
+        # Only build the log message if someone will see it.
+        if (logging.getLogger().isEnabledFor(logging.DEBUG)):
+            logString = ''
+            logString += '\nStarted in state: ' + str(state)
+            logString += '\nTook action: ' + str(action)
+            logString += '\nEnded in state: ' + str(nextState)
+            logString += '\nGot reward: ' + str(reward) + '\n'
+            logging.debug(logString)
 
         # Update learner.
         if (isinstance(agent, ReinforcementAgent)):
@@ -387,7 +442,8 @@ def parseOptions(argv):
 
     parser.add_argument('-a', '--agent', dest = 'agent',
             action = 'store', type = str, default = 'random',
-            help = 'agent type (options are \'random\', \'value\' and \'q\', default %(default)s)')
+            help = 'agent type (options are \'random\', \'value\', \'matrix\', \'policy\' '
+                + 'and \'q\', default %(default)s)')
 
     parser.add_argument('-d', '--debug', dest = 'debug',
             action = 'store_true', default = False,
@@ -403,7 +459,7 @@ def parseOptions(argv):
 
     parser.add_argument('-i', '--iterations', dest = 'iters',
             action = 'store', type = int, default = 10,
-            help = 'number of rounds of value iteration (default %(default)s)')
+            help = 'number of rounds of value (or policy) iteration (default %(default)s)')
 
     parser.add_argument('-k', '--episodes', dest = 'episodes',
             action = 'store', type = int, default = 1,
@@ -441,6 +497,26 @@ def parseOptions(argv):
             action = 'store', type = float, default = 0.9,
             help = 'discount on future (default %(default)s)')
 
+    parser.add_argument('--batch-size', dest = 'batchSize',
+            action = 'store', type = int, default = 0,
+            help = 'run the episodes of the q agent headless, K environments at a time, '
+                + 'learning from all of them '
+                + '(0 to run them one at a time with the display) (default %(default)s)')
+
+    parser.add_argument('--checkpoint-every', dest = 'checkpointEvery',
+            action = 'store', type = int, default = 0,
+            help = 'save the q agent to the --save-agent path after every this many episodes, '
+                + '0 to only save at the end (default %(default)s)')
+
+    parser.add_argument('--evaluation-sweeps', dest = 'evaluationSweeps',
+            action = 'store', type = int, default = None,
+            help = 'evaluate each policy of the policy agent with this many sweeps, '
+                + 'instead of exactly (modified policy iteration) (default %(default)s)')
+
+    parser.add_argument('--load-agent', dest = 'loadAgent',
+            action = 'store', type = str, default = None,
+            help = 'load what the q agent has learned from this checkpoint (default %(default)s)')
+
     parser.add_argument('--manual', dest = 'manual',
             action = 'store_true', default = False,
             help = 'manually control agent (default %(default)s)')
@@ -449,10 +525,27 @@ def parseOptions(argv):
             action = 'store_true', default = False,
             help = 'generate no graphics (default: %(default)s)')
 
+    parser.add_argument('--save-agent', dest = 'saveAgent',
+            action = 'store', type = str, default = None,
+            help = 'save what the q agent has learned to this checkpoint '
+                + 'after all the episodes (default %(default)s)')
+
+    parser.add_argument('--sweep', dest = 'sweep',
+            action = 'store', type = str, default = 'sync',
+            choices = ['sync', 'gauss-seidel', 'prioritized'],
+            help = 'how the value agent updates values: synchronous sweeps, '
+                + 'in place (gauss-seidel) sweeps, or prioritized sweeping '
+                + '(the matrix agent only does sync) (default %(default)s)')
+
     parser.add_argument('--text-graphics', dest = 'textGraphics',
             action = 'store_true', default = False,
             help = 'display output as text only (default: %(default)s)')
 
+    parser.add_argument('--tolerance', dest = 'tolerance',
+            action = 'store', type = float, default = None,
+            help = 'stop value iteration (or policy evaluation) early '
+                + 'once no value changes by more than this (default %(default)s)')
+
     parser.add_argument('--window-size', dest = 'gridSize',
             action = 'store', type = int, default = 150,
             help = 'request a window width of X pixels *per grid cell* (default %(default)s)')
@@ -475,6 +568,22 @@ def parseOptions(argv):
         logging.info('Disabling Agents in Manual Mode.')
         options.agent = None
 
+    if ((options.loadAgent is not None or options.saveAgent is not None)
+            and options.agent != 'q'):
+        raise ValueError('Only the q agent can be loaded or saved.')
+
+    if (options.agent in ('matrix', 'policy') and options.sweep != 'sync'):
+        raise ValueError('Only the value agent supports sweeps other than sync.')
+
+    if (options.batchSize < 0):
+        raise ValueError('The batch size cannot be negative, got %d.' % (options.batchSize))
+
+    if (options.batchSize > 0 and (options.agent != 'q' or options.manual)):
+        raise ValueError('Only the q agent (without --manual) can run episodes in batches.')
+
+    if (options.checkpointEvery > 0 and options.saveAgent is None):
+        raise ValueError('Checkpoints need a path to be saved to (--save-agent).')
+
     # MANAGE CONFLICTS
     if options.textGraphics or options.nullGraphics:
         options.pause = False
@@ -488,6 +597,7 @@ def main(argv):
     """
     Entry point for the gridworld simulation
     The args are a blind pass of `sys.argv` with the executable stripped.
+    Returns the agent.
     """
 
     initLogging()
@@ -520,7 +630,18 @@ def main(argv):
 
     a = None
     if (opts.agent == 'value'):
-        a = ValueIterationAgent(0, mdp, opts.discount, opts.iters)
+        a = ValueIterationAgent(0, mdp, opts.discount, opts.iters, opts.tolerance, opts.sweep)
+    elif (opts.agent == 'matrix'):
+        # Defer importing the matrix solver (and NumPy) unless we actually need it.
+        from pacai.agents.learning.matrixValueIteration import MatrixValueIterationAgent
+
+        a = MatrixValueIterationAgent(0, mdp, opts.discount, opts.iters, opts.tolerance)
+    elif (opts.agent == 'policy'):
+        # Defer importing the matrix solver (and NumPy) unless we actually need it.
+        from pacai.agents.learning.policyIteration import PolicyIterationAgent
+
+        a = PolicyIterationAgent(0, mdp, opts.discount, opts.iters, opts.evaluationSweeps,
+                opts.tolerance)
     elif (opts.agent == 'q'):
         qLearnOpts = {
             'gamma': opts.discount,
@@ -528,7 +649,14 @@ def main(argv):
             'epsilon': opts.epsilon,
             'actionFn': lambda state: mdp.getPossibleActions(state),
         }
+
+        # Batched episodes are all for training.
+        if (opts.batchSize > 0):
+            qLearnOpts['numTraining'] = opts.episodes
         a = QLearningAgent(0, **qLearnOpts)
+
+        if (opts.loadAgent is not None):
+            checkpoint.loadAgent(a, opts.loadAgent)
     elif (opts.agent == 'random'):
         # No reason to use the random agent without episodes.
         if (opts.episodes == 0):
@@ -561,10 +689,10 @@ def main(argv):
     ###########################
 
     # Display q/v values before simulation of episodes.
-    if (not opts.manual and opts.agent == 'value'):
+    if (not opts.manual and opts.agent in ('value', 'matrix', 'policy')):
         if (opts.valueSteps):
             for i in range(opts.iters):
-                tempAgent = ValueIterationAgent(0, mdp, opts.discount, i)
+                tempAgent = type(a)(0, mdp, opts.discount, i)
                 display.displayValues(tempAgent, message = 'VALUES AFTER ' + str(i) + ' ITERATIONS')
                 display.pause()
 
@@ -581,7 +709,7 @@ def main(argv):
         else:
             if (opts.agent == 'random'):
                 displayCallback = lambda state: display.displayValues(a, state, 'CURRENT VALUES')
-            elif (opts.agent == 'value'):
+            elif (opts.agent in ('value', 'matrix', 'policy')):
                 displayCallback = lambda state: display.displayValues(a, state, 'CURRENT VALUES')
             elif (opts.agent == 'q'):
                 displayCallback = lambda state: display.displayQValues(a, state, 'CURRENT Q-VALUES')
@@ -605,10 +733,25 @@ def main(argv):
     if (opts.episodes > 0):
         logging.debug('RUNNING ' + str(opts.episodes) + ' EPISODES')
 
+    def episodeCallback(episode, episodeReturns):
+        if (opts.checkpointEvery > 0 and episode % opts.checkpointEvery == 0):
+            checkpoint.saveAgent(a, opts.saveAgent)
+
     returns = 0
-    for episode in range(1, opts.episodes + 1):
-        returns += runEpisode(a, env, opts.discount, decisionCallback, displayCallback,
-                messageCallback, pauseCallback, episode)
+    if (opts.batchSize > 0):
+        environments = [GridworldEnvironment(mdp) for i in range(opts.batchSize)]
+        returns = sum(BatchEnvironment(environments).run(a, numEpisodes = opts.episodes,
+                discount = opts.discount, callback = episodeCallback))
+    else:
+        for episode in range(1, opts.episodes + 1):
+            episodeReturns = runEpisode(a, env, opts.discount, decisionCallback, displayCallback,
+                    messageCallback, pauseCallback, episode)
+
+            returns += episodeReturns
+            episodeCallback(episode, episodeReturns)
+
+    if (opts.saveAgent is not None):
+        checkpoint.saveAgent(a, opts.saveAgent)
 
     if (opts.episodes > 0):
         logging.debug('AVERAGE RETURNS FROM START STATE:' + str((returns + 0.0) / opts.episodes))
@@ -620,6 +763,61 @@ def main(argv):
         display.displayValues(a, message = 'VALUES AFTER ' + str(opts.episodes) + ' EPISODES')
         display.pause()
 
+    return a
+
+def generateGridworld(width, height, wallDensity = 0.2, exitRewards = (1, -1), noise = 0.2,
+        livingReward = 0.0, seed = None):
+    """
+    Generate a random (width x height) gridworld.
+
+    Each cell is a wall with a probability of wallDensity.
+    The start and one exit for each of the exit rewards are then put on random open cells.
+    Walls do not have to leave every cell reachable, the unreachable cells are still states.
+    The same seed always generates the same gridworld
+    (and the global random state is left alone).
+    """
+
+    if (width < 1 or height < 1):
+        raise ValueError('A gridworld must be at least 1x1, got %dx%d.' % (width, height))
+
+    if (wallDensity < 0.0 or wallDensity >= 1.0):
+        raise ValueError('The wall density must be in [0, 1), got %f.' % (wallDensity))
+
+    rng = random.Random(seed)
+
+    grid = Grid(width, height)
+    grid.data = [['#' if rng.random() < wallDensity else ' ' for y in range(height)]
+            for x in range(width)]
+
+    openCells = [(x, y) for x in range(width) for y in range(height) if grid[x][y] != '#']
+    numSpecial = 1 + len(exitRewards)
+
+    # Knock down walls until there is room for the start and exits.
+    if (len(openCells) < numSpecial):
+        if (width * height < numSpecial):
+            raise ValueError('A %dx%d gridworld has no room for a start and %d exits.'
+                    % (width, height, len(exitRewards)))
+
+        walls = [(x, y) for x in range(width) for y in range(height) if grid[x][y] == '#']
+        for x, y in rng.sample(walls, numSpecial - len(openCells)):
+            grid[x][y] = ' '
+            openCells.append((x, y))
+
+    cells = rng.sample(openCells, numSpecial)
+
+    x, y = cells[0]
+    grid[x][y] = 'S'
+
+    for i in range(len(exitRewards)):
+        x, y = cells[i + 1]
+        grid[x][y] = exitRewards[i]
+
+    mdp = Gridworld(grid)
+    mdp.setNoise(noise)
+    mdp.setLivingReward(livingReward)
+
+    return mdp
+
 def _getGridWorld(name):
     name = name.lower()
 
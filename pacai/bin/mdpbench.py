@@ -0,0 +1,308 @@
+"""
+A benchmark of how the MDP solvers scale.
+
+Each solver is run on randomly generated gridworlds (see `pacai.bin.gridworld.generateGridworld`)
+of increasing size, and the time it takes to converge and the memory it uses are reported.
+Each run is done in a fresh process, so that runs do not share caches
+and a run that goes over the time limit can be stopped.
+"""
+
+import argparse
+import csv
+import logging
+import multiprocessing
+import os
+import sys
+import textwrap
+import time
+
+from pacai.bin.gridworld import generateGridworld
+from pacai.util.logs import initLogging
+from pacai.util.logs import updateLoggingLevel
+
+AGENTS = ['value', 'gauss-seidel', 'prioritized', 'matrix', 'policy']
+
+DEFAULT_SIZES = '10,30,100,300,1000'
+
+COLUMNS = ['width', 'height', 'states', 'agent', 'seconds', 'work', 'memoryMB']
+
+def getAgent(name, mdp, discount, iters, tolerance):
+    """
+    Build (and so solve the MDP with) one of the AGENTS.
+    Returns a tuple of: (agent, how much work it did), where the work is in the agent's own units
+    (single state backups, full sweeps, or policy improvements).
+    """
+
+    agentClass = _getAgentClass(name)
+
+    if (name in ('value', 'gauss-seidel', 'prioritized')):
+        sweep = name
+        if (name == 'value'):
+            sweep = 'sync'
+
+        agent = agentClass(0, mdp, discount, iters, tolerance, sweep)
+        return agent, '%d backups' % (agent.numBackups)
+    elif (name == 'matrix'):
+        agent = agentClass(0, mdp, discount, iters, tolerance)
+        return agent, '%d sweeps' % (agent.numSweeps)
+
+    agent = agentClass(0, mdp, discount, iters, tolerance = tolerance)
+    return agent, '%d improvements' % (agent.numIterations)
+
+def runBenchmark(name, width, height, options):
+    """
+    Generate a gridworld and solve it with an agent.
+    Returns a dict with all the COLUMNS.
+    The memory is how much the peak resident memory grew while solving
+    (only known on systems with the `resource` module).
+    """
+
+    mdp = generateGridworld(width, height, options.wallDensity, options.exitRewards,
+            options.noise, options.livingReward, options.seed)
+
+    # Import the agent before starting the clock, so the import is not counted.
+    _getAgentClass(name)
+
+    startMemory = _getPeakMemory()
+    startTime = time.perf_counter()
+
+    agent, work = getAgent(name, mdp, options.discount, options.iters, options.tolerance)
+
+    seconds = time.perf_counter() - startTime
+    endMemory = _getPeakMemory()
+
+    memory = None
+    if (startMemory is not None):
+        memory = (endMemory - startMemory) / 1024.0
+
+    return {
+        'width': width,
+        'height': height,
+        'states': len(mdp.getStates()),
+        'agent': name,
+        'seconds': seconds,
+        'work': work,
+        'memoryMB': memory,
+    }
+
+def _getAgentClass(name):
+    # Defer importing the matrix solvers (and NumPy) unless we actually need them.
+    if (name in ('value', 'gauss-seidel', 'prioritized')):
+        from pacai.student.valueIterationAgent import ValueIterationAgent
+        return ValueIterationAgent
+    elif (name == 'matrix'):
+        from pacai.agents.learning.matrixValueIteration import MatrixValueIterationAgent
+        return MatrixValueIterationAgent
+    elif (name == 'policy'):
+        from pacai.agents.learning.policyIteration import PolicyIterationAgent
+        return PolicyIterationAgent
+
+    raise ValueError('Unknown agent: "%s". Expected one of: %s.' % (name, AGENTS))
+
+def _getPeakMemory():
+    """
+    Get the peak resident memory of this process (in KB), or None if it is not available.
+    """
+
+    # Only import resource when it is needed, since it is not available on all systems.
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peakMemory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports the peak in bytes, instead of in KB like Linux.
+    if (sys.platform == 'darwin'):
+        peakMemory /= 1024.0
+
+    return peakMemory
+
+def _formatRow(row):
+    seconds = row['seconds']
+    if (isinstance(seconds, float)):
+        seconds = '%.3f' % (seconds)
+
+    memory = row['memoryMB']
+    if (isinstance(memory, float)):
+        memory = '%.1f' % (memory)
+    elif (memory is None):
+        memory = '-'
+
+    size = '%dx%d' % (row['width'], row['height'])
+    return '%11s %9s %14s %10s %18s %10s' % (size, row['states'], row['agent'],
+            seconds, row['work'], memory)
+
+def parseSizes(text):
+    """
+    Parse a comma separated list of sizes: either 'N' (for NxN) or 'WxH'.
+    """
+
+    sizes = []
+    for size in text.split(','):
+        size = size.strip().lower()
+        if ('x' in size):
+            width, height = size.split('x')
+        else:
+            width, height = size, size
+
+        sizes.append((int(width), int(height)))
+
+    return sizes
+
+def parseOptions(argv):
+    """
+    Processes the command used to run the MDP benchmark from the command line.
+    """
+
+    description = """
+    DESCRIPTION:
+        This program measures how long MDP solvers take to converge (and how much memory they use)
+        on random gridworlds of increasing size.
+        Once an agent goes over the time limit, it is skipped for the larger sizes.
+
+    EXAMPLES:
+        (1) python -m pacai.bin.mdpbench
+            - Benchmarks every agent on the default sizes.
+        (2) python -m pacai.bin.mdpbench --agents matrix,policy --sizes 100,200x50
+            - Benchmarks just the matrix agents on a 100x100 and a 200x50 gridworld.
+    """
+
+    parser = argparse.ArgumentParser(description = textwrap.dedent(description),
+        prog = os.path.basename(__file__), formatter_class = argparse.RawTextHelpFormatter)
+
+    parser.add_argument('-a', '--agents', dest = 'agents',
+            action = 'store', type = str, default = ','.join(AGENTS),
+            help = 'comma separated agents to benchmark (default %(default)s)')
+
+    parser.add_argument('-d', '--debug', dest = 'debug',
+            action = 'store_true', default = False,
+            help = 'set logging level to debug (default: %(default)s)')
+
+    parser.add_argument('-i', '--iterations', dest = 'iters',
+            action = 'store', type = int, default = 10000,
+            help = 'the most rounds of value (or policy) iteration (default %(default)s)')
+
+    parser.add_argument('-n', '--noise', dest = 'noise',
+            action = 'store', type = float, default = 0.2,
+            help = 'set how often actions result in unintended directions (default %(default)s)')
+
+    parser.add_argument('-q', '--quiet', dest = 'quiet',
+            action = 'store_true', default = False,
+            help = 'set logging level to warning (default: %(default)s)')
+
+    parser.add_argument('-r', '--living-reward', dest = 'livingReward',
+            action = 'store', type = float, default = 0.0,
+            help = 'reward for living for a time step (default %(default)s)')
+
+    parser.add_argument('-s', '--seed', dest = 'seed',
+            action = 'store', type = int, default = 0,
+            help = 'the seed used to generate the gridworlds (default %(default)s)')
+
+    parser.add_argument('-y', '--discount', dest = 'discount',
+            action = 'store', type = float, default = 0.9,
+            help = 'discount on future (default %(default)s)')
+
+    parser.add_argument('--csv', dest = 'csv',
+            action = 'store', type = str, default = None,
+            help = 'also write the results to this csv file (default %(default)s)')
+
+    parser.add_argument('--exit-rewards', dest = 'exitRewards',
+            action = 'store', type = str, default = '1,-1',
+            help = 'comma separated rewards of the exits to place (default %(default)s)')
+
+    parser.add_argument('--sizes', dest = 'sizes',
+            action = 'store', type = str, default = DEFAULT_SIZES,
+            help = 'comma separated gridworld sizes, as N or WxH (default %(default)s)')
+
+    parser.add_argument('--time-limit', dest = 'timeLimit',
+            action = 'store', type = float, default = 120.0,
+            help = 'the most seconds to give a single run (default %(default)s)')
+
+    parser.add_argument('--tolerance', dest = 'tolerance',
+            action = 'store', type = float, default = 1e-6,
+            help = 'converged once no value changes by more than this (default %(default)s)')
+
+    parser.add_argument('--wall-density', dest = 'wallDensity',
+            action = 'store', type = float, default = 0.2,
+            help = 'the chance of each cell being a wall (default %(default)s)')
+
+    options, otherjunk = parser.parse_known_args(argv)
+
+    if len(otherjunk) != 0:
+        raise ValueError('Unrecognized options: \'%s\'.' % (str(otherjunk)))
+
+    # Set the logging level
+    if options.quiet and options.debug:
+        raise ValueError('Logging cannont be set to both debug and quiet.')
+
+    if options.quiet:
+        updateLoggingLevel(logging.WARNING)
+    elif options.debug:
+        updateLoggingLevel(logging.DEBUG)
+
+    options.agents = [agent.strip() for agent in options.agents.split(',')]
+    for agent in options.agents:
+        if (agent not in AGENTS):
+            raise ValueError('Unknown agent: "%s". Expected one of: %s.' % (agent, AGENTS))
+
+    options.sizes = parseSizes(options.sizes)
+    options.exitRewards = [float(reward) for reward in options.exitRewards.split(',')]
+
+    return options
+
+def main(argv):
+    """
+    Entry point for the MDP benchmark.
+    The args are a blind pass of `sys.argv` with the executable stripped.
+    Returns the rows of results (see COLUMNS).
+    """
+
+    initLogging()
+
+    options = parseOptions(argv)
+
+    print('%11s %9s %14s %10s %18s %10s' % ('size', 'states', 'agent', 'seconds', 'work',
+            'memory MB'))
+
+    rows = []
+    timedOut = set()
+
+    for width, height in options.sizes:
+        for name in options.agents:
+            if (name in timedOut):
+                continue
+
+            # A fresh process for every run, so it can be stopped if it goes over the time limit.
+            pool = multiprocessing.Pool(1, maxtasksperchild = 1)
+            try:
+                result = pool.apply_async(runBenchmark, (name, width, height, options))
+                row = result.get(options.timeLimit)
+            except multiprocessing.TimeoutError:
+                timedOut.add(name)
+                row = {
+                    'width': width,
+                    'height': height,
+                    'states': '-',
+                    'agent': name,
+                    'seconds': '> %g' % (options.timeLimit),
+                    'work': 'timed out',
+                    'memoryMB': None,
+                }
+            finally:
+                pool.terminate()
+                pool.join()
+
+            print(_formatRow(row))
+            rows.append(row)
+
+    if (options.csv is not None):
+        with open(options.csv, 'w', newline = '') as file:
+            writer = csv.DictWriter(file, fieldnames = COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return rows
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
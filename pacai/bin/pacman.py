@@ -8,6 +8,7 @@ Have fun!
 """
 
 import logging
+import multiprocessing
 import os
 import pickle
 import random
@@ -16,6 +17,8 @@ import sys
 from pacai.agents.base import BaseAgent
 from pacai.agents.ghost.random import RandomGhost
 from pacai.agents.greedy import GreedyAgent
+from pacai.agents.learning import checkpoint
+from pacai.agents.learning.reinforcement import ReinforcementAgent
 from pacai.bin.arguments import getParser
 from pacai.core.actions import Actions
 from pacai.core.directions import Directions
@@ -27,6 +30,7 @@ from pacai.ui.pacman.null import PacmanNullView
 from pacai.ui.pacman.text import PacmanTextView
 from pacai.util.logs import initLogging
 from pacai.util.logs import updateLoggingLevel
+from pacai.util.seeding import seedGame
 from pacai.util.util import nearestPoint
 
 PACMAN_AGENT_INDEX = 0
@@ -143,6 +147,7 @@ class PacmanGameState(AbstractGameState):
         self._lastAgentMoved = agentIndex
 
         self._hash = None
+        self._fingerprint = None
 
 class ClassicGameRules(object):
     """
@@ -410,6 +415,33 @@ def readCommand(argv):
             help = 'comma separated arguments to be passed to agents (e.g. \'opt1=val1,opt2\')'
                 + '(default: %(default)s)')
 
+    parser.add_argument('--checkpoint-every', dest = 'checkpointEvery',
+            action = 'store', type = int, default = 0,
+            help = 'save the pacman agent to the --save-agent path '
+                + 'after every this many training games, 0 to only save at the end '
+                + '(default: %(default)s)')
+
+    parser.add_argument('--ghost-args', dest = 'ghostArgs',
+            action = 'store', type = str, default = None,
+            help = 'comma separated arguments to be passed to the ghosts (e.g. \'distance=maze\')'
+                + '(default: %(default)s)')
+
+    parser.add_argument('--load-agent', dest = 'loadAgent',
+            action = 'store', type = str, default = None,
+            help = 'load what a learning pacman agent has learned from this checkpoint '
+                + '(default: %(default)s)')
+
+    parser.add_argument('--num-workers', dest = 'numWorkers',
+            action = 'store', type = int, default = 1,
+            help = 'play the training games on this many worker processes, '
+                + 'with the pacman agent learning from all of their games '
+                + '(only for learning agents) (default: %(default)s)')
+
+    parser.add_argument('--save-agent', dest = 'saveAgent',
+            action = 'store', type = str, default = None,
+            help = 'save what a learning pacman agent has learned to this checkpoint '
+                + 'after all the games are played (default: %(default)s)')
+
     parser.add_argument('--timeout', dest = 'timeout',
             action = 'store', type = int, default = 30,
             help = 'maximum time limit (seconds) an agent can spend computing per game '
@@ -436,6 +468,7 @@ def readCommand(argv):
         seed = random.randint(0, 2**32)
     random.seed(seed)
     logging.debug('Seed value: ' + str(seed))
+    args['seed'] = seed
 
     # Choose a layout.
     args['layout'] = getLayout(options.layout, maxGhosts = options.numGhosts)
@@ -453,6 +486,10 @@ def readCommand(argv):
         if 'numTraining' not in agentOpts:
             agentOpts['numTraining'] = options.numTraining
 
+    if (options.numWorkers < 1):
+        raise ValueError('The number of workers must be at least 1, got %d.'
+                % (options.numWorkers))
+
     # Don't display training games.
     if 'numTrain' in agentOpts:
         options.numQuiet = int(agentOpts['numTrain'])
@@ -480,12 +517,27 @@ def readCommand(argv):
 
     args['catchExceptions'] = options.catchExceptions
     args['gameToReplay'] = options.replay
-    args['ghosts'] = [BaseAgent.loadAgent(options.ghost, i + 1) for i in range(options.numGhosts)]
+    ghostOpts = parseAgentArgs(options.ghostArgs)
+    args['ghosts'] = [BaseAgent.loadAgent(options.ghost, i + 1, ghostOpts)
+            for i in range(options.numGhosts)]
     args['numGames'] = options.numGames
+    args['numWorkers'] = options.numWorkers
     args['pacman'] = BaseAgent.loadAgent(options.pacman, PACMAN_AGENT_INDEX, agentOpts)
     args['record'] = options.record
+    args['saveAgent'] = options.saveAgent
+    args['checkpointEvery'] = options.checkpointEvery
     args['timeout'] = options.timeout
 
+    if (options.checkpointEvery > 0 and options.saveAgent is None):
+        raise ValueError('Checkpoints need a path to be saved to (--save-agent).')
+
+    if (options.loadAgent is not None or options.saveAgent is not None):
+        checkpoint.checkAgent(args['pacman'])
+
+    if (options.loadAgent is not None):
+        checkpoint.loadAgent(args['pacman'], options.loadAgent)
+        logging.info('Loaded the pacman agent from %s.' % (options.loadAgent))
+
     return args
 
 def replayGame(layout, actions, display):
@@ -512,16 +564,33 @@ def replayGame(layout, actions, display):
     display.finish()
 
 def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraining = 0,
-        catchExceptions = False, timeout = 30, **kwargs):
+        catchExceptions = False, timeout = 30, numWorkers = 1, saveAgent = None,
+        checkpointEvery = 0, seed = None, **kwargs):
+    """
+    Play numGames games (the first numTraining of them are training games).
+
+    If a seed is given, then every agent gets its own random stream for every game,
+    derived from the seed and the game's number (see `pacai.util.seeding`).
+    So each game plays out the same way whether it is played here or in a worker process.
+    """
+
     rules = ClassicGameRules(timeout)
     games = []
 
+    # Training games can be played in parallel (by copies of a learning agent).
+    firstGame = 0
+    if (numTraining > 0 and numWorkers > 1 and isinstance(pacman, ReinforcementAgent)):
+        runParallelTraining(layout, pacman, ghosts, min(numTraining, numGames), numWorkers,
+                catchExceptions, timeout, saveAgent = saveAgent, checkpointEvery = checkpointEvery,
+                seed = seed)
+        firstGame = min(numTraining, numGames)
+
     nullView = None
-    if (numTraining > 0):
+    if (numTraining > firstGame):
         logging.info('Playing %d training games.' % numTraining)
         nullView = PacmanNullView()
 
-    for i in range(numGames):
+    for i in range(firstGame, numGames):
         isTraining = (i < numTraining)
 
         if (isTraining):
@@ -530,11 +599,16 @@ def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraini
         else:
             gameDisplay = display
 
+        if (seed is not None):
+            seedGame(seed, i, [pacman] + ghosts)
+
         game = rules.newGame(layout, pacman, ghosts, gameDisplay, catchExceptions)
         game.run()
 
         if (not isTraining):
             games.append(game)
+        elif (checkpointEvery > 0 and (i + 1) % checkpointEvery == 0):
+            _saveCheckpoint(pacman, saveAgent, i + 1)
 
         if (record):
             path = 'pacman.replay'
@@ -545,6 +619,10 @@ def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraini
             with open(path, 'wb') as file:
                 pickle.dump(components, file)
 
+    if (saveAgent is not None):
+        checkpoint.saveAgent(pacman, saveAgent)
+        logging.info('Saved the pacman agent to %s.' % (saveAgent))
+
     if ((numGames - numTraining) > 0):
         scores = [game.state.getScore() for game in games]
         wins = [game.state.isWin() for game in games]
@@ -556,6 +634,91 @@ def runGames(layout, pacman, ghosts, display, numGames, record = None, numTraini
 
     return games
 
+def runParallelTraining(layout, pacman, ghosts, numTraining, numWorkers,
+        catchExceptions = False, timeout = 30, gamesPerWorker = 5, saveAgent = None,
+        checkpointEvery = 0, seed = None):
+    """
+    Train a learning agent with several actors and a single learner.
+
+    Training happens in rounds.
+    Each round, a snapshot of the agent is sent to the worker processes,
+    and each worker plays up to gamesPerWorker training games with it
+    (recording its transitions instead of learning from them).
+    The agent (the learner) then learns from the recorded games, in the same order every time.
+    Since actors only see the agent's policy as of the start of the round,
+    more (or longer) rounds mean slightly staler policies, but less time spent syncing.
+    Each game gets the same random streams (see `pacai.util.seeding`)
+    no matter which worker plays it.
+    """
+
+    if (seed is None):
+        seed = random.getrandbits(32)
+
+    logging.info('Playing %d training games on %d workers.' % (numTraining, numWorkers))
+
+    initArgs = (layout, ghosts, catchExceptions, timeout)
+    with multiprocessing.Pool(numWorkers, _initTrainingWorker, initArgs) as pool:
+        numPlayed = 0
+        while (numPlayed < numTraining):
+            snapshot = pickle.dumps(pacman)
+
+            tasks = []
+            for i in range(numWorkers):
+                numGames = min(gamesPerWorker, numTraining - numPlayed)
+                if (numGames <= 0):
+                    break
+
+                tasks.append((snapshot, seed, numPlayed, numGames))
+                numPlayed += numGames
+
+            numLearned = numPlayed - sum(task[3] for task in tasks)
+            for episodes in pool.map(_playTrainingGames, tasks):
+                for transitions in episodes:
+                    pacman.replayEpisode(transitions)
+
+                    numLearned += 1
+                    if (checkpointEvery > 0 and numLearned % checkpointEvery == 0):
+                        _saveCheckpoint(pacman, saveAgent, numLearned)
+
+def _saveCheckpoint(pacman, path, numTrainingGames):
+    checkpoint.saveAgent(pacman, path)
+    logging.debug('Saved a checkpoint of the pacman agent after %d training games to %s.'
+            % (numTrainingGames, path))
+
+def _initTrainingWorker(layout, ghosts, catchExceptions, timeout):
+    _trainingWorker['layout'] = layout
+    _trainingWorker['ghosts'] = ghosts
+    _trainingWorker['catchExceptions'] = catchExceptions
+    _trainingWorker['rules'] = ClassicGameRules(timeout)
+    _trainingWorker['view'] = PacmanNullView()
+
+def _playTrainingGames(task):
+    """
+    Play training games (in a worker process) with a snapshot of the learning agent,
+    and return the transitions of each game.
+    """
+
+    snapshot, seed, firstGame, numGames = task
+
+    pacman = pickle.loads(snapshot)
+    rules = _trainingWorker['rules']
+
+    episodes = []
+    for i in range(numGames):
+        seedGame(seed, firstGame + i, [pacman] + _trainingWorker['ghosts'])
+        pacman.startRecording()
+
+        game = rules.newGame(_trainingWorker['layout'], pacman, _trainingWorker['ghosts'],
+                _trainingWorker['view'], _trainingWorker['catchExceptions'])
+        game.run()
+
+        episodes.append(pacman.stopRecording())
+
+    return episodes
+
+# The context for the training games of a worker process, set by _initTrainingWorker().
+_trainingWorker = {}
+
 def main(argv):
     """
     Entry point for a pacman game.
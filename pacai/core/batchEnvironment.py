@@ -0,0 +1,133 @@
+"""
+Run several copies of an environment at once, without any display.
+
+Running an episode the usual way (e.g. `pacai.bin.gridworld.runEpisode`)
+updates a display, pauses, and logs every single step.
+When all that is wanted is experience for an agent to learn from,
+a `BatchEnvironment` steps K independent environments in lockstep
+and hands the agent all K states (and then all K transitions) at once.
+"""
+
+from pacai.agents.learning.reinforcement import ReinforcementAgent
+
+class BatchEnvironment(object):
+    """
+    K independent environments (`pacai.core.environment.Environment`) that are stepped together.
+    Each environment runs its own episodes, and is reset as soon as one of its episodes ends.
+    """
+
+    def __init__(self, environments):
+        self.environments = list(environments)
+        if (len(self.environments) == 0):
+            raise ValueError('A batch needs at least one environment.')
+
+    def __len__(self):
+        return len(self.environments)
+
+    def getCurrentStates(self):
+        return [environment.getCurrentState() for environment in self.environments]
+
+    def reset(self):
+        for environment in self.environments:
+            environment.reset()
+
+    def run(self, agent, numSteps = None, numEpisodes = None, discount = 1.0, callback = None):
+        """
+        Have the agent act in every environment until either numSteps steps have been done
+        (where each step moves every environment once)
+        or numEpisodes episodes have finished (no more than that many are ever started).
+        At least one of the limits must be given.
+
+        A `pacai.agents.learning.reinforcement.ReinforcementAgent` gets all of its states
+        at once (`ReinforcementAgent.getActions`), learns from all of the resulting transitions
+        at once (`ReinforcementAgent.observeTransitions`),
+        and has each finished episode counted (`ReinforcementAgent.countEpisode`).
+        Any other agent just has its getAction called for each state.
+
+        If given, callback is called with (number of finished episodes, that episode's return)
+        each time an episode finishes.
+        Returns the (discounted) return of every finished episode, in the order they finished.
+        """
+
+        if (numSteps is None and numEpisodes is None):
+            raise ValueError('A batch run needs a number of steps or episodes.')
+
+        isLearner = isinstance(agent, ReinforcementAgent)
+
+        numEnvironments = len(self.environments)
+        environments = self.environments
+
+        # The discounted return (and the current discount) of each environment's episode.
+        returns = [0.0] * numEnvironments
+        discounts = [1.0] * numEnvironments
+
+        # The environments that are still running an episode.
+        active = list(range(numEnvironments))
+        numStarted = numEnvironments
+
+        if (numEpisodes is not None):
+            active = active[:numEpisodes]
+            numStarted = len(active)
+
+        self.reset()
+
+        finishedReturns = []
+        numStepsDone = 0
+
+        while (len(active) > 0 and (numSteps is None or numStepsDone < numSteps)):
+            states = [environments[i].getCurrentState() for i in active]
+
+            # Finish any episodes that are over, and start new ones in their place.
+            stillActive = []
+            anyFinished = False
+            for i, state in zip(active, states):
+                environment = environments[i]
+                if (len(environment.getPossibleActions(state)) > 0):
+                    stillActive.append(i)
+                    continue
+
+                anyFinished = True
+                finishedReturns.append(returns[i])
+                if (isLearner):
+                    agent.countEpisode(returns[i])
+
+                if (callback is not None):
+                    callback(len(finishedReturns), returns[i])
+
+                returns[i] = 0.0
+                discounts[i] = 1.0
+
+                if (numEpisodes is None or numStarted < numEpisodes):
+                    environment.reset()
+                    numStarted += 1
+                    stillActive.append(i)
+
+            if (anyFinished):
+                active = stillActive
+                states = [environments[i].getCurrentState() for i in active]
+
+            if (len(active) == 0):
+                break
+
+            if (isLearner):
+                actions = agent.getActions(states)
+            else:
+                actions = [agent.getAction(state) for state in states]
+
+            transitions = []
+            for i, state, action in zip(active, states, actions):
+                if (action is None):
+                    raise ValueError('Agent returned a None action.')
+
+                nextState, reward = environments[i].doAction(action)
+                transitions.append((state, action, nextState, reward))
+
+                returns[i] += reward * discounts[i]
+                discounts[i] *= discount
+
+            if (isLearner):
+                agent.observeTransitions(transitions)
+
+            numStepsDone += 1
+
+        return finishedReturns
@@ -0,0 +1,331 @@
+"""
+Markov decision processes compiled into NumPy arrays.
+
+Solving an MDP through the `pacai.core.mdp.MarkovDecisionProcess` methods
+means a Python call (and a new list) for every transition on every sweep.
+A `CompiledMDP` makes those calls once, and stores the whole MDP in flat (sparse) arrays
+indexed by state and (state, action) pair.
+A Bellman backup over every state is then just a few vectorized NumPy operations.
+"""
+
+import array
+import collections
+
+import numpy
+
+# How much better an action must be for policy iteration to switch to it.
+POLICY_TOLERANCE = 1e-10
+
+# The most sweeps used to finish evaluating the final policy of modified policy iteration.
+MAX_FINAL_EVALUATION_SWEEPS = 10000
+
+class CompiledMDP(object):
+    """
+    An MDP stored as arrays.
+
+    Every (state, action) pair gets an index.
+    The pairs of each state are contiguous, so the pairs of state i are:
+    `pairStarts[i]` up to (but not including) `pairStarts[i + 1]`.
+    Each transition is an entry of (pair, next state, probability, reward),
+    and every pair's expected immediate reward is precomputed.
+    """
+
+    def __init__(self, mdp):
+        self.mdp = mdp
+
+        self.states = list(mdp.getStates())
+        self.stateIndexes = {self.states[i]: i for i in range(len(self.states))}
+
+        # The action of each pair.
+        self.pairActions = []
+
+        # Build up flat arrays (rather than lists of Python numbers) to keep large MDPs small.
+        pairStates = array.array('q')
+        pairStarts = array.array('q')
+
+        entryPairs = array.array('q')
+        entryNextStates = array.array('q')
+        entryProbs = array.array('d')
+        entryRewards = array.array('d')
+
+        for stateIndex in range(len(self.states)):
+            state = self.states[stateIndex]
+            pairStarts.append(len(self.pairActions))
+
+            for action in mdp.getPossibleActions(state):
+                pairIndex = len(self.pairActions)
+                self.pairActions.append(action)
+                pairStates.append(stateIndex)
+
+                for nextState, prob in mdp.getTransitionStatesAndProbs(state, action):
+                    entryPairs.append(pairIndex)
+                    entryNextStates.append(self.stateIndexes[nextState])
+                    entryProbs.append(prob)
+                    entryRewards.append(mdp.getReward(state, action, nextState))
+
+        pairStarts.append(len(self.pairActions))
+
+        self.numStates = len(self.states)
+        self.numPairs = len(self.pairActions)
+
+        self.pairStates = numpy.array(pairStates, dtype = numpy.int64)
+        self.pairStarts = numpy.array(pairStarts, dtype = numpy.int64)
+
+        self.entryPairs = numpy.array(entryPairs, dtype = numpy.int64)
+        self.entryNextStates = numpy.array(entryNextStates, dtype = numpy.int64)
+        self.entryProbs = numpy.array(entryProbs, dtype = numpy.float64)
+        self.entryRewards = numpy.array(entryRewards, dtype = numpy.float64)
+
+        # The state that each transition starts from.
+        self.entryStates = self.pairStates[self.entryPairs]
+
+        # The expected immediate reward of each pair.
+        self.pairRewards = numpy.bincount(self.entryPairs,
+                weights = self.entryProbs * self.entryRewards, minlength = self.numPairs)
+
+        # The states that have at least one action (the rest always have a value of zero).
+        numActions = numpy.diff(self.pairStarts)
+        self.activeStates = numpy.nonzero(numActions > 0)[0]
+
+    def backup(self, values, discountRate):
+        """
+        Do a full (synchronous) Bellman backup.
+        Returns a tuple of: (new state values, Q-values of every pair under the old values).
+        """
+
+        qValues = self.getQValues(values, discountRate)
+
+        newValues = numpy.zeros(self.numStates)
+        if (len(self.activeStates) > 0):
+            starts = self.pairStarts[self.activeStates]
+            newValues[self.activeStates] = numpy.maximum.reduceat(qValues, starts)
+
+        return newValues, qValues
+
+    def getActions(self, stateIndex):
+        return self.pairActions[self.pairStarts[stateIndex]:self.pairStarts[stateIndex + 1]]
+
+    def getPairIndex(self, state, action):
+        """
+        Get the index of a (state, action) pair,
+        or None if the state is not in the MDP or the action is not possible.
+        """
+
+        stateIndex = self.stateIndexes.get(state)
+        if (stateIndex is None):
+            return None
+
+        for pairIndex in range(self.pairStarts[stateIndex], self.pairStarts[stateIndex + 1]):
+            if (self.pairActions[pairIndex] == action):
+                return pairIndex
+
+        return None
+
+    def getPolicy(self, qValues):
+        """
+        Get the best pair of every state (or -1 for states without any actions).
+        Ties go to the action that the MDP listed first.
+        """
+
+        policy = numpy.full(self.numStates, -1, dtype = numpy.int64)
+        if (len(self.activeStates) == 0):
+            return policy
+
+        starts = self.pairStarts[self.activeStates]
+
+        bestValues = numpy.zeros(self.numStates)
+        bestValues[self.activeStates] = numpy.maximum.reduceat(qValues, starts)
+
+        # The first best pair of each state is the smallest index among its best pairs.
+        isBest = (qValues == bestValues[self.pairStates])
+        candidates = numpy.where(isBest, numpy.arange(self.numPairs), self.numPairs)
+        policy[self.activeStates] = numpy.minimum.reduceat(candidates, starts)
+
+        return policy
+
+    def getQValues(self, values, discountRate):
+        """
+        Get the Q-value of every pair given the state values:
+        `Q(s, a) = R(s, a) + discount * sum_{s'} P(s' | s, a) * V(s')`.
+        """
+
+        expectedValues = numpy.bincount(self.entryPairs,
+                weights = self.entryProbs * values[self.entryNextStates], minlength = self.numPairs)
+
+        return self.pairRewards + discountRate * expectedValues
+
+def valueIteration(compiled, discountRate, iters, tolerance = None):
+    """
+    Run iters synchronous sweeps of value iteration (starting from all zeros).
+    If a tolerance is given, then stop early once no value changes by more than it.
+    Returns a tuple of: (state values, Q-values of every pair under those values, number of sweeps).
+    """
+
+    values = numpy.zeros(compiled.numStates)
+
+    numSweeps = 0
+    while (numSweeps < iters):
+        newValues, qValues = compiled.backup(values, discountRate)
+        numSweeps += 1
+
+        residual = 0.0
+        if (compiled.numStates > 0):
+            residual = float(numpy.max(numpy.abs(newValues - values)))
+
+        values = newValues
+        if (tolerance is not None and residual <= tolerance):
+            break
+
+    return values, compiled.getQValues(values, discountRate), numSweeps
+
+def evaluatePolicy(compiled, policy, discountRate, values = None, sweeps = None,
+        tolerance = None):
+    """
+    Get the value of every state when following a policy (the pair to take in each state).
+
+    If sweeps is None, then the values are found exactly
+    by solving the linear system: `(I - discount * P_policy) V = R_policy`.
+    This needs a dense (states x states) matrix, so it is only for small MDPs.
+    Otherwise, up to that many sweeps of iterative policy evaluation are done
+    (starting from the given values, or zeros),
+    stopping early if no value changes by more than the tolerance.
+    """
+
+    activeStates = compiled.activeStates
+    policyPairs = policy[activeStates]
+
+    # The expected reward of following the policy from each state.
+    rewards = numpy.zeros(compiled.numStates)
+    rewards[activeStates] = compiled.pairRewards[policyPairs]
+
+    # Just the transition entries of the pairs the policy takes.
+    chosen = (policy[compiled.entryStates] == compiled.entryPairs)
+    entryStates = compiled.entryStates[chosen]
+    entryNextStates = compiled.entryNextStates[chosen]
+    entryProbs = compiled.entryProbs[chosen]
+
+    if (sweeps is None):
+        matrix = numpy.identity(compiled.numStates)
+        numpy.add.at(matrix, (entryStates, entryNextStates), -discountRate * entryProbs)
+
+        # Without discounting, a policy that never reaches a terminal state makes the system
+        # singular (its values are unbounded, or any constant on a zero reward loop).
+        # Then the least squares solution is used instead.
+        if (discountRate < 1.0):
+            try:
+                return numpy.linalg.solve(matrix, rewards)
+            except numpy.linalg.LinAlgError:
+                pass
+
+        return numpy.linalg.lstsq(matrix, rewards, rcond = None)[0]
+
+    if (values is None):
+        values = numpy.zeros(compiled.numStates)
+
+    for i in range(sweeps):
+        expectedValues = numpy.bincount(entryStates,
+                weights = entryProbs * values[entryNextStates], minlength = compiled.numStates)
+        newValues = rewards + discountRate * expectedValues
+
+        residual = 0.0
+        if (compiled.numStates > 0):
+            residual = float(numpy.max(numpy.abs(newValues - values)))
+
+        values = newValues
+        if (tolerance is not None and residual <= tolerance):
+            break
+
+    return values
+
+def getTerminatingPolicy(compiled):
+    """
+    Get a policy that reaches a terminal state (a state without actions)
+    from every state that can reach one.
+    Each state takes an action that has a chance of moving it closer to a terminal state
+    (found with a breadth first search backwards from the terminal states).
+    States that cannot reach a terminal state just take their first action.
+    """
+
+    policy = numpy.full(compiled.numStates, -1, dtype = numpy.int64)
+    policy[compiled.activeStates] = compiled.pairStarts[compiled.activeStates]
+
+    # The transitions into each state, as: {next state: [pair, ...], ...}.
+    possible = compiled.entryProbs > 0.0
+    incoming = collections.defaultdict(list)
+    for pair, nextState in zip(compiled.entryPairs[possible].tolist(),
+            compiled.entryNextStates[possible].tolist()):
+        incoming[nextState].append(pair)
+
+    numActions = numpy.diff(compiled.pairStarts)
+    queue = collections.deque(numpy.nonzero(numActions == 0)[0].tolist())
+    visited = set(queue)
+
+    pairStates = compiled.pairStates.tolist()
+    while (len(queue) > 0):
+        state = queue.popleft()
+
+        for pair in incoming[state]:
+            previousState = pairStates[pair]
+            if (previousState in visited):
+                continue
+
+            visited.add(previousState)
+            policy[previousState] = pair
+            queue.append(previousState)
+
+    return policy
+
+def policyIteration(compiled, discountRate, iters, evaluationSweeps = None,
+        evaluationTolerance = None):
+    """
+    Alternate between evaluating a policy and improving it (acting greedily on its values),
+    until the policy stops changing or iters improvements have been done.
+
+    With evaluationSweeps as None, each policy is evaluated exactly (policy iteration).
+    Otherwise, each evaluation is just a few sweeps that start from the last policy's values
+    (modified policy iteration), see `evaluatePolicy`.
+    If an evaluationTolerance is given, then once the policy is stable,
+    its evaluation is continued until no value changes by more than that tolerance.
+    A policy only switches actions on a strict improvement, so ties can never cause cycling.
+    The initial policy takes the first action everywhere,
+    or without discounting (discountRate >= 1) is `getTerminatingPolicy`.
+
+    Returns a tuple of: (state values, the policy, number of improvements done).
+    """
+
+    if (discountRate < 1.0):
+        # Start by taking the first action everywhere.
+        policy = numpy.full(compiled.numStates, -1, dtype = numpy.int64)
+        policy[compiled.activeStates] = compiled.pairStarts[compiled.activeStates]
+    else:
+        # Without discounting, ties (e.g. every state being worth the same exit) keep the initial
+        # actions, so the initial policy should reach a terminal state.
+        policy = getTerminatingPolicy(compiled)
+
+    values = None
+    numIterations = 0
+
+    while (True):
+        values = evaluatePolicy(compiled, policy, discountRate, values, evaluationSweeps,
+                evaluationTolerance)
+
+        if (numIterations >= iters):
+            break
+
+        qValues = compiled.getQValues(values, discountRate)
+        greedy = compiled.getPolicy(qValues)
+
+        active = compiled.activeStates
+        improved = (qValues[greedy[active]] > qValues[policy[active]] + POLICY_TOLERANCE)
+        numIterations += 1
+
+        if (not numpy.any(improved)):
+            break
+
+        policy[active[improved]] = greedy[active[improved]]
+
+    if (evaluationSweeps is not None and evaluationTolerance is not None):
+        values = evaluatePolicy(compiled, policy, discountRate, values,
+                MAX_FINAL_EVALUATION_SWEEPS, evaluationTolerance)
+
+    return values, policy, numIterations
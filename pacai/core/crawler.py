@@ -0,0 +1,322 @@
+"""
+The physics of the crawler: a robot that learns to drag itself along the ground with its arm.
+
+Nothing here needs a display, so a crawler can be trained headless
+(see `pacai.bin.crawler` and `pacai.core.batchEnvironment`).
+The GUI (`pacai.ui.crawler.gui`) just draws the robot.
+"""
+
+import collections
+import math
+
+from pacai.core.environment import Environment
+
+# How many recent x positions a robot remembers (to show its velocity).
+NUM_POSITIONS = 100
+
+# The y position of the ground.
+DEFAULT_GROUND_Y = 160
+
+class CrawlingRobot(object):
+    """
+    A robot body with a two jointed arm (the arm and the hand) sticking out of its front.
+    When the tip of the hand is pushed into the ground, the body gets dragged along.
+    """
+
+    def __init__(self, groundY = DEFAULT_GROUND_Y):
+        # Arm and Hand Degrees
+        self.armAngle = self.oldArmDegree = 0.0
+        self.handAngle = self.oldHandDegree = -math.pi / 6
+
+        self.maxArmAngle = math.pi / 6
+        self.minArmAngle = -math.pi / 6
+
+        self.maxHandAngle = 0
+        self.minHandAngle = -(5.0 / 6.0) * math.pi
+
+        self.groundY = groundY
+
+        # Robot Body
+        self.robotWidth = 80
+        self.robotHeight = 40
+        self.robotPos = (20, self.groundY)
+
+        # Robot Arm and Hand
+        self.armLength = 60
+        self.handLength = 40
+
+        # Recent x positions.
+        self.positions = collections.deque([0, 0], maxlen = NUM_POSITIONS)
+
+        # {angle: (cos, sin), ...}
+        # The robot only ever moves between a few angles, so the trig is only done once for each.
+        self._trig = {}
+
+    def setAngles(self, armAngle, handAngle):
+        """
+        set the robot's arm and hand angles
+        to the passed in values
+        """
+
+        self.armAngle = armAngle
+        self.handAngle = handAngle
+
+    def getAngles(self):
+        """
+        returns the pair of (armAngle, handAngle)
+        """
+
+        return self.armAngle, self.handAngle
+
+    def getRobotPosition(self):
+        """
+        returns the (x, y) coordinates
+        of the lower-left point of the robot
+        """
+
+        return self.robotPos
+
+    def move(self, newArmAngle, newHandAngle, displacement):
+        """
+        Move the arm and hand to new angles,
+        which is already known to drag the robot by displacement
+        (e.g. from a table of precomputed moves).
+        """
+
+        self.robotPos = (self.robotPos[0] + displacement, self.robotPos[1])
+        self.armAngle = newArmAngle
+        self.handAngle = newHandAngle
+
+        # Position and Velocity Sign Post
+        self.positions.append(self.robotPos[0])
+
+    def moveArm(self, newArmAngle):
+        """
+        move the robot arm to 'newArmAngle'
+        """
+
+        if newArmAngle > self.maxArmAngle:
+            raise Exception('Crawling Robot: Arm Raised too high. Careful!')
+
+        if newArmAngle < self.minArmAngle:
+            raise Exception('Crawling Robot: Arm Raised too low. Careful!')
+
+        disp = self.displacement(self.armAngle, self.handAngle, newArmAngle, self.handAngle)
+        self.move(newArmAngle, self.handAngle, disp)
+
+    def moveHand(self, newHandAngle):
+        """
+        move the robot hand to 'newArmAngle'
+        """
+
+        if newHandAngle > self.maxHandAngle:
+            raise Exception('Crawling Robot: Hand Raised too high. Careful!')
+
+        if newHandAngle < self.minHandAngle:
+            raise Exception('Crawling Robot: Hand Raised too low. Careful!')
+
+        disp = self.displacement(self.armAngle, self.handAngle, self.armAngle, newHandAngle)
+        self.move(self.armAngle, newHandAngle, disp)
+
+    def getMinAndMaxArmAngles(self):
+        """
+        get the lower- and upper- bound
+        for the arm angles returns (min, max) pair
+        """
+
+        return self.minArmAngle, self.maxArmAngle
+
+    def getMinAndMaxHandAngles(self):
+        """
+        get the lower- and upper- bound
+        for the hand angles returns (min, max) pair
+        """
+
+        return self.minHandAngle, self.maxHandAngle
+
+    def getRotationAngle(self):
+        """
+        get the current angle the
+        robot body is rotated off the ground
+        """
+
+        armCos, armSin = self.getCosAndSin(self.armAngle)
+        handCos, handSin = self.getCosAndSin(self.handAngle)
+
+        x = self.armLength * armCos + self.handLength * handCos + self.robotWidth
+        y = self.armLength * armSin + self.handLength * handSin + self.robotHeight
+
+        if y < 0:
+            return math.atan(-y / x)
+        return 0.0
+
+    def getCosAndSin(self, angle):
+        trig = self._trig.get(angle)
+        if (trig is None):
+            trig = (math.cos(angle), math.sin(angle))
+            self._trig[angle] = trig
+
+        return trig
+
+    def displacement(self, oldArmDegree, oldHandDegree, armDegree, handDegree):
+        oldArmCos, oldArmSin = self.getCosAndSin(oldArmDegree)
+        armCos, armSin = self.getCosAndSin(armDegree)
+        oldHandCos, oldHandSin = self.getCosAndSin(oldHandDegree)
+        handCos, handSin = self.getCosAndSin(handDegree)
+
+        xOld = self.armLength * oldArmCos + self.handLength * oldHandCos + self.robotWidth
+        yOld = self.armLength * oldArmSin + self.handLength * oldHandSin + self.robotHeight
+
+        x = self.armLength * armCos + self.handLength * handCos + self.robotWidth
+        y = self.armLength * armSin + self.handLength * handSin + self.robotHeight
+
+        if y < 0:
+            if yOld <= 0:
+                return math.sqrt(xOld * xOld + yOld * yOld) - math.sqrt(x * x + y * y)
+            return (xOld - yOld * (x - xOld) / (y - yOld)) - math.sqrt(x * x + y * y)
+        else:
+            if yOld >= 0:
+                return 0.0
+            return -(x - y * (xOld - x) / (yOld - y)) + math.sqrt(xOld * xOld + yOld * yOld)
+
+        raise Exception('Never Should See This!')
+
+class CrawlingRobotEnvironment(Environment):
+    """
+    The crawler as an environment for a learning agent.
+
+    The arm and hand angles are each split into buckets,
+    and the state is the pair of bucket numbers: (arm bucket, hand bucket).
+    The reward for an action is how far it moved the robot forward.
+
+    There are only a few hundred (state, action) pairs,
+    so the next state and displacement of each one is worked out up front,
+    and taking an action is then just a table lookup.
+    """
+
+    def __init__(self, crawlingRobot = None):
+        if (crawlingRobot is None):
+            crawlingRobot = CrawlingRobot()
+
+        self.crawlingRobot = crawlingRobot
+
+        # The state is of the form (armAngle, handAngle)
+        # where the angles are bucket numbers, not actual
+        # degree measurements
+        self.state = None
+
+        self.nArmStates = 9
+        self.nHandStates = 13
+
+        # create a list of arm buckets and hand buckets to
+        # discretize the state space
+        minArmAngle, maxArmAngle = self.crawlingRobot.getMinAndMaxArmAngles()
+        minHandAngle, maxHandAngle = self.crawlingRobot.getMinAndMaxHandAngles()
+        armIncrement = (maxArmAngle - minArmAngle) / (self.nArmStates - 1)
+        handIncrement = (maxHandAngle - minHandAngle) / (self.nHandStates - 1)
+        self.armBuckets = [minArmAngle + (armIncrement * i) for i in range(self.nArmStates)]
+        self.handBuckets = [minHandAngle + (handIncrement * i) for i in range(self.nHandStates)]
+
+        # {state: [action, ...], ...}
+        self._actions = {}
+
+        # {(state, action): (nextState, displacement), ...}
+        self._moves = {}
+
+        self._buildMoves()
+
+        # Reset
+        self.reset()
+
+    def getCurrentState(self):
+        """
+        Return the current state of the crawling robot.
+        """
+
+        return self.state
+
+    def getPossibleActions(self, state):
+        """
+        Returns possible actions for the states in the current state.
+        The list is shared, so callers should not modify it.
+        """
+
+        return self._actions[state]
+
+    def doAction(self, action):
+        """
+        Perform the action and update
+        the current state of the Environment
+        and return the reward for the
+        current state, the next state
+        and the taken action.
+
+        Returns:
+            nextState, reward
+        """
+
+        move = self._moves.get((self.state, action))
+        if (move is None):
+            raise ValueError('Illegal crawler action "%s" in state %s.' % (action, self.state))
+
+        nextState, displacement = move
+        armBucket, handBucket = nextState
+
+        oldX = self.crawlingRobot.robotPos[0]
+        self.crawlingRobot.move(self.armBuckets[armBucket], self.handBuckets[handBucket],
+                displacement)
+
+        # a simple reward function
+        reward = self.crawlingRobot.robotPos[0] - oldX
+
+        self.state = nextState
+        return nextState, reward
+
+    def reset(self):
+        """
+        Resets the Environment to the initial state
+        """
+
+        # Initialize the state to be the middle
+        # value for each parameter e.g. if there are 13 and 19
+        # buckets for the arm and hand parameters, then the intial
+        # state should be (6, 9)
+
+        # Also call self.crawlingRobot.setAngles()
+        # to the initial arm and hand angle
+
+        armState = int(self.nArmStates / 2)
+        handState = int(self.nHandStates / 2)
+
+        self.state = armState, handState
+        self.crawlingRobot.setAngles(self.armBuckets[armState], self.handBuckets[handState])
+        self.crawlingRobot.positions.clear()
+        self.crawlingRobot.positions.extend([20, self.crawlingRobot.getRobotPosition()[0]])
+
+    def _buildMoves(self):
+        robot = self.crawlingRobot
+
+        for armBucket in range(self.nArmStates):
+            for handBucket in range(self.nHandStates):
+                state = (armBucket, handBucket)
+
+                nextStates = []
+                if armBucket > 0:
+                    nextStates.append(('arm-down', (armBucket - 1, handBucket)))
+
+                if armBucket < self.nArmStates - 1:
+                    nextStates.append(('arm-up', (armBucket + 1, handBucket)))
+
+                if handBucket > 0:
+                    nextStates.append(('hand-down', (armBucket, handBucket - 1)))
+
+                if handBucket < self.nHandStates - 1:
+                    nextStates.append(('hand-up', (armBucket, handBucket + 1)))
+
+                self._actions[state] = [action for action, nextState in nextStates]
+
+                for action, nextState in nextStates:
+                    displacement = robot.displacement(
+                            self.armBuckets[armBucket], self.handBuckets[handBucket],
+                            self.armBuckets[nextState[0]], self.handBuckets[nextState[1]])
+                    self._moves[(state, action)] = (nextState, displacement)
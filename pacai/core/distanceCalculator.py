@@ -1,7 +1,6 @@
 import sys
 
 from pacai.core.distance import manhattan
-from pacai.util import priorityQueue
 
 DEFAULT_DISTANCE = 10000
 
@@ -94,57 +93,20 @@ class DistanceCalculator:
 
 def computeDistances(layout):
     """
-    Runs UCS to all other positions from each position.
+    Computes the distances between all pairs of positions.
+    Each source is searched over the layout's `pacai.core.mazeGraph.MazeGraph`,
+    so only the junctions of the maze are expanded.
     """
 
     distances = {}
+    graph = layout.getMazeGraph()
     allNodes = layout.walls.asList(False)
 
     for source in allNodes:
-        dist = {}
-        closed = {}
-
-        for node in allNodes:
-            dist[node] = sys.maxsize
-
-        queue = priorityQueue.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
-
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
-
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
-            x, y = node
-
-            if not layout.isWall((x, y + 1)):
-                adjacent.append((x, y + 1))
-
-            if not layout.isWall((x, y - 1)):
-                adjacent.append((x, y - 1))
-
-            if not layout.isWall((x + 1, y)):
-                adjacent.append((x + 1, y))
-
-            if not layout.isWall((x - 1, y)):
-                adjacent.append((x - 1, y))
-
-            for other in adjacent:
-                if other not in dist:
-                    continue
-
-                oldDist = dist[other]
-                newDist = nodeDist + 1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
+        sourceDistances = graph.distancesFrom(source)
 
         for target in allNodes:
-            distances[(target, source)] = dist[target]
+            distances[(target, source)] = sourceDistances.get(target, sys.maxsize)
 
     return distances
 
@@ -5,8 +5,8 @@ Feature extractors for game states.
 import abc
 
 from pacai.core.actions import Actions
-from pacai.core.search import search
-from pacai.student.searchAgents import AnyFoodSearchProblem
+from pacai.core.nearestFood import NearestFoodMap
+from pacai.util.lruCache import LRUCache
 
 class FeatureExtractor(abc.ABC):
     """
@@ -24,6 +24,35 @@ class FeatureExtractor(abc.ABC):
 
         pass
 
+    def getFeatureNames(self):
+        """
+        Get the names of every feature this extractor can produce (in a fixed order),
+        or None if the features are not known ahead of time (e.g. `IdentityExtractor`).
+        Only extractors that return names can be used with dense feature vectors
+        (see `FeatureExtractor.getFeatureMatrix`).
+        """
+
+        return None
+
+    def getFeatureMatrix(self, state, actions):
+        """
+        Get the features of taking each of the actions in the state as a NumPy matrix.
+        Each row is an action, and each column is a feature (in the order of getFeatureNames).
+        """
+
+        # NumPy is only needed for dense features, so only import it when they are used.
+        import numpy
+
+        names = self.getFeatureNames()
+        index = {names[i]: i for i in range(len(names))}
+
+        matrix = numpy.zeros((len(actions), len(names)))
+        for row in range(len(actions)):
+            for feature, value in self.getFeatures(state, actions[row]).items():
+                matrix[row, index[feature]] = value
+
+        return matrix
+
 class IdentityExtractor(FeatureExtractor):
     def getFeatures(self, state, action):
         feats = {}
@@ -34,19 +63,66 @@ class IdentityExtractor(FeatureExtractor):
 class SimpleExtractor(FeatureExtractor):
     """
     Returns simple features for a basic reflex Pacman.
+
+    The distance to the closest food comes from a `pacai.core.nearestFood.NearestFoodMap`.
+    A few of these maps are cached (keyed by the food bitmask),
+    and since food only ever gets eaten, a cached map can be updated in place
+    instead of running a new search.
+    The computed features are also kept in an LRU cache.
     """
 
+    FEATURE_NAMES = ['bias', '#-of-ghosts-1-step-away', 'eats-food', 'closest-food']
+
+    def __init__(self, cacheSize = 10000, numFoodMaps = 4):
+        self._walls = None
+
+        # {(pacman position, action, ghost positions, food bitmask): features, ...}
+        self._features = LRUCache(cacheSize)
+
+        # {food bitmask: NearestFoodMap, ...}
+        self._foodMaps = LRUCache(numFoodMaps)
+
     def getFeatures(self, state, action):
-        # Extract the grid of food and wall locations and get the ghost locations.
-        food = state.getFood()
         walls = state.getWalls()
-        ghosts = state.getGhostPositions()
+        if (walls is not self._walls):
+            # A new layout, nothing that was cached is valid anymore.
+            self._walls = walls
+            self._features.clear()
+            self._foodMaps.clear()
+
+        position = state.getPacmanPosition()
+        ghosts = tuple(state.getGhostPositions())
+        foodMask = state.getFoodMask()
+
+        key = (position, action, ghosts, foodMask)
+        features = self._features.get(key)
+
+        if (features is None):
+            features = self._computeFeatures(state, action, position, ghosts, foodMask)
+            self._features.put(key, features)
+
+        return dict(features)
+
+    def getFeatureNames(self):
+        return SimpleExtractor.FEATURE_NAMES
+
+    def __getstate__(self):
+        # The caches can always be rebuilt, so leave them out of copies (e.g. agent snapshots).
+        state = self.__dict__.copy()
+        state['_walls'] = None
+        state['_features'] = LRUCache(self._features.capacity)
+        state['_foodMaps'] = LRUCache(self._foodMaps.capacity)
+
+        return state
+
+    def _computeFeatures(self, state, action, position, ghosts, foodMask):
+        walls = self._walls
 
         features = {}
         features["bias"] = 1.0
 
         # Compute the location of pacman after he takes the action.
-        x, y = state.getPacmanPosition()
+        x, y = position
         dx, dy = Actions.directionToVector(action)
         next_x, next_y = int(x + dx), int(y + dy)
 
@@ -55,11 +131,10 @@ class SimpleExtractor(FeatureExtractor):
                 Actions.getLegalNeighbors(g, walls) for g in ghosts)
 
         # If there is no danger of ghosts then add the food feature.
-        if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
+        if not features["#-of-ghosts-1-step-away"] and state.hasFood(next_x, next_y):
             features["eats-food"] = 1.0
 
-        prob = AnyFoodSearchProblem(state, start = (next_x, next_y))
-        dist = len(search.bfs(prob))
+        dist = self._getFoodMap(state, foodMask).getDistance((next_x, next_y))
         if dist is not None:
             # Make the distance a number less than one otherwise the update will diverge wildly.
             features["closest-food"] = float(dist) / (walls.getWidth() * walls.getHeight())
@@ -68,3 +143,30 @@ class SimpleExtractor(FeatureExtractor):
             features[key] /= 10.0
 
         return features
+
+    def _getFoodMap(self, state, foodMask):
+        foodMap = self._foodMaps.get(foodMask)
+        if (foodMap is not None):
+            return foodMap
+
+        # Update the least recently used map that still has all of this food.
+        for key in self._foodMaps.keys():
+            if ((foodMask & ~key) != 0):
+                continue
+
+            foodMap = self._foodMaps.pop(key)
+            height = self._walls.getHeight()
+
+            eaten = key & ~foodMask
+            while (eaten != 0):
+                bit = eaten & -eaten
+                foodMap.removeFood(divmod(bit.bit_length() - 1, height))
+                eaten ^= bit
+
+            break
+
+        if (foodMap is None):
+            foodMap = NearestFoodMap(self._walls, state.getFood())
+
+        self._foodMaps.put(foodMask, foodMap)
+        return foodMap
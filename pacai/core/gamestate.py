@@ -4,6 +4,7 @@ import copy
 from pacai.core.agentstate import AgentState
 from pacai.core.directions import Directions
 from pacai.util import util
+from pacai.util import zobrist
 
 class AbstractGameState(abc.ABC):
     """
@@ -26,6 +27,9 @@ class AbstractGameState(abc.ABC):
         # Any children should be sure to clear the hash when modifications are made.
         self._hash = None
 
+        # Same with the fingerprint (see getFingerprint()).
+        self._fingerprint = None
+
         # For food and capsules, we will only copy on write (if we eat one of them).
         # This avoid additional copies on successors that don't eat.
 
@@ -33,6 +37,15 @@ class AbstractGameState(abc.ABC):
         self._food = layout.food.copy()
         self._lastFoodEaten = None
 
+        # Keep a running count (and bitmask) of the food, so they do not need to be recomputed.
+        self._numFood = self._food.count()
+        self._foodMask = self._food.asBitmask()
+
+        # The Zobrist key of just the food (XORed out as food is eaten).
+        self._foodKey = 0
+        for (x, y) in self._food.asList():
+            self._foodKey ^= zobrist.getKey('food', x, y)
+
         self._capsulesCopied = False
         self._capsules = layout.capsules.copy()
         self._lastCapsuleEaten = None
@@ -66,6 +79,7 @@ class AbstractGameState(abc.ABC):
 
     def addScore(self, score):
         self._hash = None
+        self._fingerprint = None
         self._score += score
 
     def eatCapsule(self, x, y):
@@ -84,6 +98,7 @@ class AbstractGameState(abc.ABC):
         self._lastCapsuleEaten = (x, y)
 
         self._hash = None
+        self._fingerprint = None
         return True
 
     def eatFood(self, x, y):
@@ -100,8 +115,12 @@ class AbstractGameState(abc.ABC):
 
         self._food[x][y] = False
         self._lastFoodEaten = (x, y)
+        self._numFood -= 1
+        self._foodMask &= ~(1 << (x * self._food.getHeight() + y))
+        self._foodKey ^= zobrist.getKey('food', x, y)
 
         self._hash = None
+        self._fingerprint = None
         return True
 
     def endGame(self, win):
@@ -109,6 +128,7 @@ class AbstractGameState(abc.ABC):
         self._win = win
 
         self._hash = None
+        self._fingerprint = None
 
     def getAgentPosition(self, index):
         """
@@ -137,6 +157,36 @@ class AbstractGameState(abc.ABC):
 
         return self._capsules
 
+    def getFingerprint(self):
+        """
+        Get a 64-bit Zobrist fingerprint of this state.
+
+        Unlike the hash, the fingerprint is the same in every process,
+        and it is cheap enough to compute that it can be used as a compact stand-in for the state
+        (e.g. as the key of a Q-table, so the table does not need to keep whole states alive).
+        The fingerprint covers everything that equality does except for the layout,
+        so it should only be compared between states of the same layout.
+        Different states may (very rarely) share a fingerprint.
+        """
+
+        if (self._fingerprint is None):
+            fingerprint = self._foodKey
+            fingerprint ^= zobrist.getKey('score', self._score)
+            fingerprint ^= zobrist.getKey('over', self._gameover, self._win)
+
+            for (x, y) in self._capsules:
+                fingerprint ^= zobrist.getKey('capsule', x, y)
+
+            for index in range(len(self._agentStates)):
+                agentState = self._agentStates[index]
+                fingerprint ^= zobrist.getKey('agent', index, agentState.getPosition(),
+                        agentState.getDirection(), agentState.isPacman(),
+                        agentState.getScaredTimer())
+
+            self._fingerprint = fingerprint
+
+        return self._fingerprint
+
     def getFood(self):
         """
         Returns a Grid of boolean food indicator variables.
@@ -149,6 +199,15 @@ class AbstractGameState(abc.ABC):
 
         return self._food.copy()
 
+    def getFoodMask(self):
+        """
+        Get the remaining food as a single int (see `pacai.core.grid.Grid.asBitmask`).
+        This does not copy (or walk) the food grid,
+        so it makes a cheap key for anything that only depends on the food.
+        """
+
+        return self._foodMask
+
     def getHighlightLocations(self):
         return self._highlightLocations
 
@@ -186,9 +245,10 @@ class AbstractGameState(abc.ABC):
     def getNumFood(self):
         """
         Get the amount of food left on the board.
+        This does not copy (or walk) the food grid.
         """
 
-        return self._food.count()
+        return self._numFood
 
     def getScore(self):
         return self._score
@@ -241,6 +301,7 @@ class AbstractGameState(abc.ABC):
     def setScore(self, score):
         self._score = score
         self._hash = None
+        self._fingerprint = None
 
     def _initSuccessor(self):
         """
@@ -251,6 +312,7 @@ class AbstractGameState(abc.ABC):
         # Start with a shallow copy.
         successor = copy.copy(self)
         successor._hash = None
+        successor._fingerprint = None
 
         # Leave food and capsules as a shallow copy, but mark them to be copied on write.
         successor._foodCopied = False
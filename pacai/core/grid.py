@@ -13,6 +13,23 @@ class Grid:
         self._height = height
         self._data = [[initialValue for y in range(height)] for x in range(width)]
 
+    def asBitmask(self):
+        """
+        Get the grid as a single int,
+        where the bit at (x * height + y) is set if grid[x][y] is true.
+        """
+
+        bitmask = 0
+        base = 1
+
+        for row in self._data:
+            for value in row:
+                if (value):
+                    bitmask += base
+                base *= 2
+
+        return bitmask
+
     def asList(self, key = True):
         values = []
 
@@ -61,16 +78,7 @@ class Grid:
         return self._data[i]
 
     def __hash__(self):
-        hashcode = 0
-        base = 1
-
-        for row in self._data:
-            for value in row:
-                if (value):
-                    hashcode += base
-                base *= 2
-
-        return hash(hashcode)
+        return hash(self.asBitmask())
 
     def __lt__(self, other):
         return self.__hash__() < other.__hash__()
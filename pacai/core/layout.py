@@ -3,6 +3,8 @@ import random
 
 from pacai.core.distance import manhattan
 from pacai.core.grid import Grid
+from pacai.core.mazeGraph import MazeGraph
+from pacai.core.mazeTopology import MazeTopology
 
 # By default, the layout directory is adjacent to this file.
 DEFAULT_LAYOUT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'layouts')
@@ -24,8 +26,35 @@ class Layout(object):
         self.numGhosts = 0
         self.layoutText = layoutText
 
+        # Derived structures that are expensive to build are only built on demand.
+        self._mazeGraph = None
+        self._mazeTopology = None
+
         self.processLayoutText(layoutText, maxGhosts)
 
+    def getMazeGraph(self):
+        """
+        Get the `pacai.core.mazeGraph.MazeGraph` for this layout's walls.
+        The graph is built the first time it is requested and cached afterwards.
+        """
+
+        if (self._mazeGraph is None):
+            self._mazeGraph = MazeGraph(self.walls)
+
+        return self._mazeGraph
+
+    def getMazeTopology(self):
+        """
+        Get the `pacai.core.mazeTopology.MazeTopology` (articulation points and dead-end pockets)
+        for this layout.
+        The topology is built the first time it is requested and cached afterwards.
+        """
+
+        if (self._mazeTopology is None):
+            self._mazeTopology = MazeTopology(self.walls, self.food)
+
+        return self._mazeTopology
+
     def getNumGhosts(self):
         return self.numGhosts
 
@@ -0,0 +1,223 @@
+"""
+A contracted graph view of a maze.
+
+Most open cells in a pacman maze have exactly two open neighbors,
+i.e. they sit in the middle of a corridor.
+A `MazeGraph` only keeps the other cells (junctions and dead ends) as nodes,
+and represents each corridor between them as a single weighted edge.
+Searches and distance computations over this graph touch far fewer nodes than
+a search over every open cell.
+"""
+
+import heapq
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+
+class MazeGraph(object):
+    """
+    A graph of junction nodes connected by corridor edges.
+
+    Nodes are positions (x, y) of open cells that do not have exactly two open neighbors
+    (plus one arbitrary cell for any loop that has no junctions).
+    Edges are tuples of: (start node, end node, corridor cells, length).
+    The corridor cells are the open cells strictly between the two nodes,
+    ordered from the start node to the end node.
+    The length of an edge is the number of moves it takes to go from its start to its end,
+    i.e. one more than the number of corridor cells.
+
+    Typically, you will get a graph from `pacai.core.layout.Layout.getMazeGraph`
+    instead of building one yourself.
+    """
+
+    def __init__(self, walls):
+        self._walls = walls
+
+        self._nodes = []
+        self._edges = []
+
+        # {node: [(edge index, neighbor node, length), ...], ...}
+        self._adjacency = {}
+
+        # {corridor cell: (edge index, offset from the edge's start node), ...}
+        self._corridorCells = {}
+
+        self._build()
+
+    def getCorridor(self, position):
+        """
+        Get the corridor edge that contains the given position.
+        Returns a tuple of (edge index, offset from the edge's start node),
+        or None if the position is a node (or a wall).
+        """
+
+        return self._corridorCells.get(position)
+
+    def getDistance(self, position1, position2):
+        """
+        Get the maze distance between two open positions.
+        Returns None if there is no path between them.
+        """
+
+        return self.distancesFrom(position1).get(position2)
+
+    def getEdges(self):
+        return self._edges
+
+    def getNeighbors(self, node):
+        """
+        Get the nodes reachable from the given node by following a single corridor.
+        Returns a list of (edge index, neighbor node, length).
+        """
+
+        return self._adjacency[node]
+
+    def getNodes(self):
+        return self._nodes
+
+    def isNode(self, position):
+        return position in self._adjacency
+
+    def distancesFrom(self, source):
+        """
+        Get the maze distance from the source position to every open position reachable from it.
+        Returns a dict of {position: distance}.
+
+        Only the nodes are searched (using Dijkstra's algorithm),
+        the distances to corridor cells are filled in afterwards from the distances
+        to the nodes at either end of their corridor.
+        """
+
+        nodeDistances = {}
+        fringe = []
+
+        sourceCorridor = self.getCorridor(source)
+        if (sourceCorridor is None):
+            heapq.heappush(fringe, (0, source))
+        else:
+            edgeIndex, offset = sourceCorridor
+            start, end, cells, length = self._edges[edgeIndex]
+            heapq.heappush(fringe, (offset, start))
+            heapq.heappush(fringe, (length - offset, end))
+
+        while (len(fringe) > 0):
+            distance, node = heapq.heappop(fringe)
+            if (node in nodeDistances):
+                continue
+            nodeDistances[node] = distance
+
+            for edgeIndex, neighbor, length in self._adjacency[node]:
+                if (neighbor not in nodeDistances):
+                    heapq.heappush(fringe, (distance + length, neighbor))
+
+        distances = dict(nodeDistances)
+
+        for edgeIndex, (start, end, cells, length) in enumerate(self._edges):
+            if (start not in nodeDistances):
+                # This corridor is not connected to the source.
+                continue
+
+            startDistance = nodeDistances[start]
+            endDistance = nodeDistances[end]
+
+            for i in range(len(cells)):
+                offset = i + 1
+                distances[cells[i]] = min(startDistance + offset, endDistance + length - offset)
+
+            # Cells in the same corridor as the source may be closer without going to a node.
+            if (sourceCorridor is not None and sourceCorridor[0] == edgeIndex):
+                sourceOffset = sourceCorridor[1]
+                for i in range(len(cells)):
+                    distances[cells[i]] = min(distances[cells[i]], abs(i + 1 - sourceOffset))
+
+        return distances
+
+    def _build(self):
+        openCells = []
+        for x in range(self._walls.getWidth()):
+            for y in range(self._walls.getHeight()):
+                if (not self._walls[x][y]):
+                    openCells.append((x, y))
+
+        neighbors = {cell: getOpenNeighbors(cell, self._walls) for cell in openCells}
+
+        for cell in openCells:
+            if (len(neighbors[cell]) != 2):
+                self._addNode(cell)
+
+        # Remember which (node, first step) pairs we have already walked,
+        # so each corridor is only added once (and not once from each end).
+        walked = set()
+
+        for node in list(self._nodes):
+            self._walkCorridors(node, neighbors, walked)
+
+        # Any cell that is still unaccounted for is on a loop without any junctions.
+        for cell in openCells:
+            if (cell in self._adjacency or cell in self._corridorCells):
+                continue
+
+            self._addNode(cell)
+            self._walkCorridors(cell, neighbors, walked)
+
+    def _addNode(self, cell):
+        self._nodes.append(cell)
+        self._adjacency[cell] = []
+
+    def _walkCorridors(self, node, neighbors, walked):
+        for firstStep in neighbors[node]:
+            if ((node, firstStep) in walked):
+                continue
+
+            previous = node
+            current = firstStep
+            cells = []
+
+            while (current not in self._adjacency):
+                cells.append(current)
+
+                nextCell = neighbors[current][0]
+                if (nextCell == previous):
+                    nextCell = neighbors[current][1]
+
+                previous = current
+                current = nextCell
+
+            walked.add((node, firstStep))
+            walked.add((current, previous))
+
+            edgeIndex = len(self._edges)
+            length = len(cells) + 1
+            self._edges.append((node, current, tuple(cells), length))
+
+            for i in range(len(cells)):
+                self._corridorCells[cells[i]] = (edgeIndex, i + 1)
+
+            self._adjacency[node].append((edgeIndex, current, length))
+            if (current != node):
+                self._adjacency[current].append((edgeIndex, node, length))
+
+def getOpenNeighbors(position, walls):
+    """
+    Get the open positions that are one cardinal move away from the given position.
+    Unlike `pacai.core.actions.Actions.getLegalNeighbors`,
+    the position itself (i.e. stopping) is not included.
+    """
+
+    x, y = position
+    neighbors = []
+
+    for action in Directions.CARDINAL:
+        dx, dy = Actions.directionToVector(action)
+        nextX, nextY = int(x + dx), int(y + dy)
+
+        if (nextX < 0 or nextX >= walls.getWidth()):
+            continue
+
+        if (nextY < 0 or nextY >= walls.getHeight()):
+            continue
+
+        if (not walls[nextX][nextY]):
+            neighbors.append((nextX, nextY))
+
+    return neighbors
@@ -0,0 +1,218 @@
+"""
+Structural analysis of a maze: articulation points and dead-end pockets.
+
+All of the analysis here is done once per layout in time linear to the number of open cells,
+so it can be freely shared between all of the agents (on all of the teams) playing on a layout.
+"""
+
+from pacai.core.mazeGraph import getOpenNeighbors
+
+class MazeTopology(object):
+    """
+    An index of the choke points of a maze.
+
+    An articulation point is an open cell that,
+    if it were a wall, would split the maze into more pieces.
+
+    A pocket is a dead-end region of the maze:
+    a set of open cells that can only be entered (and left) through a single entrance cell.
+    Pockets are found by repeatedly removing open cells that only have a single open neighbor.
+    A pocket may be a simple dead-end corridor, or a tree of branching dead ends.
+    Each pocket is represented as a tuple of: (entrance, cells, depth).
+    Where the entrance is the cell just outside the pocket (and is not part of the pocket),
+    the cells are the positions inside the pocket,
+    and the depth is the maximum number of moves needed to reach a cell in the pocket
+    from the entrance.
+
+    Typically, you will get a topology from `pacai.core.layout.Layout.getMazeTopology`
+    instead of building one yourself.
+    """
+
+    def __init__(self, walls, food = None):
+        self._walls = walls
+
+        self._articulationPoints = set()
+
+        self._pockets = []
+
+        # {position: (pocket index, depth inside the pocket), ...}
+        self._pocketCells = {}
+
+        self._pocketFoodCounts = []
+
+        openCells = []
+        for x in range(self._walls.getWidth()):
+            for y in range(self._walls.getHeight()):
+                if (not self._walls[x][y]):
+                    openCells.append((x, y))
+
+        neighbors = {cell: getOpenNeighbors(cell, self._walls) for cell in openCells}
+
+        self._findArticulationPoints(openCells, neighbors)
+        self._findPockets(openCells, neighbors)
+
+        if (food is not None):
+            self._pocketFoodCounts = self.countPocketFood(food)
+
+    def countPocketFood(self, food):
+        """
+        Count the food in each pocket.
+        The food is a `pacai.core.grid.Grid` (or anything else indexed by food[x][y]).
+        Returns a list with a count for each pocket (in the same order as `getPockets`).
+        """
+
+        counts = []
+        for entrance, cells, depth in self._pockets:
+            counts.append(sum(1 for (x, y) in cells if food[x][y]))
+
+        return counts
+
+    def getArticulationPoints(self):
+        return self._articulationPoints
+
+    def getPocket(self, position):
+        """
+        Get the index of the pocket that contains the given position,
+        or None if the position is not in a pocket.
+        """
+
+        info = self._pocketCells.get(position)
+        if (info is None):
+            return None
+
+        return info[0]
+
+    def getPocketDepth(self, position):
+        """
+        Get the number of moves it takes to reach the given position from its pocket's entrance,
+        or 0 if the position is not in a pocket.
+        """
+
+        info = self._pocketCells.get(position)
+        if (info is None):
+            return 0
+
+        return info[1]
+
+    def getPocketFoodCounts(self):
+        """
+        Get the food in each pocket at the time this topology was built
+        (typically the layout's initial food).
+        """
+
+        return self._pocketFoodCounts
+
+    def getPockets(self):
+        return self._pockets
+
+    def isArticulationPoint(self, position):
+        return position in self._articulationPoints
+
+    def isInPocket(self, position):
+        return position in self._pocketCells
+
+    def _findArticulationPoints(self, openCells, neighbors):
+        """
+        Tarjan's algorithm, using an explicit stack instead of recursion
+        (mazes can easily be deeper than Python's recursion limit).
+        """
+
+        discovery = {}
+        low = {}
+        counter = 0
+
+        for root in openCells:
+            if (root in discovery):
+                continue
+
+            discovery[root] = counter
+            low[root] = counter
+            counter += 1
+            rootChildren = 0
+
+            # Stack entries are: (cell, parent, iterator over the cell's neighbors).
+            stack = [(root, None, iter(neighbors[root]))]
+
+            while (len(stack) > 0):
+                cell, parent, children = stack[-1]
+
+                child = next(children, None)
+                if (child is not None):
+                    if (child == parent):
+                        continue
+
+                    if (child in discovery):
+                        low[cell] = min(low[cell], discovery[child])
+                        continue
+
+                    discovery[child] = counter
+                    low[child] = counter
+                    counter += 1
+
+                    if (cell == root):
+                        rootChildren += 1
+
+                    stack.append((child, cell, iter(neighbors[child])))
+                    continue
+
+                # All the children of this cell have been explored.
+                stack.pop()
+                if (parent is None):
+                    continue
+
+                low[parent] = min(low[parent], low[cell])
+                if (parent != root and low[cell] >= discovery[parent]):
+                    self._articulationPoints.add(parent)
+
+            if (rootChildren > 1):
+                self._articulationPoints.add(root)
+
+    def _findPockets(self, openCells, neighbors):
+        degrees = {cell: len(neighbors[cell]) for cell in openCells}
+
+        removed = set()
+        # {removed cell: the cell it was attached to when it was removed}
+        attachments = {}
+        removalOrder = []
+
+        queue = [cell for cell in openCells if degrees[cell] == 1]
+        while (len(queue) > 0):
+            cell = queue.pop()
+
+            remaining = [neighbor for neighbor in neighbors[cell] if neighbor not in removed]
+            if (len(remaining) != 1):
+                # This is the last cell of a maze with no loops, keep it as the entrance.
+                continue
+
+            removed.add(cell)
+            removalOrder.append(cell)
+            attachments[cell] = remaining[0]
+
+            degrees[remaining[0]] -= 1
+            if (degrees[remaining[0]] == 1):
+                queue.append(remaining[0])
+
+        # Cells removed later are closer to the entrance, so go in reverse.
+        pocketCells = []
+        for cell in reversed(removalOrder):
+            attachment = attachments[cell]
+
+            if (attachment not in removed):
+                # This cell is just inside an entrance, start a new pocket.
+                pocketIndex = len(pocketCells)
+                pocketCells.append([])
+                self._pockets.append((attachment, None, 0))
+                depth = 1
+            else:
+                pocketIndex, depth = self._pocketCells[attachment]
+                depth += 1
+
+            self._pocketCells[cell] = (pocketIndex, depth)
+            pocketCells[pocketIndex].append(cell)
+
+        for pocketIndex in range(len(self._pockets)):
+            entrance = self._pockets[pocketIndex][0]
+            cells = tuple(pocketCells[pocketIndex])
+            depth = max([self._pocketCells[cell][1] for cell in cells])
+
+            self._pockets[pocketIndex] = (entrance, cells, depth)
@@ -0,0 +1,174 @@
+"""
+A map from every open position to its closest food.
+
+Finding the closest food with a fresh search from pacman's position
+can touch much of the maze every time it is done.
+Instead, a `NearestFoodMap` runs a single breadth first search out from all the food at once,
+which gives every open position its distance (and next step) to the closest food.
+As food is eaten, only the positions that were closest to the eaten food are recomputed.
+"""
+
+import collections
+import heapq
+
+from pacai.core.actions import Actions
+from pacai.core.mazeGraph import getOpenNeighbors
+
+class NearestFoodMap(object):
+    """
+    Distances (and paths) from every open position to its closest food.
+
+    For each reachable open position, the map keeps:
+    the distance to the closest food, that food's position,
+    and the next position to move to on a shortest path to that food.
+    """
+
+    def __init__(self, walls, food):
+        """
+        walls: a `pacai.core.grid.Grid` of walls.
+        food: a `pacai.core.grid.Grid` of food, or an iterable of food positions.
+        """
+
+        self._walls = walls
+
+        if (hasattr(food, 'asList')):
+            food = food.asList()
+
+        self._food = set(food)
+
+        # {position: distance to the closest food, ...}
+        self._distances = {}
+
+        # {position: the closest food, ...}
+        self._targets = {}
+
+        # {position: the next position on the way to the closest food, ...}
+        self._nextPositions = {}
+
+        # {food position: set of positions that have this as their closest food, ...}
+        self._regions = {}
+
+        # {open position: [open neighbor, ...], ...}
+        self._neighbors = {}
+
+        self._build()
+
+    def getDistance(self, position):
+        """
+        Get the maze distance from the given position to the closest food,
+        or None if there is no reachable food.
+        """
+
+        return self._distances.get(position)
+
+    def getFood(self):
+        """
+        Get the set of food positions that this map is tracking.
+        The caller should not modify the set.
+        """
+
+        return self._food
+
+    def getNearestFood(self, position):
+        """
+        Get the position of the food closest to the given position,
+        or None if there is no reachable food.
+        """
+
+        return self._targets.get(position)
+
+    def getNumFood(self):
+        return len(self._food)
+
+    def getPath(self, position):
+        """
+        Get a shortest list of actions that moves from the given position to the closest food.
+        Returns None if there is no reachable food.
+        """
+
+        if (position not in self._distances):
+            return None
+
+        actions = []
+        while (position not in self._food):
+            nextPosition = self._nextPositions[position]
+
+            vector = (nextPosition[0] - position[0], nextPosition[1] - position[1])
+            actions.append(Actions.vectorToDirection(vector))
+
+            position = nextPosition
+
+        return actions
+
+    def hasFood(self, position):
+        return position in self._food
+
+    def removeFood(self, position):
+        """
+        Mark the food at the given position as eaten.
+
+        Only the positions that were closest to this food are recomputed.
+        They get re-seeded from the positions just outside of their region
+        (which still have correct distances),
+        and the search then spreads back into the region.
+        """
+
+        if (position not in self._food):
+            return False
+
+        self._food.remove(position)
+        region = self._regions.pop(position)
+
+        for cell in region:
+            del self._distances[cell]
+            del self._targets[cell]
+            del self._nextPositions[cell]
+
+        fringe = []
+        for cell in region:
+            for neighbor in self._neighbors[cell]:
+                if (neighbor in self._distances):
+                    heapq.heappush(fringe, (self._distances[neighbor] + 1, cell, neighbor))
+
+        while (len(fringe) > 0):
+            distance, cell, nextPosition = heapq.heappop(fringe)
+            if (cell in self._distances):
+                continue
+
+            self._setCell(cell, distance, self._targets[nextPosition], nextPosition)
+
+            for neighbor in self._neighbors[cell]:
+                if (neighbor in region and neighbor not in self._distances):
+                    heapq.heappush(fringe, (distance + 1, neighbor, cell))
+
+        return True
+
+    def _build(self):
+        for x in range(self._walls.getWidth()):
+            for y in range(self._walls.getHeight()):
+                if (not self._walls[x][y]):
+                    self._neighbors[(x, y)] = getOpenNeighbors((x, y), self._walls)
+
+        fringe = collections.deque()
+
+        for food in sorted(self._food):
+            self._regions[food] = set()
+            self._setCell(food, 0, food, food)
+            fringe.append(food)
+
+        while (len(fringe) > 0):
+            cell = fringe.popleft()
+            distance = self._distances[cell]
+
+            for neighbor in self._neighbors[cell]:
+                if (neighbor in self._distances):
+                    continue
+
+                self._setCell(neighbor, distance + 1, self._targets[cell], cell)
+                fringe.append(neighbor)
+
+    def _setCell(self, cell, distance, target, nextPosition):
+        self._distances[cell] = distance
+        self._targets[cell] = target
+        self._nextPositions[cell] = nextPosition
+        self._regions[target].add(cell)
@@ -0,0 +1,410 @@
+"""
+Search functions that use a bounded amount of memory.
+
+The standard graph searches keep every visited state (and the whole frontier) in memory,
+which can be far too much for large problems (e.g. large puzzles or food searches).
+The searches here trade some extra (repeated) work for a fixed cap on memory.
+"""
+
+import heapq
+import itertools
+import math
+
+from pacai.core.search.heuristic import null as nullHeuristic
+
+# SMA*'s heaps are rebuilt from the nodes they should hold
+# once they have grown to more than this many entries per node (see `_OpenNodes`).
+MAX_HEAP_ENTRIES_PER_NODE = 4
+
+def iterativeDeepeningAStar(problem, heuristic = nullHeuristic, memoryLimit = None):
+    """
+    Iterative deepening A* (IDA*).
+
+    Run depth first searches that prune any node with a cost plus heuristic
+    greater than the current bound.
+    Each time a search fails, the bound is raised to the smallest value that was pruned.
+    With an admissible heuristic, the first path found is optimal.
+
+    Only the current path (and the unexplored siblings along it) are kept in memory,
+    so memory grows linearly with the length of the solution.
+    If memoryLimit is given, then paths will not be extended past memoryLimit states.
+    """
+
+    start = problem.startingState()
+    bound = heuristic(start, problem)
+
+    while True:
+        actions, nextBound = _boundedDepthFirst(problem, heuristic, start, bound, memoryLimit)
+        if (actions is not None):
+            return actions
+
+        if (nextBound == math.inf):
+            if (memoryLimit is not None):
+                raise Exception('No path to the goal state exists within the memory limit.')
+
+            raise Exception('No path to the goal state exists.')
+
+        bound = nextBound
+
+def simplifiedMemoryBoundedAStar(problem, heuristic = nullHeuristic, memoryLimit = 10000,
+        stats = None):
+    """
+    Simplified memory-bounded A* (SMA*).
+
+    Work just like A* until memoryLimit search nodes are being held.
+    Then, to make room for a new node, forget the worst leaf
+    (the one with the highest f-value, oldest first on ties).
+    A forgotten node's f-value is remembered by its parent,
+    so the parent knows how good that branch was and can regenerate it later if it is needed.
+    Paths that would need more than memoryLimit nodes are given up on.
+
+    Like tree search, the only successors that are pruned are the ones already on the path
+    (a state can be held by more than one node).
+    With an admissible heuristic, the returned path is the cheapest one
+    that fits within the memory limit.
+
+    If stats is given (a dict), then it is filled with:
+    'maxHeapEntries' (the most entries the open node heaps ever held).
+    """
+
+    if (memoryLimit < 2):
+        raise ValueError('SMA* needs room for at least two nodes, got %d.' % (memoryLimit))
+
+    start = problem.startingState()
+    root = _Node(start, None, None, 0, 0, heuristic(start, problem))
+
+    # The nodes that still have successors to generate (or to regenerate).
+    openNodes = _OpenNodes()
+    openNodes.add(root)
+
+    numNodes = 1
+    maxHeapEntries = openNodes.getNumEntries()
+
+    while True:
+        maxHeapEntries = max(maxHeapEntries, openNodes.getNumEntries())
+        if (stats is not None):
+            stats['maxHeapEntries'] = maxHeapEntries
+
+        node = openNodes.popBest()
+        if (node is None or node.getPendingF() == math.inf):
+            raise Exception('No path to the goal state exists within the memory limit.')
+
+        if (problem.isGoal(node.state)):
+            return node.getActions()
+
+        if (node.pending is None):
+            node.pending = []
+
+            ancestors = node.getAncestorStates()
+            for successor, action, stepCost in problem.successorStates(node.state):
+                if (successor not in ancestors):
+                    node.pending.append((successor, action, stepCost))
+
+            node.numUngenerated = len(node.pending)
+
+        if (len(node.pending) == 0):
+            if (len(node.children) == 0):
+                # A dead end, nothing to keep around.
+                numNodes -= _forget(node, openNodes, remember = False)
+            else:
+                openNodes.remove(node)
+                _backup(node, openNodes)
+
+            continue
+
+        successor, action, stepCost = node.pending.pop(0)
+
+        if (action in node.forgotten):
+            forgottenF = node.forgotten.pop(action)
+        else:
+            forgottenF = None
+            node.numUngenerated -= 1
+
+        g = node.g + stepCost
+
+        child = _Node(successor, node, action, stepCost, g, 0, depth = node.depth + 1)
+
+        if (problem.isGoal(successor)):
+            child.f = g
+        elif (child.depth >= memoryLimit - 1):
+            # There is no room to go any deeper down this path.
+            child.f = math.inf
+        else:
+            child.f = max(node.f, g + heuristic(successor, problem))
+
+        if (forgottenF is not None):
+            child.f = max(child.f, forgottenF)
+
+        node.children.append(child)
+        numNodes += 1
+
+        if (len(node.pending) == 0):
+            # Every successor is in memory, so this node can only be improved by its children.
+            openNodes.remove(node)
+        else:
+            openNodes.add(node)
+
+        _backup(node, openNodes)
+
+        # Make room before adding the new child, so it can never be the one forgotten.
+        while (numNodes > memoryLimit):
+            leaf = openNodes.popWorst(root)
+            if (leaf is None):
+                break
+
+            numNodes -= _forget(leaf, openNodes)
+
+        openNodes.add(child)
+
+class _Node(object):
+    """
+    A node in the (partial) search tree kept by SMA*.
+    """
+
+    def __init__(self, state, parent, action, stepCost, g, f, depth = 0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.stepCost = stepCost
+        self.g = g
+        self.f = f
+        self.depth = depth
+
+        # Successors that have not been generated (or were forgotten).
+        # None until this node is expanded for the first time.
+        self.pending = None
+
+        # The number of successors that have never been generated.
+        self.numUngenerated = 0
+
+        self.children = []
+
+        # {action: f-value of the forgotten child, ...}
+        self.forgotten = {}
+
+    def getPendingF(self):
+        """
+        Get the best f-value of the successors that this node would generate next.
+        Before all the successors have been generated, this is just this node's f-value.
+        After that, only forgotten successors remain, so it is the best of their f-values.
+        """
+
+        if (self.pending is None or self.numUngenerated > 0 or len(self.forgotten) == 0):
+            return self.f
+
+        return min(self.forgotten.values())
+
+    def getActions(self):
+        actions = []
+
+        node = self
+        while (node.parent is not None):
+            actions.append(node.action)
+            node = node.parent
+
+        actions.reverse()
+        return actions
+
+    def getAncestorStates(self):
+        states = set()
+
+        node = self
+        while (node is not None):
+            states.add(node.state)
+            node = node.parent
+
+        return states
+
+class _OpenNodes(object):
+    """
+    The nodes that SMA* can still work on.
+    Keeps two heaps (with lazy deletion):
+    one for the best node (lowest pending f-value, deepest on ties),
+    and one for the worst leaf (highest f-value, shallowest on ties).
+
+    Stale heap entries (for nodes that were removed or have changed) would otherwise
+    keep forgotten nodes alive, so the heaps are rebuilt from just the current nodes
+    whenever they grow past MAX_HEAP_ENTRIES_PER_NODE entries per node.
+    """
+
+    def __init__(self):
+        self._nodes = set()
+        self._best = []
+        self._worst = []
+
+        # Used to break ties in the heaps (so nodes never get compared).
+        self._counter = itertools.count()
+
+    def __contains__(self, node):
+        return node in self._nodes
+
+    def add(self, node):
+        """
+        Add a node (or refresh it after its f-value or children have changed).
+        """
+
+        self._nodes.add(node)
+        heapq.heappush(self._best, (node.getPendingF(), -node.depth, next(self._counter), node))
+
+        if (len(node.children) == 0):
+            heapq.heappush(self._worst, (-node.f, node.depth, next(self._counter), node))
+
+        # The small constant keeps a handful of nodes from being rebuilt over and over.
+        maxEntries = MAX_HEAP_ENTRIES_PER_NODE * (len(self._nodes) + 4)
+        if (len(self._best) + len(self._worst) > maxEntries):
+            self._rebuild()
+
+    def getNumEntries(self):
+        """
+        Get the number of entries in both heaps (including the stale ones).
+        """
+
+        return len(self._best) + len(self._worst)
+
+    def popBest(self):
+        while (len(self._best) > 0):
+            f, depth, count, node = heapq.heappop(self._best)
+            if (node in self._nodes and node.getPendingF() == f):
+                return node
+
+        return None
+
+    def popWorst(self, root):
+        """
+        Remove and return the worst leaf (never the root).
+        """
+
+        while (len(self._worst) > 0):
+            f, depth, count, node = heapq.heappop(self._worst)
+            if (node not in self._nodes or node.f != -f or node is root):
+                continue
+
+            if (len(node.children) > 0):
+                continue
+
+            self._nodes.remove(node)
+            return node
+
+        return None
+
+    def remove(self, node):
+        self._nodes.discard(node)
+
+    def _rebuild(self):
+        self._best = []
+        self._worst = []
+
+        for node in self._nodes:
+            self._best.append((node.getPendingF(), -node.depth, next(self._counter), node))
+
+            if (len(node.children) == 0):
+                self._worst.append((-node.f, node.depth, next(self._counter), node))
+
+        heapq.heapify(self._best)
+        heapq.heapify(self._worst)
+
+def _backup(node, openNodes):
+    """
+    Once all of a node's successors have been generated (at least once),
+    its f-value is the best of its children's (both in memory and forgotten).
+    Pass any change up the tree.
+    """
+
+    while (node is not None and node.pending is not None and node.numUngenerated == 0):
+        values = [child.f for child in node.children] + list(node.forgotten.values())
+
+        newF = math.inf
+        if (len(values) > 0):
+            newF = min(values)
+
+        if (newF == node.f):
+            break
+
+        node.f = newF
+        if (node in openNodes):
+            openNodes.add(node)
+
+        node = node.parent
+
+def _forget(leaf, openNodes, remember = True):
+    """
+    Remove a leaf from the search tree.
+    If remember is true, then the leaf is put back onto its parent's pending successors
+    (along with its f-value).
+    Returns the number of nodes removed.
+    """
+
+    openNodes.remove(leaf)
+
+    parent = leaf.parent
+    if (parent is None):
+        return 0
+
+    parent.children.remove(leaf)
+
+    if (remember):
+        parent.forgotten[leaf.action] = leaf.f
+        parent.pending.append((leaf.state, leaf.action, leaf.stepCost))
+
+    if (len(parent.pending) > 0 or parent in openNodes):
+        openNodes.add(parent)
+
+    _backup(parent, openNodes)
+
+    return 1
+
+def _boundedDepthFirst(problem, heuristic, start, bound, memoryLimit):
+    """
+    A single depth first pass of IDA*.
+    Returns a tuple of (actions, next bound).
+    The actions are None if no goal was found within the bound.
+    """
+
+    nextBound = math.inf
+
+    # Stack entries are: (state, cost so far, iterator over unexplored successors).
+    stack = [(start, 0, None)]
+    actions = []
+    onPath = {start}
+
+    while (len(stack) > 0):
+        state, cost, successors = stack[-1]
+
+        if (successors is None):
+            f = cost + heuristic(state, problem)
+            if (f > bound):
+                nextBound = min(nextBound, f)
+                _popPath(stack, actions, onPath)
+                continue
+
+            if (problem.isGoal(state)):
+                return actions, bound
+
+            if (memoryLimit is not None and len(stack) >= memoryLimit):
+                _popPath(stack, actions, onPath)
+                continue
+
+            successors = iter(problem.successorStates(state))
+            stack[-1] = (state, cost, successors)
+
+        nextSuccessor = next(successors, None)
+        if (nextSuccessor is None):
+            _popPath(stack, actions, onPath)
+            continue
+
+        successor, action, stepCost = nextSuccessor
+        if (successor in onPath):
+            continue
+
+        stack.append((successor, cost + stepCost, None))
+        actions.append(action)
+        onPath.add(successor)
+
+    return None, nextBound
+
+def _popPath(stack, actions, onPath):
+    state, cost, successors = stack.pop()
+    onPath.discard(state)
+
+    if (len(actions) > 0):
+        actions.pop()
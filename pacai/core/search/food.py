@@ -62,3 +62,88 @@ class FoodSearchProblem(SearchProblem):
             cost += 1
 
         return cost
+
+class FoodBitmaskSearchProblem(FoodSearchProblem):
+    """
+    A `FoodSearchProblem` with a much more compact representation of the remaining food.
+
+    A search state in this problem is a tuple (pacmanPosition, foodMask).
+    Where pacmanPosition is a tuple (x, y) of integers specifying Pacman's position,
+    and foodMask is an int with the i-th bit set if the food at
+    `FoodBitmaskSearchProblem.foodPositions[i]` has not been eaten yet.
+    Unlike a `pacai.core.grid.Grid`, successors do not need to copy the food
+    and states can be hashed and compared in (essentially) constant time.
+
+    Since many heuristic computations only depend on the remaining food,
+    heuristics are encouraged to memoize them in `FoodSearchProblem.heuristicInfo`
+    keyed by the food mask (see `FoodBitmaskSearchProblem.getFoodList` for an example).
+    """
+
+    def __init__(self, startingGameState):
+        super().__init__(startingGameState)
+
+        self.foodPositions = tuple(startingGameState.getFood().asList())
+        self.foodIndexes = {position: i for i, position in enumerate(self.foodPositions)}
+
+        startMask = (1 << len(self.foodPositions)) - 1
+        self.start = (startingGameState.getPacmanPosition(), startMask)
+
+        # {position: [(next position, action), ...], ...}
+        self._moves = {}
+
+    def getFoodList(self, foodMask):
+        """
+        Get the positions of the food remaining in the given mask.
+        Results are memoized in `FoodSearchProblem.heuristicInfo` keyed by the mask.
+        """
+
+        cache = self.heuristicInfo.setdefault('foodLists', {})
+
+        foodList = cache.get(foodMask)
+        if (foodList is None):
+            foodList = [position for i, position in enumerate(self.foodPositions)
+                    if (foodMask >> i) & 1]
+            cache[foodMask] = foodList
+
+        return foodList
+
+    def isGoal(self, state):
+        return state[1] == 0
+
+    def successorStates(self, state):
+        """
+        Returns successor states, the actions they require, and a cost of 1.
+        """
+
+        self._numExpanded += 1
+
+        position, foodMask = state
+
+        successors = []
+        for nextPosition, direction in self._getMoves(position):
+            nextFoodMask = foodMask
+
+            foodIndex = self.foodIndexes.get(nextPosition)
+            if (foodIndex is not None):
+                nextFoodMask &= ~(1 << foodIndex)
+
+            successors.append(((nextPosition, nextFoodMask), direction, 1))
+
+        return successors
+
+    def _getMoves(self, position):
+        moves = self._moves.get(position)
+        if (moves is not None):
+            return moves
+
+        x, y = position
+        moves = []
+
+        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+            dx, dy = Actions.directionToVector(direction)
+            nextx, nexty = int(x + dx), int(y + dy)
+            if not self.walls[nextx][nexty]:
+                moves.append(((nextx, nexty), direction))
+
+        self._moves[position] = moves
+        return moves
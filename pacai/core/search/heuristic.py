@@ -38,3 +38,109 @@ def numFood(state, problem):
     """
 
     return state[1].count()
+
+def farthestFood(state, problem):
+    """
+    This heuristic is the manhattan distance to the food that is farthest away.
+    It works with both `pacai.core.search.food.FoodSearchProblem`
+    and `pacai.core.search.food.FoodBitmaskSearchProblem`.
+    """
+
+    position, food = state
+
+    if (isinstance(food, int)):
+        foodList = problem.getFoodList(food)
+    else:
+        foodList = food.asList()
+
+    if (len(foodList) == 0):
+        return 0
+
+    return max([distance.manhattan(position, foodPosition) for foodPosition in foodList])
+
+def foodSpanningTree(state, problem):
+    """
+    This heuristic is the maze distance to the closest food,
+    plus the weight of a minimum spanning tree (using maze distances) over the remaining food.
+    Any path that eats all the food has to get to some food first,
+    and then connect all the food together, so this heuristic is admissible (and consistent).
+
+    It works with both `pacai.core.search.food.FoodSearchProblem`
+    and `pacai.core.search.food.FoodBitmaskSearchProblem`.
+    The maze distances from every food to every position are computed once
+    (over the layout's `pacai.core.mazeGraph.MazeGraph`),
+    and the spanning tree weights are memoized in the problem's `heuristicInfo`
+    keyed by the remaining food's bitmask.
+    """
+
+    position, food = state
+    info = problem.heuristicInfo
+
+    if ('foodDistances' not in info):
+        _initFoodDistances(problem)
+
+    foodPositions = info['foodPositions']
+    foodDistances = info['foodDistances']
+
+    if (isinstance(food, int)):
+        foodMask = food
+    else:
+        foodMask = 0
+        for i in range(len(foodPositions)):
+            x, y = foodPositions[i]
+            if (food[x][y]):
+                foodMask |= (1 << i)
+
+    if (foodMask == 0):
+        return 0
+
+    remaining = [i for i in range(len(foodPositions)) if (foodMask >> i) & 1]
+
+    treeWeights = info['spanningTreeWeights']
+    treeWeight = treeWeights.get(foodMask)
+    if (treeWeight is None):
+        treeWeight = _spanningTreeWeight(remaining, foodPositions, foodDistances)
+        treeWeights[foodMask] = treeWeight
+
+    closest = min([foodDistances[i].get(position, 0) for i in remaining])
+
+    return closest + treeWeight
+
+def _initFoodDistances(problem):
+    info = problem.heuristicInfo
+
+    foodPositions = getattr(problem, 'foodPositions', None)
+    if (foodPositions is None):
+        foodPositions = tuple(problem.startingGameState.getFood().asList())
+
+    graph = problem.startingGameState.getInitialLayout().getMazeGraph()
+
+    info['foodPositions'] = foodPositions
+    info['foodDistances'] = [graph.distancesFrom(position) for position in foodPositions]
+    info['spanningTreeWeights'] = {}
+
+def _spanningTreeWeight(indexes, foodPositions, foodDistances):
+    """
+    Prim's algorithm over the complete graph of the given food,
+    using the (dense) precomputed maze distances.
+    """
+
+    if (len(indexes) <= 1):
+        return 0
+
+    # The cheapest edge connecting each food (not in the tree) to the tree.
+    first = indexes[0]
+    bestEdges = {i: foodDistances[first].get(foodPositions[i], 0) for i in indexes[1:]}
+
+    weight = 0
+    while (len(bestEdges) > 0):
+        nextIndex = min(bestEdges, key = bestEdges.get)
+        weight += bestEdges.pop(nextIndex)
+
+        distances = foodDistances[nextIndex]
+        for i in bestEdges:
+            edge = distances.get(foodPositions[i], 0)
+            if (edge < bestEdges[i]):
+                bestEdges[i] = edge
+
+    return weight
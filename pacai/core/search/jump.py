@@ -0,0 +1,122 @@
+"""
+Search functions that take advantage of the corridors found in pacman mazes.
+
+Pacman mazes are 4-connected grids where most open cells have exactly two open neighbors.
+A search over such a maze does not need to stop at every cell of a corridor,
+since there is only one way to continue.
+Instead, we can "jump" from one junction (a cell with three or more open neighbors)
+to the next, and only expand the junctions.
+"""
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.search.heuristic import null as nullHeuristic
+from pacai.util.priorityQueue import PriorityQueue
+
+def jumpPointSearch(problem, heuristic = nullHeuristic):
+    """
+    Search the junctions of a maze in order of their combined cost and heuristic.
+
+    This search only works on problems where the search state is a position (x, y),
+    e.g. `pacai.core.search.position.PositionSearchProblem` and its children.
+    The problem must expose its walls via `problem.walls`,
+    and may expose its cost function via `problem.costFn`
+    (otherwise every step is assumed to cost 1).
+
+    Only the starting position and the junctions are passed to
+    `pacai.core.search.problem.SearchProblem.successorStates`,
+    so the number of expanded nodes is much smaller than a cell-by-cell search.
+    However, every cell that is jumped over is still checked with
+    `pacai.core.search.problem.SearchProblem.isGoal`,
+    so the returned path has the same cost as the one returned by
+    uniform cost search (or A* with the same heuristic).
+    """
+
+    start = problem.startingState()
+    if (problem.isGoal(start)):
+        return []
+
+    costFn = getattr(problem, 'costFn', None)
+
+    # Items on the fringe are: (position, actions, cost, isGoal).
+    fringe = PriorityQueue()
+    fringe.push((start, [], 0, False), heuristic(start, problem))
+
+    # The cheapest known cost to reach each jump point.
+    bestCosts = {start: 0}
+    closed = set()
+
+    while (not fringe.isEmpty()):
+        position, actions, cost, isGoal = fringe.pop()
+
+        if (isGoal):
+            return actions
+
+        if (position in closed):
+            continue
+        closed.add(position)
+
+        for successor, action, stepCost in problem.successorStates(position):
+            jump = _jump(problem, costFn, position, successor, action)
+            if (jump is None):
+                continue
+
+            jumpPosition, jumpActions, jumpCost, jumpIsGoal = jump
+            totalCost = cost + stepCost + jumpCost
+
+            if (jumpPosition in bestCosts and bestCosts[jumpPosition] <= totalCost):
+                continue
+            bestCosts[jumpPosition] = totalCost
+
+            priority = totalCost + heuristic(jumpPosition, problem)
+            fringe.push((jumpPosition, actions + [action] + jumpActions, totalCost, jumpIsGoal),
+                    priority)
+
+    raise Exception('No path to the goal state exists.')
+
+def _jump(problem, costFn, origin, position, direction):
+    """
+    Follow the corridor that starts at position (which we entered by moving in direction
+    from origin) until we reach a goal, a junction, or back to the origin.
+
+    Returns a tuple of (jump point, additional actions, additional cost, is goal),
+    or None if the corridor is a dead end that does not contain a goal.
+    """
+
+    walls = problem.walls
+    actions = []
+    cost = 0
+
+    while True:
+        if (problem.isGoal(position)):
+            return (position, actions, cost, True)
+
+        x, y = position
+        reverse = Directions.REVERSE[direction]
+
+        exits = []
+        for action in Directions.CARDINAL:
+            if (action == reverse):
+                continue
+
+            dx, dy = Actions.directionToVector(action)
+            nextPosition = (int(x + dx), int(y + dy))
+            if (not walls[nextPosition[0]][nextPosition[1]]):
+                exits.append((nextPosition, action))
+
+        if (len(exits) == 0):
+            # A dead end with no goal, nothing to see here.
+            return None
+
+        if (len(exits) > 1 or position == origin):
+            # A junction (or a loop back to where we started), let the search handle it.
+            return (position, actions, cost, False)
+
+        # A corridor, keep moving along it.
+        position, direction = exits[0]
+        actions.append(direction)
+
+        if (costFn is None):
+            cost += 1
+        else:
+            cost += costFn(position)
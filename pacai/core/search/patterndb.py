@@ -0,0 +1,266 @@
+"""
+Pattern databases for sliding tile puzzles (e.g. `pacai.bin.eightpuzzle.EightPuzzleState`).
+
+A pattern database splits the tiles of a puzzle into disjoint groups (patterns).
+For each pattern, it stores the exact number of moves of that pattern's tiles needed
+to bring them to their goal positions (ignoring all the other tiles),
+for every possible placement of the pattern's tiles.
+Since each move only moves a single tile, the costs of disjoint patterns can be added together
+and still give an admissible (and consistent) heuristic.
+
+The tables are computed once with a backward breadth-first search from the goal,
+and can be saved to a compact file that is memory-mapped when it is loaded.
+So a lookup is just a few array reads, no matter how large the puzzle is.
+
+The puzzles here are described by their numbers (left to right, top to bottom),
+where 0 is the blank space and the goal has every number i at index i.
+"""
+
+import collections
+import mmap
+import struct
+
+# The magic bytes at the start of every pattern database file.
+MAGIC = b'PDB1'
+
+# Costs are stored in a single byte, this marks placements that were never reached.
+UNREACHED = 255
+
+# Header: magic, puzzle size (width), number of patterns.
+_HEADER = struct.Struct('<4sBB')
+
+class PatternDatabase(object):
+    """
+    A set of disjoint pattern tables for a square sliding tile puzzle.
+
+    A pattern database can be used directly as a heuristic
+    (it is callable with a state and problem).
+
+    Each table is indexed by the positions of its pattern's tiles,
+    using each position as a digit in base (size * size).
+    """
+
+    def __init__(self, size, patterns, tables):
+        """
+        size: the width (and height) of the puzzle.
+        patterns: a list of tuples of tile numbers (never including the blank).
+        tables: a list of byte sequences (one for each pattern).
+        """
+
+        self._size = size
+        self._patterns = [tuple(pattern) for pattern in patterns]
+        self._tables = tables
+
+        # Keep around any file resources that the tables are backed by.
+        self._file = None
+        self._mmap = None
+
+    def __call__(self, state, problem = None):
+        return self.estimate(state.getNumbers())
+
+    def close(self):
+        """
+        Release the file that this database was loaded from (if any).
+        The database is no longer usable after it is closed.
+        """
+
+        self._tables = []
+
+        if (self._mmap is not None):
+            self._mmap.close()
+            self._mmap = None
+
+        if (self._file is not None):
+            self._file.close()
+            self._file = None
+
+    def estimate(self, numbers):
+        """
+        Get the estimated number of moves needed to solve the puzzle with the given numbers.
+        """
+
+        positions = [0] * len(numbers)
+        for position in range(len(numbers)):
+            positions[numbers[position]] = position
+
+        numCells = self._size * self._size
+        cost = 0
+
+        for i in range(len(self._patterns)):
+            index = 0
+            for tile in reversed(self._patterns[i]):
+                index = index * numCells + positions[tile]
+
+            cost += self._tables[i][index]
+
+        return cost
+
+    def getPatterns(self):
+        return self._patterns
+
+    def getSize(self):
+        return self._size
+
+    def save(self, path):
+        """
+        Write this database to a file.
+
+        The file is a small header followed by the patterns and their (raw byte) tables,
+        so it can be loaded back (memory-mapped) with `loadPatternDatabase`.
+        """
+
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, self._size, len(self._patterns)))
+
+            for pattern in self._patterns:
+                file.write(struct.pack('<B', len(pattern)))
+                file.write(bytes(pattern))
+
+            for table in self._tables:
+                file.write(table)
+
+def buildPatternDatabase(size, patterns):
+    """
+    Build the tables for the given (disjoint) patterns of a puzzle with the given width.
+
+    Build time and memory grow with (size * size) ** (len(pattern) + 1),
+    so large puzzles should use several small patterns.
+    E.g. the eight puzzle can use [(1, 2, 3, 4), (5, 6, 7, 8)],
+    and the fifteen puzzle [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)].
+    """
+
+    numCells = size * size
+
+    seenTiles = set()
+    for pattern in patterns:
+        for tile in pattern:
+            if (tile <= 0 or tile >= numCells):
+                raise ValueError('Pattern tile %d is not a tile of a %dx%d puzzle.'
+                        % (tile, size, size))
+
+            if (tile in seenTiles):
+                raise ValueError('Patterns must be disjoint, tile %d is in more than one.'
+                        % (tile))
+
+            seenTiles.add(tile)
+
+    neighbors = []
+    for position in range(numCells):
+        row, col = divmod(position, size)
+        cellNeighbors = []
+
+        if (row > 0):
+            cellNeighbors.append(position - size)
+
+        if (row < size - 1):
+            cellNeighbors.append(position + size)
+
+        if (col > 0):
+            cellNeighbors.append(position - 1)
+
+        if (col < size - 1):
+            cellNeighbors.append(position + 1)
+
+        neighbors.append(cellNeighbors)
+
+    tables = [_buildTable(numCells, neighbors, pattern) for pattern in patterns]
+    return PatternDatabase(size, patterns, tables)
+
+def loadPatternDatabase(path):
+    """
+    Load a database written by `PatternDatabase.save`.
+    The tables are memory-mapped, so they are only read from disk as they are needed.
+    """
+
+    file = open(path, 'rb')
+    data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    magic, size, numPatterns = _HEADER.unpack_from(data, 0)
+    if (magic != MAGIC):
+        data.close()
+        file.close()
+        raise ValueError('File is not a pattern database: %s.' % (path))
+
+    offset = _HEADER.size
+    patterns = []
+    for i in range(numPatterns):
+        length = data[offset]
+        patterns.append(tuple(data[(offset + 1):(offset + 1 + length)]))
+        offset += 1 + length
+
+    view = memoryview(data)
+    tables = []
+    for pattern in patterns:
+        tableSize = (size * size) ** len(pattern)
+        tables.append(view[offset:(offset + tableSize)])
+        offset += tableSize
+
+    database = PatternDatabase(size, patterns, tables)
+    database._file = file
+    database._mmap = data
+
+    return database
+
+def _buildTable(numCells, neighbors, pattern):
+    """
+    Run a backward breadth-first search from the goal over the abstract states
+    (the positions of the pattern's tiles and the blank).
+
+    Moving the blank into a cell with one of the pattern's tiles costs 1,
+    and moving it into any other cell is free (that tile is not part of this pattern).
+    So, this is a 0-1 BFS using a deque (free moves go on the front).
+    The final table is the cheapest cost over every blank position.
+    """
+
+    numTiles = len(pattern)
+    tableSize = numCells ** numTiles
+
+    # The abstract costs, indexed by: (tile index * numCells) + blank position.
+    costs = bytearray([UNREACHED]) * (tableSize * numCells)
+
+    # Each tile's positional weight in the tile index.
+    weights = [numCells ** i for i in range(numTiles)]
+
+    goalIndex = 0
+    for i in range(numTiles):
+        goalIndex += pattern[i] * weights[i]
+
+    fringe = collections.deque()
+    fringe.append((0, goalIndex, 0))
+
+    while (len(fringe) > 0):
+        cost, tileIndex, blank = fringe.popleft()
+
+        key = tileIndex * numCells + blank
+        if (costs[key] != UNREACHED):
+            continue
+        costs[key] = cost
+
+        # Decode which tile (if any) is in each of the blank's neighboring cells.
+        tilePositions = {}
+        remaining = tileIndex
+        for i in range(numTiles):
+            remaining, position = divmod(remaining, numCells)
+            tilePositions[position] = i
+
+        for neighbor in neighbors[blank]:
+            tile = tilePositions.get(neighbor)
+
+            if (tile is None):
+                # A tile that is not in this pattern moved, no cost.
+                if (costs[tileIndex * numCells + neighbor] == UNREACHED):
+                    fringe.appendleft((cost, tileIndex, neighbor))
+            else:
+                # One of our tiles moved into the blank's old cell.
+                nextIndex = tileIndex + (blank - neighbor) * weights[tile]
+                if (costs[nextIndex * numCells + neighbor] == UNREACHED):
+                    fringe.append((cost + 1, nextIndex, neighbor))
+
+    table = bytearray([UNREACHED]) * tableSize
+    for tileIndex in range(tableSize):
+        start = tileIndex * numCells
+        best = min(costs[start:(start + numCells)])
+        if (best != UNREACHED):
+            table[tileIndex] = best
+
+    return table
@@ -1,4 +1,6 @@
 from pacai.core.directions import Directions
+from pacai.core.search import bounded
+from pacai.core.search import jump
 from pacai.student import search
 
 def tinyMazeSearch(problem):
@@ -26,3 +28,12 @@ astar = search.aStarSearch
 
 uniformCostSearch = search.uniformCostSearch
 ucs = search.uniformCostSearch
+
+jumpPointSearch = jump.jumpPointSearch
+jps = jump.jumpPointSearch
+
+iterativeDeepeningAStar = bounded.iterativeDeepeningAStar
+idastar = bounded.iterativeDeepeningAStar
+
+simplifiedMemoryBoundedAStar = bounded.simplifiedMemoryBoundedAStar
+smastar = bounded.simplifiedMemoryBoundedAStar
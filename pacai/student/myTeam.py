@@ -26,48 +26,33 @@ class CustomAgent(CaptureAgent):
 
     def __init__(self, index, **kwargs):
         super().__init__(index, **kwargs)
-        self.gridP = None
         self.chokeP = []
-        self.deadends = []
         self.maxx = None
         self.maxy = None
-        self.mapping = None
         self.chokepointMapping = {}
         self.mySide = []
         self.enemySide = []
         self.food = None
         self.visited = set()
 
-    def isDeadEnd(self, point):
-        adjacentActions = self.getAdjacentActions(point)
-        return len(adjacentActions) == 1
-
-    def getAdjacentActions(self, point):
-        x, y = point
-        adjacentPoints = [(x, y + 1), (x, y - 1), (x - 1, y), (x + 1, y)]
-        return [p for p in adjacentPoints if p in self.gridP]
-
-    def findDeadEnd(self, gridPoints):
-        for point in gridPoints:
-            if self.isDeadEnd(point):
-                self.deadends.append(point)
-
     def registerInitialState(self, gameState):
-    
+
         super().registerInitialState(gameState)
 
-        self.generateGridPoints(gameState)
-        self.findDeadEnd(self.gridP)
-        self.updateChokePoints(self.deadends, gameState)
+        walls = gameState.getWalls()
+        self.maxx = walls.getWidth() - 1
+        self.maxy = walls.getHeight() - 1
+
+        self.updateChokePoints(gameState)
         self.food = gameState.getFood().asList()
 
     def chooseAction(self, gameState):
         return 'Stop'
 
-    def updateChokePoints(self, deadends, gameState):
+    def updateChokePoints(self, gameState):
         self.resetVariables()
-        self.findChokePoint(deadends, gameState)
-        
+        self.findChokePoint(gameState)
+
         for position, steps, food in self.chokeP:
             if food == 0:
                 continue
@@ -93,47 +78,21 @@ class CustomAgent(CaptureAgent):
         gameState.setHighlightLocations(self.visited)
 
     def resetVariables(self):
-    
+
         self.visited.clear()
         self.chokeP = []
         self.enemySide = []
         self.mySide = []
         self.chokepointMapping = {}
 
-    def _possibleActions(self, position, visitedList):
-        x, y = position
-        adjacentPoints = [(x, y + 1), (x, y - 1), (x - 1, y), (x + 1, y)]
-        return [p for p in adjacentPoints if p in self.gridP and p not in visitedList]
-
-    def _dfs(self, curr, prev, knownGrids, visited, num_food, gameState, visitedList):
-        actions = self._possibleActions(curr, visitedList)
-        if prev is None and len(actions) != 1:
-            self._processNode(curr, visited, num_food, gameState)
-            return
-
-        for c in list(self.chokeP):
-            if c[0] == curr:
-                self.chokeP.remove(c)
-
-        visitedList.append(curr)
-        visited.append(curr)
-        num_food += gameState.hasFood(*curr)
-
-        if len(actions) != 1:
-            self._processNode(curr, visited, num_food, gameState)
-        else:
-            self._dfs(actions[0], curr, knownGrids, visited, num_food, gameState, visitedList)
-
-    def _processNode(self, curr, visited, num_food, gameState):
-        item = (curr, len(visited), num_food)
-        self.chokeP.append(item)
-
-    def findChokePoint(self, deadends, gameState):
-        visitedList = []
+    def findChokePoint(self, gameState):
+        # Every dead-end pocket of the maze is guarded by its entrance.
+        # The pockets are shared by all agents on the layout, only the food needs to be counted.
+        pockets = self.topology.getPockets()
+        foodCounts = self.topology.countPocketFood(gameState.getFood())
 
-        for d in deadends:
-            initial_food = gameState.hasFood(*d)
-            self._dfs(d, None, self.gridP, [], initial_food, gameState, visitedList)
+        for (entrance, cells, depth), food in zip(pockets, foodCounts):
+            self.chokeP.append((entrance, depth, food))
 
     def getPositionFromAction(self, position, action):
         x, y = position
@@ -148,17 +107,6 @@ class CustomAgent(CaptureAgent):
         elif action == 'Stop':
             return position
 
-    def generateGridPoints(self, gameState):
-        walls = gameState.getWalls().asList()
-        maxx, maxy = max(walls)
-    
-        self.gridP = [
-            (x, y) for x in range(maxx) for y in range(maxy)
-            if not gameState.hasWall(x, y)
-        ]
-        self.maxx = maxx
-        self.maxy = maxy
-
     def findItemInList(self, item, List):
         for elem in List:
             p, b, n = elem
@@ -184,7 +132,7 @@ class OffensiveReflexAgent(ReflexCaptureAgent, CustomAgent):
         currentFood = gameState.getFood().asList()
         if self.food != currentFood:
             self.food = currentFood
-            self.updateChokePoints(self.deadends, gameState)
+            self.updateChokePoints(gameState)
 
         actions = gameState.getLegalActions(self.index)
         values = [self.evaluate(gameState, action) for action in actions]
@@ -1,8 +1,9 @@
+from pacai.agents.learning.linear import DenseLinearQFunction
+from pacai.agents.learning.qtable import QTable
+from pacai.agents.learning.replay import ReplayBuffer
 from pacai.agents.learning.reinforcement import ReinforcementAgent
 from pacai.util import reflection
-import random
 from pacai.util.probability import flipCoin
-import util
 
 class QLearningAgent(ReinforcementAgent):
     """
@@ -25,8 +26,8 @@ class QLearningAgent(ReinforcementAgent):
     `pacai.util.probability.flipCoin`:
     Flip a coin (get a binary value) with some probability.
 
-    `random.choice`:
-    Pick randomly from a list.
+    `pacai.agents.base.BaseAgent.getRandom`:
+    The agent's source of randomness, e.g. `self.getRandom().choice` picks randomly from a list.
 
     Additional methods to implement:
 
@@ -42,27 +43,111 @@ class QLearningAgent(ReinforcementAgent):
     You should do your Q-Value update here.
     Note that you should never call this function, it will be called on your behalf.
 
+    The Q-values are kept in a `pacai.agents.learning.qtable.QTable`,
+    keyed by state fingerprints instead of whole states.
+    To cap its memory, pass qTableSize (the most Q-values to keep)
+    and qTableEviction ('lru' or 'lfu').
+    To learn over an abstraction of the states, pass fingerprint
+    (the qualified name of a function that takes a state and returns a hashable key).
+
+    To also learn from past experience, pass replaySize (the number of transitions to remember).
+    After each update, replayBatch remembered transitions are sampled and learned from again,
+    either uniformly or (with replayPrioritized) by the size of their last TD error.
+    Prioritized replays are scaled by importance sampling weights with an exponent of replayBeta
+    (1 fully corrects the bias of prioritized sampling, 0 ignores it).
+    See `pacai.agents.learning.replay.ReplayBuffer`.
+
     DESCRIPTION: <Write something here so we know what you did.>
     """
 
-    def __init__(self, index, **kwargs):
+    def __init__(self, index, qTableSize = None, qTableEviction = 'lru', fingerprint = None,
+            replaySize = None, replayBatch = 4, replayPrioritized = False, replayBeta = 0.4,
+            **kwargs):
         super().__init__(index, **kwargs)
 
+        if (qTableSize is not None):
+            qTableSize = int(qTableSize)
+
+        if (isinstance(fingerprint, str)):
+            fingerprint = reflection.qualifiedImport(fingerprint)
+
         # You can initialize Q-values here.
-        self.qValues = {}
+        self.qValues = QTable(qTableSize, qTableEviction, fingerprint)
+
+        self.replay = None
+        self.replayBatch = int(replayBatch)
+        self.replayBeta = float(replayBeta)
+        if (replaySize is not None):
+            prioritized = (str(replayPrioritized).lower() in ('1', 'true'))
+            self.replay = ReplayBuffer(int(replaySize), prioritized)
 
     def update(self, state, action, nextState, reward):
         sample = reward + self.getDiscountRate() * self.getValue(nextState)
-        self.qValues[(state, action)] = (
+        self.qValues.set(state, action,
             (1 - self.getAlpha()) * self.getQValue(state, action) + self.getAlpha() * sample)
 
+        self._replayExperience(state, action, nextState, reward)
+
+    def _compactTransition(self, state, action, nextState, reward):
+        """
+        Get a transition in the compact form that is kept in the replay buffer:
+        (state fingerprint, action, reward, (next state fingerprint, next legal actions)).
+        """
+
+        nextKey = (self.qValues.getFingerprint(nextState), tuple(self.getLegalActions(nextState)))
+        return (self.qValues.getFingerprint(state), action, reward, nextKey)
+
+    def _learnFromCompact(self, stateKey, action, reward, nextKey, weight = 1.0):
+        """
+        Do a Q-value update (with the learning rate scaled by weight) on a compact transition,
+        and return its TD error.
+        """
+
+        nextFingerprint, nextActions = nextKey
+
+        nextValue = 0.0
+        if (len(nextActions) > 0):
+            nextValue = max(self.qValues.getByKey((nextFingerprint, nextAction))
+                    for nextAction in nextActions)
+
+        qValue = self.qValues.getByKey((stateKey, action))
+        error = reward + self.getDiscountRate() * nextValue - qValue
+        self.qValues.setByKey((stateKey, action), qValue + weight * self.getAlpha() * error)
+
+        return error
+
+    def _replayExperience(self, state, action, nextState, reward):
+        """
+        Remember a transition, and then learn again from a batch of remembered ones.
+        """
+
+        if (self.replay is None or self.getAlpha() == 0.0):
+            return
+
+        self.replay.add(*self._compactTransition(state, action, nextState, reward))
+
+        slots = self.replay.sample(self.replayBatch, self.getRandom())
+        weights = self.replay.getImportanceWeights(slots, self.replayBeta)
+
+        for slot, weight in zip(slots, weights):
+            error = self._learnFromCompact(*self.replay.get(slot), weight = weight)
+            self.replay.updatePriority(slot, abs(error))
+
+    def getParameters(self):
+        return {'qValues': list(self.qValues.items())}
+
+    def setParameters(self, parameters):
+        self.qValues.clear()
+        for key, value in parameters['qValues']:
+            self.qValues.setByKey(key, value)
+
     def getQValue(self, state, action):
         """
         Get the Q-Value for a `pacai.core.gamestate.AbstractGameState`
         and `pacai.core.directions.Directions`.
         Should return 0.0 if the (state, action) pair has never been seen.
         """
-        return self.qValues.get((state, action), 0.0)
+        return self.qValues.get(state, action, 0.0)
 
     def getAction(self, state):
 
@@ -73,9 +158,9 @@ class QLearningAgent(ReinforcementAgent):
             return None
 
         # Exploration vs Exploitation decision
-        if flipCoin(self.getEpsilon()):
+        if flipCoin(self.getEpsilon(), self.getRandom()):
             # Exploration: Choose a random action
-            return random.choice(legalActions)
+            return self.getRandom().choice(legalActions)
         else:
             # Exploitation: Choose the best action based on Q-values
             return self.getPolicy(state)
@@ -116,11 +201,13 @@ class QLearningAgent(ReinforcementAgent):
         if not possibleActions:
             return None
 
-        bestValue = self.getValue(state)
-        bestActions = [action for action in
-        possibleActions if self.getQValue(state, action) == bestValue]
+        # Look up each Q-value just once.
+        qValues = [self.getQValue(state, action) for action in possibleActions]
+        bestValue = max(qValues)
+        bestActions = [possibleActions[i] for i in range(len(possibleActions))
+                if qValues[i] == bestValue]
 
-        return random.choice(bestActions)
+        return self.getRandom().choice(bestActions)
 
 class PacmanQAgent(QLearningAgent):
     """
@@ -163,29 +250,144 @@ class ApproximateQAgent(PacmanQAgent):
     `pacai.agents.learning.reinforcement.ReinforcementAgent.update`:
     Should update your weights based on transition.
 
+    If the extractor has a fixed set of features
+    (e.g. `pacai.core.featureExtractors.SimpleExtractor`),
+    then passing dense (e.g. `--agent-args dense=True`) will keep the weights in a NumPy array
+    (see `pacai.agents.learning.linear.DenseLinearQFunction`)
+    and evaluate all the legal actions of a state at once.
+
     DESCRIPTION: <Write something here so we know what you did.>
     """
 
     def __init__(self, index,
-            extractor = 'pacai.core.featureExtractors.IdentityExtractor', **kwargs):
+            extractor = 'pacai.core.featureExtractors.IdentityExtractor', dense = False,
+            **kwargs):
         super().__init__(index, **kwargs)
-        self.featExtractor = reflection.qualifiedImport(extractor)
+        self.featExtractor = reflection.qualifiedImport(extractor)()
 
         # You might want to initialize weights here.
-        self.weights = util.Counter()
+        self.weights = {}
+
+        self.qFunction = None
+        if (str(dense).lower() in ('1', 'true')):
+            self.qFunction = DenseLinearQFunction(self.featExtractor)
 
     def getQValue(self, state, action):
+        if (self.qFunction is not None):
+            return self.qFunction.getQValue(state, action, self.getLegalActions(state))
 
         features = self.featExtractor.getFeatures(state, action)
-        return sum(self.weights[feature] * value for feature, value in features.items())
+        return sum(self.weights.get(feature, 0.0) * value for feature, value in features.items())
+
+    def getValue(self, state):
+        if (self.qFunction is None):
+            return super().getValue(state)
+
+        possibleActions = self.getLegalActions(state)
+        if not possibleActions:
+            return 0.0
+
+        return float(self.qFunction.getQValues(state, possibleActions).max())
+
+    def getPolicy(self, state):
+        if (self.qFunction is None):
+            return super().getPolicy(state)
+
+        possibleActions = self.getLegalActions(state)
+        if not possibleActions:
+            return None
+
+        qValues = self.qFunction.getQValues(state, possibleActions)
+        bestValue = qValues.max()
+        bestActions = [possibleActions[i] for i in range(len(possibleActions))
+                if qValues[i] == bestValue]
+
+        return self.getRandom().choice(bestActions)
+
+    def getParameters(self):
+        return {'weights': dict(self.getWeights())}
+
+    def setParameters(self, parameters):
+        if (self.qFunction is not None):
+            self.qFunction.setWeights(parameters['weights'])
+        else:
+            self.weights = dict(parameters['weights'])
+
+    def getWeights(self):
+        """
+        Get the weights as a dict of {feature: weight}.
+        """
+
+        if (self.qFunction is not None):
+            return self.qFunction.getWeights()
+
+        return self.weights
 
     def update(self, state, action, nextState, reward):
+        difference = ((reward + self.getDiscountRate() * self.getValue(nextState))
+                - self.getQValue(state, action))
+
+        if (self.qFunction is not None):
+            self.qFunction.update(state, action, self.getLegalActions(state),
+                    self.getAlpha() * difference)
+        else:
+            features = self.featExtractor.getFeatures(state, action)
+            for feature, value in features.items():
+                self.weights[feature] = (self.weights.get(feature, 0.0)
+                        + self.getAlpha() * difference * value)
+
+        self._replayExperience(state, action, nextState, reward)
+
+    def _compactTransition(self, state, action, nextState, reward):
+        """
+        Transitions are remembered by their features:
+        (features, action, reward, features of each next legal action).
+        With dense features, these are a vector and a matrix.
+        """
+
+        nextActions = self.getLegalActions(nextState)
+
+        if (self.qFunction is not None):
+            actions = self.getLegalActions(state)
+            features = self.qFunction.getFeatureMatrix(state, actions)[actions.index(action)]
+            nextFeatures = None
+            if (len(nextActions) > 0):
+                nextFeatures = self.qFunction.getFeatureMatrix(nextState, nextActions)
+
+            return (features, action, reward, nextFeatures)
 
-        difference = (reward + self.getDiscountRate() * self.getValue(nextState))
-        - self.getQValue(state, action)
         features = self.featExtractor.getFeatures(state, action)
+        nextFeatures = tuple(self.featExtractor.getFeatures(nextState, nextAction)
+                for nextAction in nextActions)
+
+        return (features, action, reward, nextFeatures)
+
+    def _learnFromCompact(self, features, action, reward, nextFeatures, weight = 1.0):
+        if (self.qFunction is not None):
+            nextValue = 0.0
+            if (nextFeatures is not None):
+                nextValue = float(self.qFunction.evaluate(nextFeatures).max())
+
+            error = (reward + self.getDiscountRate() * nextValue
+                    - float(self.qFunction.evaluate(features)))
+            self.qFunction.updateFeatures(features, weight * self.getAlpha() * error)
+
+            return error
+
+        nextValue = 0.0
+        if (len(nextFeatures) > 0):
+            nextValue = max(self._dotWeights(nextActionFeatures)
+                    for nextActionFeatures in nextFeatures)
+
+        error = reward + self.getDiscountRate() * nextValue - self._dotWeights(features)
         for feature, value in features.items():
-            self.weights[feature] += self.getAlpha() * difference * value
+            self.weights[feature] = (self.weights.get(feature, 0.0)
+                    + weight * self.getAlpha() * error * value)
+
+        return error
+
+    def _dotWeights(self, features):
+        return sum(self.weights.get(feature, 0.0) * value for feature, value in features.items())
 
     def final(self, state):
         """
@@ -197,4 +399,4 @@ class ApproximateQAgent(PacmanQAgent):
         if self.episodesSoFar == self.numTraining:
             # You might want to print your weights here for debugging.
             # *** Your Code Here ***
-            print(self.weights)
+            print(self.getWeights())
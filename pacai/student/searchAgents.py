@@ -11,6 +11,7 @@ from .search import breadthFirstSearch
 from pacai.core import distance
 from pacai.core.directions import Directions
 from pacai.core.actions import Actions
+from pacai.core.nearestFood import NearestFoodMap
 from pacai.core.search.position import PositionSearchProblem
 from pacai.core.search.problem import SearchProblem
 from pacai.agents.base import BaseAgent
@@ -214,13 +215,17 @@ class ClosestDotSearchAgent(SearchAgent):
     def __init__(self, index, **kwargs):
         super().__init__(index, **kwargs)
 
+        # The closest food to every position, kept up to date as the planned path eats food.
+        self._foodMap = None
+
     def registerInitialState(self, state):
         self._actions = []
         self._actionIndex = 0
 
         currentState = state
+        self._foodMap = NearestFoodMap(state.getWalls(), state.getFood())
 
-        while (currentState.getFood().count() > 0):
+        while (currentState.getNumFood() > 0):
             nextPathSegment = self.findPathToClosestDot(currentState)  # The missing piece
             self._actions += nextPathSegment
 
@@ -232,6 +237,12 @@ class ClosestDotSearchAgent(SearchAgent):
 
                 currentState = currentState.generateSuccessor(0, action)
 
+                position = currentState.getPacmanPosition()
+                if (self._foodMap.hasFood(position) and not currentState.hasFood(*position)):
+                    self._foodMap.removeFood(position)
+
+        self._foodMap = None
+
         logging.info('Path found with cost %d.' % len(self._actions))
 
     def findPathToClosestDot(self, gameState):
@@ -246,6 +257,12 @@ class ClosestDotSearchAgent(SearchAgent):
         # problem = AnyFoodSearchProblem(gameState)
 
         # *** Your Code Here ***
+        if (self._foodMap is not None):
+            # The map is kept in sync with the food while planning in registerInitialState.
+            path = self._foodMap.getPath(gameState.getPacmanPosition())
+            if (path is not None):
+                return path
+
         problem = AnyFoodSearchProblem(gameState)
 
         return breadthFirstSearch(problem)
@@ -1,5 +1,16 @@
+import heapq
+import itertools
+
 from pacai.agents.learning.value import ValueEstimationAgent
 
+SWEEP_SYNCHRONOUS = 'sync'
+SWEEP_GAUSS_SEIDEL = 'gauss-seidel'
+SWEEP_PRIORITIZED = 'prioritized'
+SWEEPS = [SWEEP_SYNCHRONOUS, SWEEP_GAUSS_SEIDEL, SWEEP_PRIORITIZED]
+
+# The tolerance that prioritized sweeping uses when none is given.
+DEFAULT_PRIORITIZED_TOLERANCE = 1e-6
+
 class ValueIterationAgent(ValueEstimationAgent):
     """
     A value iteration agent.
@@ -28,11 +39,24 @@ class ValueIterationAgent(ValueEstimationAgent):
     You may break ties any way you see fit.
     Note that if there are no legal actions, which is the case at the terminal state,
     you should return None.
+
+    By default, exactly iters synchronous sweeps are done.
+    If a tolerance is given, then iteration stops early
+    once no state's value changed by more than the tolerance (the Bellman residual).
+    The sweep can also be:
+    'gauss-seidel', which updates values in place (so later states in a sweep see the new values),
+    or 'prioritized' (prioritized sweeping), which only backs up states whose successors changed,
+    largest change first, for at most (iters * number of states) backups.
+    The number of single state backups that were done is kept in numBackups.
     """
 
-    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, **kwargs):
+    def __init__(self, index, mdp, discountRate = 0.9, iters = 100, tolerance = None,
+            sweep = SWEEP_SYNCHRONOUS, **kwargs):
         super().__init__(index, **kwargs)
 
+        if (sweep not in SWEEPS):
+            raise ValueError('Unknown sweep: "%s". Expected one of: %s.' % (sweep, SWEEPS))
+
         self.mdp = mdp
         self.discountRate = discountRate
         self.iters = iters
@@ -44,21 +68,115 @@ class ValueIterationAgent(ValueEstimationAgent):
         self.iters = iters
         self.values = {}  # A dictionary which holds the values for each state.
 
+        self.tolerance = tolerance
+        self.sweep = sweep
+        self.numBackups = 0
+
         # Start all states at zero
         for state in self.mdp.getStates():
             self.values[state] = 0.0
 
+        if (sweep == SWEEP_PRIORITIZED):
+            self._runPrioritizedSweeping()
+            return
+
         # Run value iteration
+        forwardStates = self.mdp.getStates()
+        backwardStates = list(reversed(forwardStates))
         for i in range(self.iters):
-            new_values = {}
-            for state in self.mdp.getStates():
-                if not self.mdp.getPossibleActions(state):
-                    new_values[state] = 0.0
-                else:
-                    new_values[state] = max(self.getQValue(state, action)
-                                            for action in self.mdp.getPossibleActions(state))
+            states = forwardStates
+            if (sweep == SWEEP_GAUSS_SEIDEL):
+                new_values = self.values
+
+                # Alternate the direction of the sweeps,
+                # so new values flow quickly in both directions.
+                if (i % 2 == 1):
+                    states = backwardStates
+            else:
+                new_values = {}
+
+            residual = 0.0
+            for state in states:
+                value = self._backup(state)
+                residual = max(residual, abs(value - self.values[state]))
+                new_values[state] = value
             self.values = new_values
 
+            if (self.tolerance is not None and residual <= self.tolerance):
+                break
+
+    def _backup(self, state):
+        """
+        Get the new value of a state: the best Q-value under the current values.
+        """
+
+        self.numBackups += 1
+
+        actions = self.mdp.getPossibleActions(state)
+        if not actions:
+            return 0.0
+
+        return max(self.getQValue(state, action) for action in actions)
+
+    def _runPrioritizedSweeping(self):
+        """
+        Keep a priority queue of states, keyed by (a bound on) how much their value could change.
+        Back up the state with the highest priority,
+        and then raise the priority of each of its predecessors
+        (the only states whose values that change can affect) by:
+        `discount * max_{action} P(state | predecessor, action) * change`.
+        """
+
+        tolerance = self.tolerance
+        if (tolerance is None):
+            tolerance = DEFAULT_PRIORITIZED_TOLERANCE
+
+        states = self.mdp.getStates()
+
+        # {state: {predecessor: the highest probability of moving from it to state, ...}, ...}
+        predecessors = {state: {} for state in states}
+        for state in states:
+            for action in self.mdp.getPossibleActions(state):
+                for nextState, prob in self.mdp.getTransitionStatesAndProbs(state, action):
+                    if (prob > predecessors[nextState].get(state, 0.0)):
+                        predecessors[nextState][state] = prob
+
+        # {state: current priority, ...}, queue entries that do not match this are stale.
+        priorities = {}
+        queue = []
+
+        # Breaks ties in the queue (so states never get compared).
+        counter = itertools.count()
+
+        # Start with the exact change of every state.
+        for state in states:
+            self._raisePriority(state, abs(self._backup(state) - self.values[state]), tolerance,
+                    priorities, queue, counter)
+
+        maxBackups = self.iters * len(states)
+        while (len(queue) > 0 and self.numBackups < maxBackups):
+            priority, order, state = heapq.heappop(queue)
+            if (priorities.get(state) != -priority):
+                continue
+
+            del priorities[state]
+
+            value = self._backup(state)
+            change = abs(value - self.values[state])
+            self.values[state] = value
+
+            for predecessor, prob in predecessors[state].items():
+                self._raisePriority(predecessor, self.discountRate * prob * change, tolerance,
+                        priorities, queue, counter)
+
+    def _raisePriority(self, state, amount, tolerance, priorities, queue, counter):
+        priority = priorities.get(state, 0.0) + amount
+        if (priority <= tolerance):
+            return
+
+        priorities[state] = priority
+        heapq.heappush(queue, (-priority, next(counter), state))
+
     def getQValue(self, state, action):
         q_value = 0
         for nextState, prob in self.mdp.getTransitionStatesAndProbs(state, action):
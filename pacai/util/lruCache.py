@@ -0,0 +1,72 @@
+"""
+A least-recently-used cache container.
+"""
+
+import collections
+
+class LRUCache(object):
+    """
+    A dict-like container that holds at most a fixed number of items.
+    When the cache is full, adding a new item will evict the item that was least recently used
+    (either added or fetched).
+    """
+
+    def __init__(self, capacity):
+        if (capacity < 1):
+            raise ValueError('An LRU cache must have a positive capacity, got %d.' % (capacity))
+
+        self.capacity = capacity
+        self.items = collections.OrderedDict()
+
+    def clear(self):
+        self.items.clear()
+
+    def get(self, key, default = None):
+        """
+        Get the item stored under the key (marking it as recently used),
+        or the default if the key is not in the cache.
+        """
+
+        if (key not in self.items):
+            return default
+
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def keys(self):
+        """
+        Get the keys in the cache, ordered from least to most recently used.
+        """
+
+        return list(self.items.keys())
+
+    def pop(self, key, default = None):
+        """
+        Remove the item stored under the key and return it,
+        or the default if the key is not in the cache.
+        """
+
+        return self.items.pop(key, default)
+
+    def put(self, key, value):
+        """
+        Store the item under the key.
+        Returns the (key, value) pair that was evicted to make room, or None.
+        """
+
+        if (key in self.items):
+            self.items.move_to_end(key)
+            self.items[key] = value
+            return None
+
+        self.items[key] = value
+        if (len(self.items) <= self.capacity):
+            return None
+
+        return self.items.popitem(last = False)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
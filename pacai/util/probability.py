@@ -2,9 +2,16 @@
 Various utilities for working with probabilities and distributions.
 """
 
+import functools
 import math
 import random
 
+# How many alias tables `getAliasTable` keeps around.
+ALIAS_CACHE_SIZE = 1024
+
+# nSample draws this many (or more) samples at once with NumPy.
+BATCH_SAMPLE_SIZE = 256
+
 def normalize(listOrDict):
     """
     Normalize a list or dictionary by dividing each value by the
@@ -31,11 +38,23 @@ def normalize(listOrDict):
 
         return [val / total for val in listOrDict]
 
-def nSample(distribution, values, n):
+def nSample(distribution, values, n, rng = None):
+    """
+    Draw n samples from a distribution.
+    All of the sampling functions draw from rng if it is given (e.g. a `random.Random`),
+    and from the global `random` module otherwise.
+    """
+
+    if (rng is None):
+        rng = random
+
     if not math.isclose(sum(distribution), 1):
         distribution = normalize(distribution)
 
-    rand = [random.random() for i in range(n)]
+    if (n >= BATCH_SAMPLE_SIZE):
+        return _nSampleBatch(distribution, values, n, rng)
+
+    rand = [rng.random() for i in range(n)]
     rand.sort()
     samples = []
     samplePos, distPos, cdf = 0, 0, distribution[0]
@@ -49,7 +68,7 @@ def nSample(distribution, values, n):
 
     return samples
 
-def sample(distribution, values = None):
+def sample(distribution, values = None, rng = None):
     if isinstance(distribution, dict):
         items = sorted(distribution.items())
         distribution = [i[1] for i in items]
@@ -67,7 +86,10 @@ def sample(distribution, values = None):
     if len(distribution) != len(values):
         raise ValueError("When sampling list, distribution and values must be the same size.")
 
-    choice = random.random()
+    if (rng is None):
+        rng = random
+
+    choice = rng.random()
     i = 0
     total = distribution[0]
 
@@ -77,6 +99,127 @@ def sample(distribution, values = None):
 
     return values[i]
 
+def _nSampleBatch(distribution, values, n, rng):
+    """
+    nSample, but with all the samples drawn (and sorted) at once by NumPy.
+    NumPy gets its own generator, seeded from rng, so seeded runs stay reproducible.
+    """
+
+    # NumPy is only needed for large batches, so only import it when they are drawn.
+    import numpy
+
+    generator = numpy.random.default_rng(rng.getrandbits(64))
+
+    cdf = numpy.cumsum(numpy.asarray(distribution, dtype = float))
+    rand = numpy.sort(generator.random(n) * cdf[-1])
+
+    indexes = numpy.searchsorted(cdf, rand, side = 'right')
+    numpy.minimum(indexes, len(values) - 1, out = indexes)
+
+    return [values[i] for i in indexes.tolist()]
+
+class AliasTable(object):
+    """
+    A discrete distribution that is set up (in O(n)) to be sampled in O(1),
+    using Vose's alias method.
+
+    Each of the n columns of the table holds the probability of keeping that column's value,
+    and another value (the alias) to use otherwise.
+    A sample is then a single uniform draw: pick a column, then keep it or take its alias.
+    """
+
+    def __init__(self, distribution, values):
+        if (len(distribution) == 0):
+            raise ValueError("Distribution to sample must be non-empty.")
+
+        if (len(distribution) != len(values)):
+            raise ValueError("When sampling list, distribution and values must be the same size.")
+
+        total = float(sum(distribution))
+        if (total <= 0):
+            raise ValueError("Distribution to sample must have a positive sum.")
+
+        n = len(distribution)
+        scaled = [prob * n / total for prob in distribution]
+
+        self.values = list(values)
+        self.keep = [1.0] * n
+        self.aliases = list(range(n))
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+
+        while (len(small) > 0 and len(large) > 0):
+            less = small.pop()
+            more = large.pop()
+
+            self.keep[less] = scaled[less]
+            self.aliases[less] = more
+
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if (scaled[more] < 1.0):
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Anything left over is only off from 1.0 by rounding, so it always keeps its value.
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample(self, rng = None):
+        """
+        Draw a single sample, from rng (e.g. a `random.Random`) or the global `random` module.
+        """
+
+        if (rng is None):
+            rng = random
+
+        # One draw picks both the column (the integer part) and whether to keep it (the rest).
+        choice = rng.random() * len(self.values)
+        column = int(choice)
+
+        if (choice - column < self.keep[column]):
+            return self.values[column]
+
+        return self.values[self.aliases[column]]
+
+def getAliasTable(distribution, values = None):
+    """
+    Get an `AliasTable` for a distribution (a dict or a list with values, like `sample`).
+    Recently used tables are cached, so sampling the same distribution over and over
+    (e.g. a ghost's moves) only builds its table once.
+    Unlike `sample`, the values of a dict are not sorted first,
+    so the same seed can draw different values from the two.
+    """
+
+    if isinstance(distribution, dict):
+        items = tuple(distribution.items())
+    else:
+        if values is None:
+            raise ValueError("When sampling list, both distribution and values must be "
+                    + "initialized.")
+
+        if len(distribution) != len(values):
+            raise ValueError("When sampling list, distribution and values must be the same size.")
+
+        items = tuple(zip(values, distribution))
+
+    try:
+        hash(items)
+    except TypeError:
+        # Unhashable values cannot be cached.
+        return _buildAliasTable(items)
+
+    return _getCachedAliasTable(items)
+
+def _buildAliasTable(items):
+    return AliasTable([item[1] for item in items], [item[0] for item in items])
+
+@functools.lru_cache(maxsize = ALIAS_CACHE_SIZE)
+def _getCachedAliasTable(items):
+    return _buildAliasTable(items)
+
 def getProbability(value, distribution, values):
     """
     Gives the probability of a value under a discrete distribution
@@ -90,6 +233,9 @@ def getProbability(value, distribution, values):
 
     return total
 
-def flipCoin(p):
-    r = random.random()
+def flipCoin(p, rng = None):
+    if (rng is None):
+        rng = random
+
+    r = rng.random()
     return r < p
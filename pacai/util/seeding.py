@@ -0,0 +1,47 @@
+"""
+Independent random streams derived from a single master seed.
+
+When every agent (and the game itself) draws from the global `random` module,
+what any one of them sees depends on everything else that drew before it.
+So a game can only be reproduced by replaying every draw in exactly the same order,
+which falls apart as soon as games are played in different processes.
+
+Instead, each game and each agent in a game can get its own `random.Random` stream,
+derived from the master seed and a name (e.g. ('game', 3, 'agent', 1)).
+A stream only depends on the master seed and its name,
+so the same game plays out the same way no matter where (or in what order) it is run.
+"""
+
+import random
+
+def deriveSeed(seed, *names):
+    """
+    Get a 64-bit seed for the stream with the given names.
+    The names can be any values with a stable repr (numbers, strings, tuples).
+    Like `pacai.util.zobrist`, this does not use the global random state,
+    so it is the same in every process and every run.
+    """
+
+    return random.Random(repr((seed,) + names)).getrandbits(64)
+
+def getStream(seed, *names):
+    """
+    Get a new `random.Random` for the stream with the given names (see `deriveSeed`).
+    """
+
+    return random.Random(deriveSeed(seed, *names))
+
+def seedGame(seed, gameIndex, agents):
+    """
+    Give every agent in a game its own stream (see `pacai.agents.base.BaseAgent.setRandom`),
+    and reseed the global random state for anything that still uses it.
+    Returns the stream for the game itself (e.g. for the game rules).
+    """
+
+    for agent in agents:
+        if (agent is not None and hasattr(agent, 'setRandom')):
+            agent.setRandom(getStream(seed, 'game', gameIndex, 'agent', agent.index))
+
+    random.seed(deriveSeed(seed, 'game', gameIndex, 'global'))
+
+    return getStream(seed, 'game', gameIndex)
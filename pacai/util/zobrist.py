@@ -0,0 +1,29 @@
+"""
+Zobrist hashing.
+
+A Zobrist hash gives each feature of a state (e.g. "food at (3, 4)") its own random 64-bit key,
+and fingerprints the state as the XOR of the keys of all its features.
+Since XOR is its own inverse, a fingerprint can be updated in constant time
+as features are added or removed (e.g. food is eaten).
+
+The keys are derived from the features themselves (not from the global random state),
+so fingerprints are the same in every process and every run.
+"""
+
+import random
+
+# {feature: key, ...}
+_keys = {}
+
+def getKey(*feature):
+    """
+    Get the 64-bit key for a feature.
+    The feature can be any combination of values with a stable repr (numbers, strings, tuples).
+    """
+
+    key = _keys.get(feature)
+    if (key is None):
+        key = random.Random(repr(feature)).getrandbits(64)
+        _keys[feature] = key
+
+    return key
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from pacai.bin.gridworld import GridworldEnvironment
+from pacai.bin.gridworld import _getGridWorld
+from pacai.core.batchEnvironment import BatchEnvironment
+from pacai.student.qlearningAgents import QLearningAgent
+
+"""
+Test running several environments at once.
+"""
+class BatchEnvironmentTest(unittest.TestCase):
+    def test_episodes(self):
+        random.seed(0)
+
+        mdp = _getGridWorld('BookGrid')
+        agent = QLearningAgent(0, actionFn = mdp.getPossibleActions, numTraining = 50,
+                epsilon = 0.5, alpha = 0.5, gamma = 0.9)
+
+        batch = BatchEnvironment([GridworldEnvironment(mdp) for i in range(8)])
+
+        finished = []
+        returns = batch.run(agent, numEpisodes = 50, discount = 0.9,
+                callback = lambda episode, episodeReturns: finished.append(episode))
+
+        # Exactly the requested episodes, even though the batch does not divide them evenly.
+        self.assertEqual(50, len(returns))
+        self.assertEqual(list(range(1, 51)), finished)
+        self.assertEqual(50, agent.episodesSoFar)
+        self.assertTrue(agent.isInTesting())
+
+        # The agent learned from all of the environments.
+        self.assertTrue(agent.getValue(mdp.getStartState()) > 0.0)
+        self.assertEqual('exit', agent.getPolicy((3, 2)))
+
+    def test_steps(self):
+        mdp = _getGridWorld('BookGrid')
+
+        class RandomAgent(object):
+            def __init__(self):
+                self.numActions = 0
+
+            def getAction(self, state):
+                self.numActions += 1
+                return random.choice(mdp.getPossibleActions(state))
+
+        agent = RandomAgent()
+        batch = BatchEnvironment([GridworldEnvironment(mdp) for i in range(3)])
+        batch.run(agent, numSteps = 10)
+
+        self.assertEqual(30, agent.numActions)
+
+        with self.assertRaises(ValueError):
+            batch.run(agent)
+
+        with self.assertRaises(ValueError):
+            BatchEnvironment([])
+
+    def test_recording(self):
+        mdp = _getGridWorld('BookGrid')
+        agent = QLearningAgent(0, actionFn = mdp.getPossibleActions)
+        batch = BatchEnvironment([GridworldEnvironment(mdp) for i in range(2)])
+
+        # A recording is replayed as a single episode, so batches cannot be recorded.
+        agent.startRecording()
+        with self.assertRaises(ValueError):
+            batch.run(agent, numSteps = 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 import unittest
 
 from pacai.bin import capture
+from pacai.bin import crawler
+from pacai.bin import eightpuzzle
 from pacai.bin import gridworld
+from pacai.bin import mdpbench
 from pacai.bin import pacman
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.layout import getLayout
+from pacai.student.qlearningAgents import PacmanQAgent
 
 """
 This is a test class to assess the executables of this project.
@@ -41,10 +47,54 @@ class BinTest(unittest.TestCase):
             if status.code != 0:
                 self.fail("Error occured when running --help.")
 
+    def test_crawler_headless(self):
+        crawler.main(['crawler', '--headless', '--steps', '1000', '--seed', '1'])
+        crawler.main(['crawler', '--headless', '500', '--batch-size', '3'])
+
+        with self.assertRaises(ValueError):
+            crawler.main(['crawler', '--headless'])
+
+    def test_eightpuzzle(self):
+        # Solve a random eight puzzle with a memory-bounded search.
+        eightpuzzle.main(['--skip-steps', '--seed', '1234',
+                '--search', 'smastar', '--memory-limit', '1000'])
+
+        # Raise exception for a memory limit on a search that does not use one.
+        try:
+            eightpuzzle.main(['--skip-steps', '--memory-limit', '1000'])
+            self.fail("Test did not raise expected exception.")
+        except ValueError:
+            # Expected exception.
+            pass
+
+    def test_eightpuzzle_help(self):
+        # Show all eight puzzle arguments.
+        try:
+            eightpuzzle.main(['--help'])
+        except SystemExit as status:
+            if status.code != 0:
+                self.fail("Error occured when running --help.")
+
     def test_gridworld(self):
         # Run game of gridworld with default agents.
         gridworld.main(['--null-graphics'])
 
+        # Run gridworld with the matrix value iteration agent.
+        gridworld.main(['--null-graphics', '-a', 'matrix', '-k', '2'])
+        gridworld.main(['--null-graphics', '-a', 'policy', '-k', '2'])
+        gridworld.main(['--null-graphics', '-a', 'policy', '-k', '2', '--evaluation-sweeps', '5',
+                '--tolerance', '1e-6'])
+        gridworld.main(['--null-graphics', '-a', 'policy', '-k', '2', '-y', '1.0',
+                '-g', 'MazeGrid'])
+        agent = gridworld.main(['--null-graphics', '-a', 'q', '-k', '10', '--batch-size', '4'])
+        self.assertEqual(10, agent.numTraining)
+
+        # Episodes that are not batched keep the default number of training episodes.
+        agent = gridworld.main(['--null-graphics', '-a', 'q', '-k', '10'])
+        self.assertEqual(100, agent.numTraining)
+        gridworld.main(['--null-graphics', '-a', 'value', '-k', '2', '--sweep', 'prioritized',
+                '--tolerance', '0.001'])
+
     def test_gridworld_help(self):
         # Show all gridworld arguments.
         try:
@@ -53,6 +103,17 @@ class BinTest(unittest.TestCase):
             if status.code != 0:
                 self.fail("Error occured when running --help.")
 
+    def test_mdpbench(self):
+        rows = mdpbench.main(['--sizes', '5,8x3', '--time-limit', '60'])
+        self.assertEqual(2 * len(mdpbench.AGENTS), len(rows))
+
+        for row in rows:
+            self.assertIsInstance(row['seconds'], float)
+
+    def test_pacman_directional_ghosts(self):
+        pacman.main(['-p', 'GreedyAgent', '-g', 'DirectionalGhost', '--ghost-args', 'distance=maze',
+                '--null-graphics', '--seed', '1234'])
+
     def test_seeded_runs(self):
         # Run game of capture with seed entry.
         capture.main(['--null-graphics', '--seed', '1234'])
@@ -60,6 +121,41 @@ class BinTest(unittest.TestCase):
         # Run game of pacman with seed value entry.
         pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--seed', '1234'])
 
+    def test_pacman_parallel_training(self):
+        # Train a learning agent on worker processes, then play a test game.
+        args = ['-p', 'PacmanQAgent', '-l', 'smallGrid', '--null-graphics', '--seed', '1234',
+                '--num-training', '12', '-n', '13']
+        games = pacman.main(args + ['--num-workers', '2'])
+        self.assertEqual(1, len(games))
+
+        # Training is deterministic for a given seed and number of workers.
+        otherGames = pacman.main(args + ['--num-workers', '2'])
+        self.assertEqual(games[0].moveHistory, otherGames[0].moveHistory)
+
+    def test_pacman_replay_episode(self):
+        # A replayed episode ends through final(), just like a game the agent played itself.
+        class CountingAgent(PacmanQAgent):
+            def final(self, state):
+                super().final(state)
+                self.finalScores.append(state.getScore())
+
+        transitions = []
+        state = PacmanGameState(getLayout('smallGrid'))
+        for i in range(3):
+            action = state.getLegalActions(0)[0]
+            nextState = state.generateSuccessor(0, action)
+            transitions.append((state, action, nextState, nextState.getScore() - state.getScore()))
+            state = nextState
+
+        agent = CountingAgent(0, numTraining = 1)
+        agent.finalScores = []
+        agent.replayEpisode(transitions)
+
+        self.assertEqual([state.getScore()], agent.finalScores)
+        self.assertEqual(1, agent.episodesSoFar)
+        self.assertEqual(state.getScore(), agent.lastWindowAccumRewards)
+        self.assertEqual(0.0, agent.epsilon)
+
     def test_capture_seeded_maze_generations(self):
         # Run game of capture with random generated map without seed value.
         capture.main(['--null-graphics', '--layout', 'RANDOM']) 
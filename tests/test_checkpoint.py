@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from pacai.agents.learning.checkpoint import checkAgent
+from pacai.agents.learning.checkpoint import loadAgent
+from pacai.agents.learning.checkpoint import saveAgent
+from pacai.bin import gridworld
+from pacai.bin import pacman
+from pacai.agents.learning.reinforcement import ReinforcementAgent
+from pacai.student.qlearningAgents import ApproximateQAgent
+from pacai.student.qlearningAgents import QLearningAgent
+
+EXTRACTOR = 'pacai.core.featureExtractors.SimpleExtractor'
+
+"""
+Test saving and loading what learning agents have learned.
+"""
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempDir.cleanup)
+
+        self.path = os.path.join(tempDir.name, 'agent.ckpt')
+
+    def test_q_values(self):
+        agent = QLearningAgent(0, actionFn = lambda state: ['north', 'south'])
+        agent.qValues.set((1, 1), 'north', 0.5)
+        agent.qValues.set((1, 2), 'south', -2.0)
+        saveAgent(agent, self.path)
+
+        loaded = QLearningAgent(0, actionFn = lambda state: ['north', 'south'])
+        loadAgent(loaded, self.path)
+
+        self.assertEqual(0.5, loaded.getQValue((1, 1), 'north'))
+        self.assertEqual(-2.0, loaded.getQValue((1, 2), 'south'))
+        self.assertEqual(0.0, loaded.getQValue((1, 1), 'south'))
+
+    def test_weights(self):
+        agent = ApproximateQAgent(0, extractor = EXTRACTOR)
+        agent.weights = {'bias': 1.5, 'eats-food': 10.0}
+        saveAgent(agent, self.path)
+
+        # Weights can be loaded into either representation.
+        loaded = ApproximateQAgent(0, extractor = EXTRACTOR)
+        loadAgent(loaded, self.path)
+        self.assertEqual(agent.weights, loaded.getWeights())
+
+        dense = ApproximateQAgent(0, extractor = EXTRACTOR, dense = True)
+        loadAgent(dense, self.path)
+        self.assertEqual(1.5, dense.getWeights()['bias'])
+        self.assertEqual(10.0, dense.getWeights()['eats-food'])
+        self.assertEqual(0.0, dense.getWeights()['closest-food'])
+
+    def test_bad_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a checkpoint')
+
+        with self.assertRaises(Exception):
+            loadAgent(QLearningAgent(0), self.path)
+
+    def test_unsupported_agents(self):
+        class ForgetfulAgent(ReinforcementAgent):
+            def getAction(self, state):
+                return None
+
+            def getPolicy(self, state):
+                return None
+
+            def getQValue(self, state, action):
+                return 0.0
+
+            def getValue(self, state):
+                return 0.0
+
+            def update(self, state, action, nextState, reward):
+                pass
+
+        # Agents that do not override getParameters cannot be saved (or loaded).
+        with self.assertRaises(ValueError):
+            checkAgent(ForgetfulAgent(0))
+
+        with self.assertRaises(NotImplementedError):
+            saveAgent(ForgetfulAgent(0), self.path)
+
+        checkAgent(QLearningAgent(0))
+
+        # Checkpoints can only be loaded into the same class of agent.
+        saveAgent(QLearningAgent(0), self.path)
+        with self.assertRaises(ValueError):
+            loadAgent(ApproximateQAgent(0, extractor = EXTRACTOR), self.path)
+
+    def test_pacman(self):
+        pacman.main(['-p', 'PacmanQAgent', '-l', 'smallGrid', '--null-graphics',
+                '--num-training', '4', '-n', '4', '--checkpoint-every', '2',
+                '--save-agent', self.path])
+        self.assertTrue(os.path.isfile(self.path))
+
+        pacman.main(['-p', 'PacmanQAgent', '-l', 'smallGrid', '--null-graphics',
+                '--load-agent', self.path])
+
+        with self.assertRaises(ValueError):
+            pacman.main(['-p', 'GreedyAgent', '--null-graphics', '--load-agent', self.path])
+
+    def test_gridworld(self):
+        gridworld.main(['--null-graphics', '-a', 'q', '-k', '4', '--save-agent', self.path])
+        self.assertTrue(os.path.isfile(self.path))
+
+        gridworld.main(['--null-graphics', '-a', 'q', '-k', '1', '--load-agent', self.path])
+
+if __name__ == '__main__':
+    unittest.main()
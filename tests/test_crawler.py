@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from pacai.core.crawler import CrawlingRobot
+from pacai.core.crawler import CrawlingRobotEnvironment
+
+"""
+Test the (headless) crawler.
+"""
+class CrawlerTest(unittest.TestCase):
+    def test_moves(self):
+        random.seed(0)
+
+        environment = CrawlingRobotEnvironment()
+        robot = CrawlingRobot()
+        robot.setAngles(*environment.crawlingRobot.getAngles())
+
+        self.assertEqual((4, 6), environment.getCurrentState())
+        self.assertEqual(['arm-down', 'arm-up', 'hand-down', 'hand-up'],
+                environment.getPossibleActions((4, 6)))
+        self.assertEqual(['arm-up', 'hand-up'], environment.getPossibleActions((0, 0)))
+
+        # The precomputed moves drag the robot just as far as working out the trig each time.
+        for i in range(500):
+            action = random.choice(environment.getPossibleActions(environment.getCurrentState()))
+            (armBucket, handBucket), reward = environment.doAction(action)
+
+            oldX = robot.getRobotPosition()[0]
+            if (action.startswith('arm')):
+                robot.moveArm(environment.armBuckets[armBucket])
+            else:
+                robot.moveHand(environment.handBuckets[handBucket])
+
+            self.assertAlmostEqual(robot.getRobotPosition()[0] - oldX, reward)
+            self.assertAlmostEqual(robot.getRobotPosition()[0],
+                    environment.crawlingRobot.getRobotPosition()[0])
+
+        self.assertEqual(100, len(environment.crawlingRobot.positions))
+
+        with self.assertRaises(ValueError):
+            environment.reset()
+            environment.doAction('fly')
+
+if __name__ == '__main__':
+    unittest.main()
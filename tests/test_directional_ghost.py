@@ -0,0 +1,55 @@
+import unittest
+
+from pacai.agents.ghost.directional import DirectionalGhost
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.layout import Layout
+
+# Pacman is closer to the west by manhattan distance, but the only way to him is to the east.
+DETOUR_LAYOUT = [
+    '%%%%%%%',
+    '%P    %',
+    '%%%%% %',
+    '%  G  %',
+    '%%%%%%%',
+]
+
+"""
+Test the table driven directional ghost.
+"""
+class DirectionalGhostTest(unittest.TestCase):
+    def test_distances(self):
+        state = PacmanGameState(Layout(DETOUR_LAYOUT))
+
+        dist = DirectionalGhost(1).getDistribution(state)
+        self.assertAlmostEqual(0.9, dist[Directions.WEST])
+        self.assertAlmostEqual(0.1, dist[Directions.EAST])
+
+        dist = DirectionalGhost(1, distance = 'maze').getDistribution(state)
+        self.assertAlmostEqual(0.1, dist[Directions.WEST])
+        self.assertAlmostEqual(0.9, dist[Directions.EAST])
+
+        with self.assertRaises(ValueError):
+            DirectionalGhost(1, distance = 'euclidean')
+
+    def test_table(self):
+        state = PacmanGameState(Layout(DETOUR_LAYOUT))
+        ghost = DirectionalGhost(1, prob_attack = '0.5')
+
+        dist = ghost.getDistribution(state)
+        self.assertAlmostEqual(0.75, dist[Directions.WEST])
+
+        # The same situation in a different state is just a lookup.
+        self.assertIs(dist, ghost.getDistribution(state.generateSuccessor(0, Directions.STOP)))
+
+        # Pacman moving is a new situation.
+        otherDist = ghost.getDistribution(state.generateSuccessor(0, Directions.EAST))
+        self.assertIsNot(dist, otherDist)
+
+        # Tables are for a single layout.
+        otherDist = ghost.getDistribution(PacmanGameState(Layout(DETOUR_LAYOUT)))
+        self.assertIsNot(dist, otherDist)
+        self.assertEqual(dist, otherDist)
+
+if __name__ == '__main__':
+    unittest.main()
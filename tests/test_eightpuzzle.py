@@ -0,0 +1,132 @@
+import os
+import random
+import tempfile
+import unittest
+
+from pacai.bin.eightpuzzle import EightPuzzleSearchProblem
+from pacai.bin.eightpuzzle import EightPuzzleState
+from pacai.bin.eightpuzzle import FifteenPuzzleState
+from pacai.bin.eightpuzzle import countReachableStates
+from pacai.bin.eightpuzzle import createRandomEightPuzzle
+from pacai.bin.eightpuzzle import loadEightPuzzle
+from pacai.core.search import bounded
+from pacai.core.search import search
+from pacai.core.search.patterndb import buildPatternDatabase
+from pacai.core.search.patterndb import loadPatternDatabase
+
+"""
+Test the eight puzzle (and its larger variants) and the puzzle heuristics.
+"""
+class EightPuzzleTest(unittest.TestCase):
+    def test_fifteen_puzzle(self):
+        puzzle = FifteenPuzzleState(list(range(16)))
+        self.assertTrue(puzzle.isGoal())
+        self.assertEqual(['down', 'right'], puzzle.legalMoves())
+
+        moved = puzzle.result('right').result('down')
+        self.assertFalse(moved.isGoal())
+        self.assertEqual(puzzle, moved.result('up').result('left'))
+
+        with self.assertRaises(ValueError):
+            FifteenPuzzleState(list(range(9)))
+
+    def test_packed_state(self):
+        numbers = [1, 0, 2, 3, 4, 5, 6, 7, 8]
+        puzzle = EightPuzzleState(numbers)
+
+        self.assertEqual(numbers, puzzle.getNumbers())
+        self.assertEqual([[1, 0, 2], [3, 4, 5], [6, 7, 8]], puzzle.cells)
+        self.assertEqual((0, 1), puzzle.blankLocation)
+
+        moved = puzzle.result('down')
+        self.assertEqual([1, 4, 2, 3, 0, 5, 6, 7, 8], moved.getNumbers())
+        self.assertEqual((1, 1), moved.blankLocation)
+        self.assertEqual(numbers, puzzle.getNumbers())
+
+        self.assertEqual(puzzle, moved.result('up'))
+        self.assertEqual(hash(puzzle), hash(moved.result('up')))
+        self.assertNotEqual(puzzle, moved)
+
+        with self.assertRaises(Exception):
+            puzzle.result('up')
+
+        with self.assertRaises(ValueError):
+            EightPuzzleState([1, 1, 2, 3, 4, 5, 6, 7, 8])
+
+    def test_reachable_states(self):
+        self.assertEqual(181440, countReachableStates(loadEightPuzzle(0)))
+
+    def test_pattern_database(self):
+        database = buildPatternDatabase(3, [(1, 2, 3, 4), (5, 6, 7, 8)])
+        self.assertEqual(0, database(EightPuzzleState(list(range(9)))))
+
+        tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempDir.cleanup)
+
+        path = os.path.join(tempDir.name, 'eight.pdb')
+        database.save(path)
+        loaded = loadPatternDatabase(path)
+
+        self.assertEqual(database.getPatterns(), loaded.getPatterns())
+
+        for puzzleNumber in range(6):
+            puzzle = loadEightPuzzle(puzzleNumber)
+            self.assertEqual(database(puzzle), loaded(puzzle))
+
+            bfsPath = search.bfs(EightPuzzleSearchProblem(puzzle))
+
+            idaPath = search.idastar(EightPuzzleSearchProblem(puzzle), loaded)
+            self.assertEqual(len(bfsPath), len(idaPath))
+
+            smaPath = search.smastar(EightPuzzleSearchProblem(puzzle), loaded, memoryLimit = 50)
+            self.assertEqual(len(bfsPath), len(smaPath))
+            self.assertTrue(loaded(puzzle) <= len(bfsPath))
+
+        loaded.close()
+
+    def test_memory_bounded_heaps(self):
+        random.seed(3)
+        puzzle = createRandomEightPuzzle(300)
+        bfsPath = search.bfs(EightPuzzleSearchProblem(puzzle))
+
+        for memoryLimit in [200, 1000]:
+            stats = {}
+            smaPath = search.smastar(EightPuzzleSearchProblem(puzzle), _manhattan,
+                    memoryLimit = memoryLimit, stats = stats)
+
+            # The heaps include stale entries, but they should stay in proportion to memory.
+            self.assertEqual(len(bfsPath), len(smaPath))
+            self.assertTrue(stats['maxHeapEntries']
+                    <= 2 * bounded.MAX_HEAP_ENTRIES_PER_NODE * memoryLimit)
+
+    def test_pattern_database_fifteen(self):
+        database = buildPatternDatabase(4, [(1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12),
+                (13, 14, 15)])
+
+        random.seed(1)
+        puzzle = createRandomEightPuzzle(30, 4)
+        self.assertTrue(isinstance(puzzle, FifteenPuzzleState))
+
+        path = search.astar(EightPuzzleSearchProblem(puzzle), database)
+        self.assertTrue(database(puzzle) <= len(path))
+
+        for move in path:
+            puzzle = puzzle.result(move)
+
+        self.assertTrue(puzzle.isGoal())
+
+        with self.assertRaises(ValueError):
+            buildPatternDatabase(4, [(1, 2), (2, 3)])
+
+def _manhattan(puzzle, problem = None):
+    numbers = puzzle.getNumbers()
+
+    distance = 0
+    for i in range(len(numbers)):
+        if (numbers[i] != 0):
+            distance += abs(i // 3 - numbers[i] // 3) + abs(i % 3 - numbers[i] % 3)
+
+    return distance
+
+if __name__ == '__main__':
+    unittest.main()
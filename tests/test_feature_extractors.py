@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from pacai.agents.learning.linear import DenseLinearQFunction
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.featureExtractors import IdentityExtractor
+from pacai.core.featureExtractors import SimpleExtractor
+from pacai.core.layout import getLayout
+from pacai.core.search import search
+from pacai.student.searchAgents import AnyFoodSearchProblem
+
+"""
+Test the feature extractors.
+"""
+class FeatureExtractorsTest(unittest.TestCase):
+    def test_simple_extractor(self):
+        random.seed(4)
+        extractor = SimpleExtractor(cacheSize = 50, numFoodMaps = 2)
+
+        state = PacmanGameState(getLayout('smallClassic'))
+        previous = None
+
+        for i in range(200):
+            if (state.isOver()):
+                state = PacmanGameState(getLayout('smallClassic'))
+                previous = None
+
+            for action in state.getLegalActions(0):
+                features = extractor.getFeatures(state, action)
+                self.assertEqual(self._expectedClosestFood(state, action),
+                        features.get('closest-food'))
+
+                # Also look back at the last state (like a q-learning update does).
+                if (previous is not None):
+                    for previousAction in previous.getLegalActions(0):
+                        features = extractor.getFeatures(previous, previousAction)
+                        self.assertEqual(self._expectedClosestFood(previous, previousAction),
+                                features.get('closest-food'))
+
+            previous = state
+
+            # Move pacman (mostly towards food), and then all the ghosts.
+            actions = [action for action in state.getLegalActions(0) if action != Directions.STOP]
+            state = state.generateSuccessor(0, random.choice(actions))
+            for agentIndex in range(1, state.getNumAgents()):
+                if (state.isOver()):
+                    break
+
+                state = state.generateSuccessor(agentIndex,
+                        random.choice(state.getLegalActions(agentIndex)))
+
+    def test_dense_q_function(self):
+        extractor = SimpleExtractor()
+        qFunction = DenseLinearQFunction(extractor)
+
+        state = PacmanGameState(getLayout('smallClassic'))
+        actions = state.getLegalActions(0)
+
+        for action in actions:
+            self.assertEqual(0.0, qFunction.getQValue(state, action, actions))
+
+        weights = {}
+        for action in actions:
+            features = extractor.getFeatures(state, action)
+            qFunction.update(state, action, actions, 0.5)
+            for feature, value in features.items():
+                weights[feature] = weights.get(feature, 0.0) + 0.5 * value
+
+        self.assertEqual(weights.keys(), qFunction.getWeights().keys())
+        for feature, weight in weights.items():
+            self.assertAlmostEqual(weight, qFunction.getWeights()[feature])
+
+        qValues = qFunction.getQValues(state, actions)
+        for i in range(len(actions)):
+            features = extractor.getFeatures(state, actions[i])
+            expected = sum(weights[feature] * value for feature, value in features.items())
+            self.assertAlmostEqual(expected, qValues[i])
+
+        # Features that are not known ahead of time cannot be dense.
+        with self.assertRaises(ValueError):
+            DenseLinearQFunction(IdentityExtractor())
+
+    def _expectedClosestFood(self, state, action):
+        x, y = state.getPacmanPosition()
+        dx, dy = {
+            Directions.NORTH: (0, 1),
+            Directions.SOUTH: (0, -1),
+            Directions.EAST: (1, 0),
+            Directions.WEST: (-1, 0),
+            Directions.STOP: (0, 0),
+        }[action]
+
+        problem = AnyFoodSearchProblem(state, start = (x + dx, y + dy))
+        walls = state.getWalls()
+
+        return len(search.bfs(problem)) / (walls.getWidth() * walls.getHeight()) / 10.0
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core import distance
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+from pacai.core.nearestFood import NearestFoodMap
+
+POCKET_LAYOUT = [
+    '%%%%%%%%%',
+    '%.%   %.%',
+    '% % % % %',
+    '%P      %',
+    '%%%%%%%%%',
+]
+
+LOOP_LAYOUT = [
+    '%%%%%',
+    '%   %',
+    '% % %',
+    '%P  %',
+    '%%%%%',
+]
+
+"""
+Test the structures derived from a layout.
+"""
+class LayoutTest(unittest.TestCase):
+    def test_maze_graph_distances(self):
+        for layoutName in ['tinyMaze', 'mediumClassic', 'trickySearch', 'contoursMaze']:
+            layout = getLayout(layoutName)
+            state = PacmanGameState(layout)
+            graph = layout.getMazeGraph()
+
+            openPositions = layout.walls.asList(False)
+            self.assertTrue(len(graph.getNodes()) <= len(openPositions))
+
+            source = openPositions[len(openPositions) // 2]
+            distances = graph.distancesFrom(source)
+
+            for target in openPositions[::7]:
+                self.assertEqual(distance.maze(source, target, state), distances[target])
+
+    def test_maze_graph_loop(self):
+        layout = Layout(LOOP_LAYOUT)
+        graph = layout.getMazeGraph()
+
+        # A loop without any junctions gets a single node and a single (self) edge.
+        self.assertEqual(1, len(graph.getNodes()))
+        self.assertEqual(1, len(graph.getEdges()))
+
+        self.assertEqual(4, graph.getDistance((1, 1), (3, 3)))
+        self.assertEqual(2, graph.getDistance((1, 1), (3, 1)))
+
+    def test_maze_graph_cached(self):
+        layout = getLayout('mediumMaze')
+        self.assertIs(layout.getMazeGraph(), layout.getMazeGraph())
+
+    def test_maze_topology(self):
+        layout = Layout(POCKET_LAYOUT)
+        topology = layout.getMazeTopology()
+
+        # The left column is a dead end, entered from (3, 1).
+        self.assertTrue(topology.isArticulationPoint((3, 1)))
+        self.assertTrue(topology.isArticulationPoint((1, 1)))
+        self.assertFalse(topology.isArticulationPoint((4, 3)))
+
+        pockets = topology.getPockets()
+        self.assertEqual(2, len(pockets))
+
+        leftPocket = topology.getPocket((1, 3))
+        self.assertEqual((3, 1), pockets[leftPocket][0])
+        self.assertEqual(4, pockets[leftPocket][2])
+        self.assertEqual(4, topology.getPocketDepth((1, 3)))
+        self.assertEqual(1, topology.getPocketFoodCounts()[leftPocket])
+
+        rightPocket = topology.getPocket((7, 3))
+        self.assertEqual((5, 1), pockets[rightPocket][0])
+        self.assertEqual(1, topology.getPocketFoodCounts()[rightPocket])
+
+        # Cells on the loop are not in any pocket.
+        self.assertIsNone(topology.getPocket((4, 3)))
+        self.assertEqual(0, topology.getPocketDepth((4, 3)))
+
+    def test_maze_topology_capture(self):
+        layout = getLayout('defaultCapture')
+        topology = layout.getMazeTopology()
+
+        self.assertIs(topology, layout.getMazeTopology())
+
+        # Every pocket cell is exactly its depth away from the pocket's entrance.
+        graph = layout.getMazeGraph()
+        for entrance, cells, depth in topology.getPockets():
+            distances = graph.distancesFrom(entrance)
+            for cell in cells:
+                self.assertEqual(distances[cell], topology.getPocketDepth(cell))
+                self.assertTrue(topology.getPocketDepth(cell) <= depth)
+
+    def test_nearest_food_map(self):
+        layout = getLayout('mediumSearch')
+        graph = layout.getMazeGraph()
+
+        food = layout.food.asList()
+        foodMap = NearestFoodMap(layout.walls, layout.food)
+        openPositions = layout.walls.asList(False)
+
+        # Eat the food in an arbitrary (but fixed) order, and check against a fresh search.
+        for step in range(len(food)):
+            if (step % 10 == 0):
+                distances = {position: graph.distancesFrom(position) for position in food}
+
+                for position in openPositions[::5]:
+                    expected = min([distances[target][position] for target in food])
+                    self.assertEqual(expected, foodMap.getDistance(position))
+                    self.assertEqual(expected, len(foodMap.getPath(position)))
+
+                    nearest = foodMap.getNearestFood(position)
+                    self.assertEqual(expected, distances[nearest][position])
+
+            eaten = food.pop((step * 7) % len(food))
+            self.assertTrue(foodMap.removeFood(eaten))
+            self.assertFalse(foodMap.hasFood(eaten))
+
+        self.assertEqual(0, foodMap.getNumFood())
+        self.assertIsNone(foodMap.getPath(openPositions[0]))
+
+if __name__ == '__main__':
+    unittest.main()
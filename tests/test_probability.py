@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from pacai.util import probability
+
+"""
+Test sampling from discrete distributions.
+"""
+class ProbabilityTest(unittest.TestCase):
+    def test_alias_table(self):
+        distribution = {'a': 0.1, 'b': 0.0, 'c': 0.6, 'd': 0.3}
+        table = probability.getAliasTable(distribution)
+
+        # Tables are cached by distribution.
+        self.assertIs(table, probability.getAliasTable(dict(distribution)))
+        self.assertIs(table, probability.getAliasTable([0.1, 0.0, 0.6, 0.3], ['a', 'b', 'c', 'd']))
+
+        rng = random.Random(1234)
+        numSamples = 20000
+
+        counts = {value: 0 for value in distribution}
+        for i in range(numSamples):
+            counts[table.sample(rng)] += 1
+
+        self.assertEqual(0, counts['b'])
+        for value, prob in distribution.items():
+            self.assertAlmostEqual(prob, counts[value] / numSamples, delta = 0.02)
+
+    def test_alias_table_errors(self):
+        with self.assertRaises(ValueError):
+            probability.getAliasTable({})
+
+        with self.assertRaises(ValueError):
+            probability.getAliasTable([0.5, 0.5], ['a'])
+
+        with self.assertRaises(ValueError):
+            probability.getAliasTable([0.0, 0.0], ['a', 'b'])
+
+        # Unhashable values still work, they are just not cached.
+        table = probability.getAliasTable([0.0, 1.0], [['a'], ['b']])
+        self.assertEqual(['b'], table.sample())
+
+    def test_batch_n_sample(self):
+        numSamples = probability.BATCH_SAMPLE_SIZE * 40
+        samples = probability.nSample([0.2, 0.5, 0.3], ['a', 'b', 'c'], numSamples,
+                rng = random.Random(5))
+
+        self.assertEqual(numSamples, len(samples))
+
+        # Like the small samples, the samples come in the order of the distribution.
+        self.assertEqual(sorted(samples), samples)
+        self.assertAlmostEqual(0.5, samples.count('b') / numSamples, delta = 0.03)
+
+        self.assertEqual(samples, probability.nSample([0.2, 0.5, 0.3], ['a', 'b', 'c'],
+                numSamples, rng = random.Random(5)))
+
+if __name__ == '__main__':
+    unittest.main()
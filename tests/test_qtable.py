@@ -0,0 +1,81 @@
+import unittest
+
+from pacai.agents.learning.qtable import QTable
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.layout import getLayout
+
+"""
+Test the Q-table and the game state fingerprints it is keyed by.
+"""
+class QTableTest(unittest.TestCase):
+    def test_qtable(self):
+        table = QTable()
+        self.assertEqual(0.0, table.get((1, 1), 'north'))
+        self.assertEqual(None, table.get((1, 1), 'north', None))
+
+        table.set((1, 1), 'north', 2.0)
+        table.set((1, 1), 'south', -1.0)
+        self.assertEqual(2.0, table.get((1, 1), 'north'))
+        self.assertEqual(-1.0, table.get((1, 1), 'south'))
+        self.assertEqual(2, len(table))
+        self.assertTrue(((1, 1), 'north') in table)
+        self.assertFalse(((1, 2), 'north') in table)
+
+        with self.assertRaises(ValueError):
+            QTable(capacity = 0)
+
+        with self.assertRaises(ValueError):
+            QTable(eviction = 'random')
+
+    def test_lru_eviction(self):
+        table = QTable(capacity = 10)
+        for i in range(10):
+            table.set(i, 'north', float(i))
+
+        # Use the first state, so the second one is now the least recently used.
+        table.get(0, 'north')
+        table.set(10, 'north', 10.0)
+
+        self.assertEqual(10, len(table))
+        self.assertEqual(1, table.getNumEvictions())
+        self.assertEqual(0.0, table.get(0, 'north'))
+        self.assertFalse((1, 'north') in table)
+        self.assertEqual(10.0, table.get(10, 'north'))
+
+    def test_lfu_eviction(self):
+        table = QTable(capacity = 10, eviction = 'lfu')
+        for i in range(10):
+            table.set(i, 'north', float(i))
+
+        # Use every state but the last one a second time.
+        for i in range(9):
+            table.get(i, 'north')
+
+        table.set(10, 'north', 10.0)
+
+        self.assertEqual(10, len(table))
+        self.assertFalse((9, 'north') in table)
+        for i in range(9):
+            self.assertEqual(float(i), table.get(i, 'north'))
+
+    def test_game_state_keys(self):
+        table = QTable()
+
+        state = PacmanGameState(getLayout('smallGrid'))
+        successor = state.generateSuccessor(0, Directions.WEST)
+        sameSuccessor = state.generateSuccessor(0, Directions.WEST)
+
+        self.assertNotEqual(state.getFingerprint(), successor.getFingerprint())
+        self.assertEqual(successor.getFingerprint(), sameSuccessor.getFingerprint())
+
+        table.set(successor, Directions.WEST, 1.5)
+        self.assertEqual(1.5, table.get(sameSuccessor, Directions.WEST))
+        self.assertEqual(0.0, table.get(state, Directions.WEST))
+
+        # States are not kept in the table, only their fingerprints.
+        for key, value in table.items():
+            self.assertEqual((successor.getFingerprint(), Directions.WEST), key)
+
+if __name__ == '__main__':
+    unittest.main()
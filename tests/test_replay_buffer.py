@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from pacai.agents.learning.replay import ReplayBuffer
+from pacai.student.qlearningAgents import QLearningAgent
+
+"""
+Test the experience replay buffer (and learning from it).
+"""
+class ReplayBufferTest(unittest.TestCase):
+    def test_ring_buffer(self):
+        buffer = ReplayBuffer(3)
+        self.assertEqual([], buffer.sample(2))
+
+        for i in range(5):
+            buffer.add(i, 'north', float(i), i + 1)
+
+        # The two oldest transitions were overwritten.
+        self.assertEqual(3, len(buffer))
+        self.assertEqual([(3, 'north', 3.0, 4), (4, 'north', 4.0, 5), (2, 'north', 2.0, 3)],
+                [buffer.get(slot) for slot in range(3)])
+
+        random.seed(1)
+        for slot in buffer.sample(20):
+            self.assertTrue(0 <= slot < 3)
+
+        with self.assertRaises(ValueError):
+            ReplayBuffer(0)
+
+    def test_prioritized_sampling(self):
+        buffer = ReplayBuffer(5, prioritized = True, alpha = 1.0)
+        for i in range(5):
+            buffer.add(i, 'north', 0.0, i + 1)
+            buffer.updatePriority(i, 0.0)
+
+        buffer.updatePriority(3, 100.0)
+
+        random.seed(1)
+        samples = buffer.sample(1000)
+        self.assertTrue(samples.count(3) > 950)
+        self.assertTrue(all(0 <= slot < 5 for slot in samples))
+
+    def test_importance_weights(self):
+        buffer = ReplayBuffer(4, prioritized = True, alpha = 1.0)
+        for i in range(4):
+            buffer.add(i, 'north', 0.0, i + 1)
+
+        buffer.updatePriority(0, 1.0)
+        buffer.updatePriority(1, 1.0)
+        buffer.updatePriority(2, 2.0)
+        buffer.updatePriority(3, 4.0)
+
+        # The more often a transition is sampled, the less each sample counts.
+        self.assertEqual([1.0, 1.0, 0.5, 0.25], buffer.getImportanceWeights([0, 1, 2, 3], 1.0))
+        self.assertEqual([1.0, 1.0], buffer.getImportanceWeights([2, 3], 0.0))
+        self.assertEqual([1.0], ReplayBuffer(2).getImportanceWeights([0], 1.0))
+
+    def test_q_learning_replay(self):
+        agent = QLearningAgent(0, actionFn = lambda state: ['east'] if state < 3 else [],
+                alpha = 0.5, gamma = 1.0, replaySize = 10, replayBatch = 10)
+        agent.startEpisode()
+        random.seed(1)
+
+        # A single reward at the end of a chain is passed back along it by replay.
+        agent.observeTransition(0, 'east', 1, 0.0)
+        agent.observeTransition(1, 'east', 2, 0.0)
+        agent.observeTransition(2, 'east', 3, 1.0)
+
+        self.assertTrue(agent.getQValue(0, 'east') > 0.0)
+        self.assertTrue(agent.getQValue(2, 'east') > 0.5)
+        self.assertEqual(3, len(agent.replay))
+
+if __name__ == '__main__':
+    unittest.main()
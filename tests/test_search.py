@@ -0,0 +1,129 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.layout import getLayout
+from pacai.core.search import heuristic
+from pacai.core.search import search
+from pacai.core.search.food import FoodBitmaskSearchProblem
+from pacai.core.search.food import FoodSearchProblem
+from pacai.core.search.position import PositionSearchProblem
+
+"""
+Test the library search functions against the reference search functions.
+"""
+class SearchTest(unittest.TestCase):
+    def test_jump_point_search(self):
+        for layoutName in ['tinyMaze', 'mediumMaze', 'bigMaze', 'contoursMaze', 'openMaze']:
+            state = PacmanGameState(getLayout(layoutName))
+
+            bfsProblem = PositionSearchProblem(state)
+            bfsPath = search.bfs(bfsProblem)
+
+            jumpProblem = PositionSearchProblem(state)
+            jumpPath = search.jps(jumpProblem)
+
+            self.assertEqual(bfsProblem.actionsCost(bfsPath), jumpProblem.actionsCost(jumpPath))
+            self.assertTrue(jumpProblem.getExpandedCount() <= bfsProblem.getExpandedCount())
+
+            aStarProblem = PositionSearchProblem(state)
+            aStarPath = search.jps(aStarProblem, heuristic.manhattan)
+            self.assertEqual(bfsProblem.actionsCost(bfsPath), aStarProblem.actionsCost(aStarPath))
+
+    def test_jump_point_search_cost_function(self):
+        state = PacmanGameState(getLayout('mediumMaze'))
+        costFn = lambda position: 2 ** position[0]
+
+        ucsProblem = PositionSearchProblem(state, costFn)
+        ucsPath = search.ucs(ucsProblem)
+
+        jumpProblem = PositionSearchProblem(state, costFn)
+        jumpPath = search.jps(jumpProblem)
+
+        self.assertEqual(ucsProblem.actionsCost(ucsPath), jumpProblem.actionsCost(jumpPath))
+
+    def test_memory_bounded_search(self):
+        for layoutName in ['tinyMaze', 'mediumMaze', 'bigMaze', 'openMaze']:
+            state = PacmanGameState(getLayout(layoutName))
+
+            bfsProblem = PositionSearchProblem(state)
+            bfsCost = bfsProblem.actionsCost(search.bfs(bfsProblem))
+
+            idaProblem = PositionSearchProblem(state)
+            idaPath = search.idastar(idaProblem, heuristic.manhattan)
+            self.assertEqual(bfsCost, idaProblem.actionsCost(idaPath))
+
+            # Give SMA* just enough room to hold the solution.
+            smaProblem = PositionSearchProblem(state)
+            smaPath = search.smastar(smaProblem, heuristic.manhattan, memoryLimit = bfsCost + 2)
+            self.assertEqual(bfsCost, smaProblem.actionsCost(smaPath))
+
+        state = PacmanGameState(getLayout('mediumMaze'))
+        with self.assertRaises(Exception):
+            search.smastar(PositionSearchProblem(state), heuristic.manhattan, memoryLimit = 20)
+
+    def test_memory_bounded_food_search(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+
+        bfsPath = search.bfs(FoodBitmaskSearchProblem(state))
+
+        idaPath = search.idastar(FoodBitmaskSearchProblem(state), heuristic.foodSpanningTree)
+        self.assertEqual(len(bfsPath), len(idaPath))
+
+        smaPath = search.smastar(FoodBitmaskSearchProblem(state), heuristic.foodSpanningTree,
+                memoryLimit = 100)
+        self.assertEqual(len(bfsPath), len(smaPath))
+
+    def test_food_bitmask_problem(self):
+        for layoutName in ['tinySearch', 'trickySearch']:
+            state = PacmanGameState(getLayout(layoutName))
+
+            gridProblem = FoodSearchProblem(state)
+            gridPath = search.astar(gridProblem, heuristic.farthestFood)
+
+            maskProblem = FoodBitmaskSearchProblem(state)
+            maskPath = search.astar(maskProblem, heuristic.farthestFood)
+
+            self.assertEqual(len(gridPath), len(maskPath))
+            self.assertEqual(gridProblem.actionsCost(gridPath), maskProblem.actionsCost(maskPath))
+
+            # Walk the path and make sure all the food is eaten.
+            position, foodMask = maskProblem.startingState()
+            for action in maskPath:
+                successors = {move: nextState for nextState, move, cost
+                        in maskProblem.successorStates((position, foodMask))}
+                position, foodMask = successors[action]
+
+            self.assertTrue(maskProblem.isGoal((position, foodMask)))
+            self.assertEqual([], maskProblem.getFoodList(foodMask))
+
+    def test_food_spanning_tree_heuristic(self):
+        for layoutName in ['tinySearch', 'smallSearch', 'trickySearch']:
+            state = PacmanGameState(getLayout(layoutName))
+
+            referenceProblem = FoodBitmaskSearchProblem(state)
+            referencePath = search.astar(referenceProblem, heuristic.farthestFood)
+
+            gridProblem = FoodSearchProblem(state)
+            gridPath = search.astar(gridProblem, heuristic.foodSpanningTree)
+
+            maskProblem = FoodBitmaskSearchProblem(state)
+            maskPath = search.astar(maskProblem, heuristic.foodSpanningTree)
+
+            self.assertEqual(len(referencePath), len(gridPath))
+            self.assertEqual(len(referencePath), len(maskPath))
+            self.assertTrue(maskProblem.getExpandedCount() <= referenceProblem.getExpandedCount())
+
+            # The heuristic must never overestimate the true remaining cost.
+            position, foodMask = maskProblem.startingState()
+            remaining = len(maskPath)
+            for action in maskPath:
+                self.assertTrue(heuristic.foodSpanningTree((position, foodMask), maskProblem)
+                        <= remaining)
+
+                successors = {move: nextState for nextState, move, cost
+                        in maskProblem.successorStates((position, foodMask))}
+                position, foodMask = successors[action]
+                remaining -= 1
+
+if __name__ == '__main__':
+    unittest.main()
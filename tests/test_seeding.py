@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from pacai.agents.ghost.random import RandomGhost
+from pacai.util import probability
+from pacai.util import seeding
+
+"""
+Test the seeded random streams.
+"""
+class SeedingTest(unittest.TestCase):
+    def test_derive_seed(self):
+        # Streams only depend on the seed and their names, not the global random state.
+        random.seed(1)
+        seed = seeding.deriveSeed(1234, 'game', 0, 'agent', 1)
+
+        random.seed(2)
+        self.assertEqual(seed, seeding.deriveSeed(1234, 'game', 0, 'agent', 1))
+
+        self.assertNotEqual(seed, seeding.deriveSeed(1234, 'game', 1, 'agent', 1))
+        self.assertNotEqual(seed, seeding.deriveSeed(1234, 'game', 0, 'agent', 2))
+        self.assertNotEqual(seed, seeding.deriveSeed(1235, 'game', 0, 'agent', 1))
+
+    def test_seed_game(self):
+        ghosts = [RandomGhost(1), RandomGhost(2)]
+
+        gameRng = seeding.seedGame(1234, 3, ghosts)
+        draws = [gameRng.random()] + [ghost.getRandom().random() for ghost in ghosts]
+
+        # Drawing from the global random state does not change any of the streams.
+        gameRng = seeding.seedGame(1234, 3, ghosts)
+        random.random()
+        otherDraws = [gameRng.random()] + [ghost.getRandom().random() for ghost in ghosts]
+
+        self.assertEqual(draws, otherDraws)
+        self.assertNotEqual(draws[1], draws[2])
+
+    def test_sample_rng(self):
+        distribution = {'a': 0.2, 'b': 0.3, 'c': 0.5}
+
+        samples = [probability.sample(distribution, rng = random.Random(5)) for i in range(3)]
+        self.assertEqual(1, len(set(samples)))
+
+        rng = random.Random(5)
+        samples = probability.nSample([0.2, 0.3, 0.5], ['a', 'b', 'c'], 100, rng = rng)
+        self.assertEqual(samples,
+                probability.nSample([0.2, 0.3, 0.5], ['a', 'b', 'c'], 100, rng = random.Random(5)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from pacai.util import lruCache
 from pacai.util import priorityQueue
 from pacai.util import queue
 from pacai.util import stack
@@ -52,5 +53,29 @@ class UtilContainersTest(unittest.TestCase):
         for val, pri in reversed(val_list):
             self.assertEqual(val, testPriorityQueue.pop())
 
+    def test_lru_cache(self):
+        testCache = lruCache.LRUCache(3)
+        self.assertEqual(0, len(testCache))
+
+        for val in range(1, 4):
+            self.assertIsNone(testCache.put(val, val * 10))
+        self.assertEqual(3, len(testCache))
+
+        # Touch the oldest item, so the second one is now the least recently used.
+        self.assertEqual(10, testCache.get(1))
+        self.assertEqual((2, 20), testCache.put(4, 40))
+
+        self.assertFalse(2 in testCache)
+        self.assertIsNone(testCache.get(2))
+        self.assertEqual(-1, testCache.get(2, -1))
+        self.assertEqual([3, 1, 4], testCache.keys())
+
+        # Replacing an item does not evict anything.
+        self.assertIsNone(testCache.put(3, 30))
+        self.assertEqual(3, len(testCache))
+
+        with self.assertRaises(ValueError):
+            lruCache.LRUCache(0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+
+from pacai.agents.learning.matrixValueIteration import MatrixValueIterationAgent
+from pacai.agents.learning.policyIteration import PolicyIterationAgent
+from pacai.bin.gridworld import _getGridWorld
+from pacai.bin.gridworld import generateGridworld
+from pacai.student.valueIterationAgent import ValueIterationAgent
+
+GRIDS = ['BookGrid', 'BridgeGrid', 'CliffGrid', 'DiscountGrid', 'MazeGrid']
+
+"""
+Test solving MDPs with value iteration.
+"""
+class ValueIterationTest(unittest.TestCase):
+    def test_generate_gridworld(self):
+        mdp = generateGridworld(20, 10, wallDensity = 0.3, exitRewards = (5, -5, 2.5),
+                noise = 0.1, livingReward = -0.5, seed = 4)
+        self.assertEqual(str(mdp.grid), str(generateGridworld(20, 10, 0.3, (5, -5, 2.5),
+                seed = 4).grid))
+
+        cells = [mdp.grid[x][y] for x in range(20) for y in range(10)]
+        self.assertEqual(1, cells.count('S'))
+        exits = [cell for cell in cells if cell not in ('S', ' ', '#')]
+        self.assertEqual([-5, 2.5, 5], sorted(exits))
+        self.assertEqual(len(cells) - cells.count('#') + 1, len(mdp.getStates()))
+
+        self.assertEqual(0.1, mdp.noise)
+        self.assertEqual(-0.5, mdp.getReward(mdp.getStartState(), 'north', None))
+
+        agent = MatrixValueIterationAgent(0, mdp, 0.9, 1000, 1e-8)
+        expected = ValueIterationAgent(0, mdp, 0.9, 1000, 1e-8)
+        for state in mdp.getStates():
+            self.assertAlmostEqual(expected.getValue(state), agent.getValue(state))
+
+        # The only open cells get used for the start and exits.
+        mdp = generateGridworld(2, 1, wallDensity = 0.99, exitRewards = (1, ), seed = 0)
+        self.assertEqual({'S', 1}, {mdp.grid[0][0], mdp.grid[1][0]})
+
+        with self.assertRaises(ValueError):
+            generateGridworld(1, 1)
+
+    def test_gridworld_cache(self):
+        mdp = _getGridWorld('BookGrid')
+        self.assertIs(mdp.getStates(), mdp.getStates())
+
+        start = mdp.getStartState()
+        self.assertAlmostEqual(0.8, dict(mdp.getTransitionStatesAndProbs(start, 'north'))[(0, 1)])
+        self.assertEqual(0.0, mdp.getReward(start, 'north', (0, 1)))
+
+        with self.assertRaises(Exception):
+            mdp.getTransitionStatesAndProbs(start, 'exit')
+
+        mdp.setNoise(0.0)
+        mdp.setLivingReward(-1.0)
+
+        self.assertEqual(1.0, dict(mdp.getTransitionStatesAndProbs(start, 'north'))[(0, 1)])
+        self.assertEqual(-1.0, mdp.getReward(start, 'north', (0, 1)))
+        self.assertEqual(1, mdp.getReward((3, 2), 'exit', mdp.grid.terminalState))
+
+    def test_matrix_value_iteration(self):
+        for name in GRIDS:
+            mdp = _getGridWorld(name)
+            mdp.setLivingReward(-0.1)
+
+            for iters in [0, 1, 5, 100]:
+                expected = ValueIterationAgent(0, mdp, 0.9, iters)
+                agent = MatrixValueIterationAgent(0, mdp, 0.9, iters)
+
+                for state in mdp.getStates():
+                    self.assertAlmostEqual(expected.getValue(state), agent.getValue(state))
+
+                    actions = mdp.getPossibleActions(state)
+                    if (len(actions) == 0):
+                        self.assertIsNone(agent.getPolicy(state))
+                        continue
+
+                    for action in actions:
+                        self.assertAlmostEqual(expected.getQValue(state, action),
+                                agent.getQValue(state, action))
+
+                    # Ties may be broken differently, but the policy's action must be a best one.
+                    self.assertAlmostEqual(
+                            max(agent.getQValue(state, action) for action in actions),
+                            agent.getQValue(state, agent.getPolicy(state)))
+
+    def test_sweeps(self):
+        for name in GRIDS:
+            mdp = _getGridWorld(name)
+            mdp.setLivingReward(-0.1)
+            states = mdp.getStates()
+
+            # Close enough to the true values.
+            expected = MatrixValueIterationAgent(0, mdp, 0.9, 500)
+
+            for sweep in ['sync', 'gauss-seidel', 'prioritized']:
+                agent = ValueIterationAgent(0, mdp, 0.9, 500, tolerance = 1e-8, sweep = sweep)
+                self.assertTrue(agent.numBackups < 500 * len(states))
+
+                for state in states:
+                    self.assertAlmostEqual(expected.getValue(state), agent.getValue(state),
+                            places = 6)
+
+            matrix = MatrixValueIterationAgent(0, mdp, 0.9, 500, tolerance = 1e-8)
+            self.assertTrue(matrix.numSweeps < 500)
+
+        with self.assertRaises(ValueError):
+            ValueIterationAgent(0, mdp, sweep = 'random')
+
+    def test_policy_iteration(self):
+        for name in GRIDS:
+            mdp = _getGridWorld(name)
+            mdp.setLivingReward(-0.1)
+
+            expected = MatrixValueIterationAgent(0, mdp, 0.9, 1000, tolerance = 1e-12)
+
+            # Exact and iterative evaluation.
+            for evaluationSweeps in [None, 10]:
+                agent = PolicyIterationAgent(0, mdp, 0.9, 100,
+                        evaluationSweeps = evaluationSweeps, tolerance = 1e-12)
+                self.assertTrue(agent.numIterations < 100)
+
+                for state in mdp.getStates():
+                    self.assertAlmostEqual(expected.getValue(state), agent.getValue(state))
+
+                    actions = mdp.getPossibleActions(state)
+                    if (len(actions) == 0):
+                        self.assertIsNone(agent.getPolicy(state))
+                    else:
+                        self.assertAlmostEqual(expected.getValue(state),
+                                expected.getQValue(state, agent.getPolicy(state)))
+
+    def test_policy_iteration_undiscounted(self):
+        for name in GRIDS:
+            for noise in [0.0, 0.2]:
+                mdp = _getGridWorld(name)
+                mdp.setNoise(noise)
+
+                expected = MatrixValueIterationAgent(0, mdp, 1.0, 1000, tolerance = 1e-12)
+                agent = PolicyIterationAgent(0, mdp, 1.0, 100)
+
+                for state in mdp.getStates():
+                    self.assertAlmostEqual(expected.getValue(state), agent.getValue(state))
+
+                # Following the policy (without noise) always ends the episode.
+                if (noise == 0.0):
+                    state = mdp.getStartState()
+                    for i in range(len(mdp.getStates())):
+                        if (mdp.isTerminal(state)):
+                            break
+
+                        action = agent.getPolicy(state)
+                        state = mdp.getTransitionStatesAndProbs(state, action)[0][0]
+
+                    self.assertTrue(mdp.isTerminal(state))
+
+if __name__ == '__main__':
+    unittest.main()